@@ -0,0 +1,57 @@
+"""Measure the per-chunk cost of downmixing and resampling native capture.
+
+Run from the project root::
+
+    python benchmarks/bench_resample.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from resample import CaptureConverter  # noqa: E402
+
+
+OUTPUT_RATE = 16000
+CHUNK_SAMPLES = 4096
+CHUNKS = 500
+FORMATS = [(48000, 2), (44100, 2), (48000, 1), (32000, 1), (22050, 2)]
+
+
+def _measure(input_rate: int, channels: int) -> None:
+    rng = np.random.default_rng(0)
+    frames = CHUNK_SAMPLES * input_rate // OUTPUT_RATE
+    chunks = [
+        rng.integers(-3000, 3000, frames * channels, dtype=np.int16).tobytes()
+        for _ in range(CHUNKS)
+    ]
+    converter = CaptureConverter(input_rate, channels, OUTPUT_RATE)
+
+    timings = np.zeros(len(chunks), dtype=np.float64)
+    for index, chunk in enumerate(chunks):
+        started = time.perf_counter()
+        converter.convert(chunk)
+        timings[index] = time.perf_counter() - started
+
+    chunk_seconds = CHUNK_SAMPLES / OUTPUT_RATE
+    print(
+        f"{input_rate:>6} Hz x{channels}: {timings.mean() * 1e3:6.2f} ms/chunk mean, "
+        f"{timings.max() * 1e3:6.2f} ms max, "
+        f"{100 * timings.mean() / chunk_seconds:5.2f}% of the {chunk_seconds * 1e3:.0f} ms chunk"
+    )
+
+
+def main() -> None:
+    print(f"{CHUNKS} chunks of {CHUNK_SAMPLES} output samples at {OUTPUT_RATE} Hz")
+    for input_rate, channels in FORMATS:
+        _measure(input_rate, channels)
+
+
+if __name__ == "__main__":
+    main()
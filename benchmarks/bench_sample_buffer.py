@@ -0,0 +1,101 @@
+"""Compare per-chunk allocations of the legacy concatenate buffer and SampleBuffer.
+
+Run from the project root::
+
+    python benchmarks/bench_sample_buffer.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from audio_buffer import SampleBuffer  # noqa: E402
+
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 4096
+WINDOW_SECONDS = 5.0
+OVERLAP_SECONDS = 1.0
+CHUNKS = 2000
+
+
+def _legacy(window: int, overlap: int):
+    state = {"buffer": np.zeros(0, dtype=np.float32)}
+
+    def step(chunk: bytes) -> None:
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
+        buffer = np.concatenate((state["buffer"], samples))
+        if buffer.size >= window:
+            buffer.copy().sum()
+            if overlap and overlap < buffer.size:
+                buffer = buffer[-overlap:]
+            else:
+                buffer = np.zeros(0, dtype=np.float32)
+        state["buffer"] = buffer
+
+    return step
+
+
+def _preallocated(window: int, overlap: int):
+    buffer = SampleBuffer(window + CHUNK_SAMPLES)
+
+    def step(chunk: bytes) -> None:
+        buffer.append_pcm16(chunk)
+        if buffer.size >= window:
+            buffer.view().sum()
+            if overlap and overlap < buffer.size:
+                buffer.keep_tail(overlap)
+            else:
+                buffer.clear()
+
+    return step
+
+
+def _measure(name: str, factory) -> None:
+    rng = np.random.default_rng(0)
+    chunks = [
+        rng.integers(-3000, 3000, CHUNK_SAMPLES, dtype=np.int16).tobytes()
+        for _ in range(CHUNKS)
+    ]
+    step = factory(int(SAMPLE_RATE * WINDOW_SECONDS), int(SAMPLE_RATE * OVERLAP_SECONDS))
+
+    started = time.perf_counter()
+    for chunk in chunks:
+        step(chunk)
+    elapsed = time.perf_counter() - started
+
+    transient = np.zeros(len(chunks), dtype=np.float64)
+    tracemalloc.start()
+    for index, chunk in enumerate(chunks):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        step(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+        transient[index] = peak - before
+    tracemalloc.stop()
+
+    print(
+        f"{name:>13}: {transient.mean() / 1024:9.1f} KiB/chunk mean, "
+        f"{transient.max() / 1024:9.1f} KiB/chunk max, "
+        f"{elapsed / len(chunks) * 1e6:7.1f} us/chunk"
+    )
+
+
+def main() -> None:
+    print(
+        f"{CHUNKS} chunks of {CHUNK_SAMPLES} samples, "
+        f"window={WINDOW_SECONDS}s overlap={OVERLAP_SECONDS}s"
+    )
+    _measure("concatenate", _legacy)
+    _measure("SampleBuffer", _preallocated)
+
+
+if __name__ == "__main__":
+    main()
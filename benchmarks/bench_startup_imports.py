@@ -0,0 +1,68 @@
+"""Report interpreter start-up import cost for each entry point.
+
+Uses ``python -X importtime`` in a fresh interpreter per scenario and
+prints the total import time plus the slowest top-level imports. Run from
+the project root::
+
+    python benchmarks/bench_startup_imports.py
+"""
+
+from __future__ import annotations
+
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+REPEATS = 3
+TOP_IMPORTS = 5
+
+# Each scenario imports what the entry point loads before it can do its work.
+SCENARIOS = {
+    "config --list": "import main",
+    "--list-devices": "import main; import audio_capture",
+    "run (until the window shows)": (
+        "import main; import model_loader; "
+        "from PyQt5.QtWidgets import QApplication; import overlay"
+    ),
+    "run (transcription thread)": "import main; import transcription",
+}
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _measure(statement: str) -> tuple[float, list[tuple[float, str]]] | str:
+    code = f"import sys; sys.path.insert(0, {str(SRC)!r}); {statement}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return result.stderr.strip().splitlines()[-1]
+
+    top_level: list[tuple[float, str]] = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        # Top-level imports are indented by a single space.
+        if match and len(match.group(3)) == 1:
+            top_level.append((int(match.group(2)) / 1000.0, match.group(4)))
+    return sum(ms for ms, _ in top_level), sorted(top_level, reverse=True)
+
+
+def main() -> None:
+    for name, statement in SCENARIOS.items():
+        runs = [_measure(statement) for _ in range(REPEATS)]
+        failures = [run for run in runs if isinstance(run, str)]
+        if failures:
+            print(f"{name:>30}: unavailable ({failures[0]})")
+            continue
+        best_total, best_imports = min(runs)
+        slowest = ", ".join(f"{module} {ms:.0f}" for ms, module in best_imports[:TOP_IMPORTS])
+        print(f"{name:>30}: {best_total:7.1f} ms imports  [{slowest}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Compare decode round-trip latency in process and through the worker process.
+
+By default a synthetic model that only touches the audio is used, which
+isolates the transport cost (shared-memory write, pipe round trip, result
+pickling). Pass a model name or path to time a real faster-whisper model
+on silence instead::
+
+    python benchmarks/bench_worker_latency.py
+    python benchmarks/bench_worker_latency.py base
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from config import load_settings  # noqa: E402
+from inference_worker import InferenceWorker  # noqa: E402
+
+
+WINDOW_SECONDS = (1.0, 5.0, 15.0)
+CALLS = 20
+
+
+class SyntheticModel:
+    def transcribe(self, audio, **options):
+        level = float(np.abs(audio).mean())
+        return iter([SimpleNamespace(text=f"{level:.3f}", start=0.0, end=1.0)]), None
+
+
+def load_synthetic(settings):
+    return SyntheticModel()
+
+
+def load_real(settings):
+    from model_loader import get_model
+
+    return get_model(settings)
+
+
+def _time_calls(model, audio: np.ndarray) -> float:
+    timings = []
+    for _ in range(CALLS):
+        started = time.perf_counter()
+        segments, _ = model.transcribe(audio, beam_size=1)
+        list(segments)
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings))
+
+
+def main() -> None:
+    settings = load_settings(env={})
+    load = load_synthetic
+    if len(sys.argv) > 1:
+        settings = replace(settings, whisper_model_path=sys.argv[1])
+        load = load_real
+
+    in_process = load(settings)
+    worker = InferenceWorker(settings, load=load).start()
+    try:
+        rng = np.random.default_rng(0)
+        for seconds in WINDOW_SECONDS:
+            audio = rng.uniform(-0.1, 0.1, int(seconds * settings.sample_rate)).astype(np.float32)
+            _time_calls(worker, audio)  # first call waits for the worker to be ready
+            local = _time_calls(in_process, audio)
+            remote = _time_calls(worker, audio)
+            print(
+                f"{seconds:5.1f}s window: in process {1000 * local:8.2f} ms, "
+                f"worker {1000 * remote:8.2f} ms, difference {1000 * (remote - local):+7.2f} ms"
+            )
+    finally:
+        worker.close()
+    print(worker.stats.summary())
+
+
+if __name__ == "__main__":
+    main()
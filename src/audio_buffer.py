@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+_PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def pcm16_to_float32(chunk: bytes) -> np.ndarray:
+    samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+    samples *= _PCM16_SCALE
+    return samples
+
+
+def float32_to_pcm16(samples: np.ndarray) -> bytes:
+    scaled = np.clip(samples * 32768.0, -32768.0, 32767.0)
+    return scaled.astype(np.int16).tobytes()
+
+
+class SampleBuffer:
+    """Preallocated float32 sample storage for the streaming window.
+
+    Incoming int16 PCM is converted straight into the backing array and the
+    buffered audio is exposed as a contiguous view, so the hot path does not
+    allocate a new array per chunk. The storage only grows when a single
+    append would not fit, e.g. after the capture queue coalesced frames.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._storage = np.zeros(max(1, capacity), dtype=np.float32)
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._storage.size
+
+    def view(self) -> np.ndarray:
+        return self._storage[: self._size]
+
+    def append_pcm16(self, chunk: bytes) -> int:
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        count = samples.size
+        if not count:
+            return 0
+        self._reserve(self._size + count)
+        target = self._storage[self._size : self._size + count]
+        np.copyto(target, samples, casting="unsafe")
+        target *= _PCM16_SCALE
+        self._size += count
+        return count
+
+    def append(self, samples: np.ndarray) -> int:
+        count = samples.size
+        if not count:
+            return 0
+        self._reserve(self._size + count)
+        self._storage[self._size : self._size + count] = samples
+        self._size += count
+        return count
+
+    def keep_tail(self, count: int) -> None:
+        count = max(0, min(count, self._size))
+        if count and count < self._size:
+            self._storage[:count] = self._storage[self._size - count : self._size]
+        self._size = count
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def _reserve(self, required: int) -> None:
+        if required <= self._storage.size:
+            return
+        grown = np.zeros(max(required, 2 * self._storage.size), dtype=np.float32)
+        grown[: self._size] = self._storage[: self._size]
+        self._storage = grown
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
-from typing import Any, Generator, Iterator, List, Optional, Tuple
+from typing import Any, Deque, Generator, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pyaudio
 
 from config import Settings
+from resample import CaptureConverter
 
 
 LoopbackDevice = Tuple[int, Any]
@@ -38,22 +42,151 @@ def find_loopback_devices(p: pyaudio.PyAudio) -> List[LoopbackDevice]:
     return devices
 
 
+def native_capture_format(
+    p: pyaudio.PyAudio,
+    settings: Settings,
+    device_index: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Return the (sample rate, channel count) a device captures natively.
+
+    ``capture_sample_rate`` overrides the reported rate. Falls back to the
+    pipeline's mono format when native capture is disabled or the device
+    does not report a usable format.
+    """
+    fallback = (settings.capture_sample_rate or settings.sample_rate, 1)
+    if not settings.capture_native_format:
+        return fallback
+    try:
+        if device_index is None:
+            info = p.get_default_input_device_info()
+        else:
+            info = p.get_device_info_by_index(device_index)
+        rate = int(float(info["defaultSampleRate"]))
+        channels = int(info["maxInputChannels"])
+    except Exception:
+        return fallback
+    if rate <= 0 or channels <= 0:
+        return fallback
+    if settings.capture_sample_rate:
+        rate = settings.capture_sample_rate
+    # Beyond stereo the extra channels are rarely speech and only cost bandwidth.
+    return rate, min(channels, 2)
+
+
+class ConvertingStream:
+    """Reads a native-format stream and returns mono PCM at the pipeline rate.
+
+    ``read`` takes the chunk size in output samples and reads however many
+    native frames cover the same duration, so capture timing downstream is
+    unchanged.
+    """
+
+    def __init__(self, stream: pyaudio.Stream, converter: CaptureConverter) -> None:
+        self._stream = stream
+        self.converter = converter
+        self._requested = 0
+        self._read = 0
+
+    def read(self, chunk_samples: int, exception_on_overflow: bool = False) -> bytes:
+        self._requested += chunk_samples
+        target = self._requested * self.converter.input_rate // self.converter.output_rate
+        frames = max(1, target - self._read)
+        self._read += frames
+        data = self._stream.read(frames, exception_on_overflow=exception_on_overflow)
+        return self.converter.convert(data)
+
+    def stop_stream(self) -> None:
+        self._stream.stop_stream()
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+class CallbackStream:
+    """Collects PortAudio callback buffers behind a blocking ``read``.
+
+    PortAudio hands each small hardware buffer to ``callback`` as soon as
+    it is recorded; ``read`` returns once enough frames for a chunk have
+    arrived, and raises ``IOError`` if the device stops delivering.
+    """
+
+    def __init__(self, bytes_per_frame: int, timeout: float) -> None:
+        self._bytes_per_frame = bytes_per_frame
+        self._timeout = timeout
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stream: Optional[pyaudio.Stream] = None
+
+    def callback(self, in_data: Optional[bytes], frame_count: int, time_info: Any, status: int):
+        with self._cond:
+            if in_data:
+                self._buffer += in_data
+            self._cond.notify_all()
+        return None, pyaudio.paContinue
+
+    def read(self, frames: int, exception_on_overflow: bool = False) -> bytes:
+        needed = frames * self._bytes_per_frame
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._closed or len(self._buffer) >= needed, self._timeout
+            )
+            if not ready or len(self._buffer) < needed:
+                raise IOError("No audio delivered by the capture callback")
+            data = bytes(self._buffer[:needed])
+            del self._buffer[:needed]
+            return data
+
+    def stop_stream(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self.stream is not None:
+            self.stream.stop_stream()
+
+    def close(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+
+
 @contextmanager
 def managed_input_stream(
     p: pyaudio.PyAudio,
     settings: Settings,
     device_index: Optional[int] = None,
 ) -> Generator[pyaudio.Stream, None, None]:
+    rate, channels = native_capture_format(p, settings, device_index)
+    frames_per_buffer = max(1, settings.chunk_samples * rate // settings.sample_rate)
+    options: dict[str, Any] = {}
+    callback_stream: Optional[CallbackStream] = None
+    if settings.capture_callback:
+        chunk_seconds = frames_per_buffer / rate
+        callback_stream = CallbackStream(2 * channels, timeout=1.0 + 2 * chunk_seconds)
+        options["stream_callback"] = callback_stream.callback
+        # Small hardware buffers; read() still assembles whole chunks.
+        frames_per_buffer = min(frames_per_buffer, max(64, rate // 100))
     stream = p.open(
         format=pyaudio.paInt16,
-        channels=1,
-        rate=settings.sample_rate,
+        channels=channels,
+        rate=rate,
         input=True,
-        frames_per_buffer=settings.chunk_samples,
+        frames_per_buffer=frames_per_buffer,
         input_device_index=device_index,
+        **options,
     )
+    if callback_stream is not None:
+        callback_stream.stream = stream
+        stream = callback_stream
+    converter = CaptureConverter(rate, channels, settings.sample_rate)
     try:
-        yield stream
+        if converter.passthrough:
+            yield stream
+        else:
+            print(
+                f"Capturing at {rate} Hz with {channels} channel(s); "
+                f"converting to {settings.sample_rate} Hz mono."
+            )
+            yield ConvertingStream(stream, converter)
     finally:
         stream.stop_stream()
         stream.close()
@@ -64,6 +197,145 @@ def stream_frames(stream: pyaudio.Stream, chunk_samples: int) -> Iterator[bytes]
         yield stream.read(chunk_samples, exception_on_overflow=False)
 
 
+class FrameQueue:
+    """Bounded hand-off between a capture thread and the inference worker.
+
+    When the queue is full the configured policy decides what happens to the
+    incoming frame: ``block`` waits for the consumer, ``drop-oldest`` discards
+    the oldest queued frame and ``coalesce`` appends the frame to the newest
+    queued one so no audio is lost while the queue length stays bounded.
+    Each frame is stamped with the monotonic time it was queued, a coalesced
+    frame with that of its first part; ``get`` exposes the stamp of the
+    frame it returned as ``last_timestamp``.
+    """
+
+    def __init__(self, maxsize: int, policy: str = "drop-oldest") -> None:
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.dropped = 0
+        self.dropped_bytes = 0
+        self.coalesced = 0
+        self._frames: Deque[bytes] = deque()
+        self._stamps: Deque[float] = deque()
+        self.last_timestamp: Optional[float] = None
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._frames)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def put(self, frame: bytes) -> None:
+        with self._cond:
+            if self.policy == "block":
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._frames) < self.maxsize
+                )
+            if self._closed:
+                return
+            stamp = time.monotonic()
+            if len(self._frames) >= self.maxsize:
+                if self.policy == "coalesce":
+                    # Keep the stamp of the merged frame's oldest audio, so
+                    # latency downstream still shows the backlog.
+                    self._frames[-1] += frame
+                    self.coalesced += 1
+                    self._cond.notify_all()
+                    return
+                self.dropped_bytes += len(self._frames.popleft())
+                self._stamps.popleft()
+                self.dropped += 1
+            self._frames.append(frame)
+            self._stamps.append(stamp)
+            self._cond.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until a frame is queued or the queue closes, without taking it."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._frames or self._closed, timeout)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[bytes]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self._closed, timeout)
+            if not self._frames:
+                return None
+            frame = self._frames.popleft()
+            self.last_timestamp = self._stamps.popleft()
+            self._cond.notify_all()
+            return frame
+
+    def get_until(self, timestamp: float) -> Optional[bytes]:
+        """Take the oldest frame if it was queued by ``timestamp``, without waiting."""
+        with self._cond:
+            if not self._frames or self._stamps[0] > timestamp:
+                return None
+            frame = self._frames.popleft()
+            self.last_timestamp = self._stamps.popleft()
+            self._cond.notify_all()
+            return frame
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+class CaptureThread(threading.Thread):
+    """Drains a PyAudio stream into a ``FrameQueue`` independently of inference."""
+
+    def __init__(
+        self,
+        stream: pyaudio.Stream,
+        chunk_samples: int,
+        frames: FrameQueue,
+        name: str = "audio-capture",
+    ) -> None:
+        super().__init__(name=name, daemon=True)
+        self._stream = stream
+        self._chunk_samples = chunk_samples
+        self._frames = frames
+        self._stop_event = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            for frame in stream_frames(self._stream, self._chunk_samples):
+                if self._stop_event.is_set():
+                    break
+                self._frames.put(frame)
+        except IOError as exc:
+            if not self._stop_event.is_set():
+                self.error = exc
+                print(f"Audio capture stopped ({self.name}): {exc}")
+        finally:
+            self._frames.close()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._frames.close()
+
+
+@contextmanager
+def captured_frames(
+    stream: pyaudio.Stream,
+    settings: Settings,
+    name: str = "audio-capture",
+) -> Generator[FrameQueue, None, None]:
+    frames = FrameQueue(settings.capture_queue_size, settings.capture_backpressure)
+    capture = CaptureThread(stream, settings.chunk_samples, frames, name=name)
+    capture.start()
+    try:
+        yield frames
+    finally:
+        capture.stop()
+        # Let the pending read return before the stream gets closed underneath it.
+        capture.join(timeout=max(0.5, 2 * settings.chunk_samples / settings.sample_rate))
+
+
 def mix_audio(data1: bytes, data2: bytes) -> bytes:
     arr1 = np.frombuffer(data1, dtype=np.int16)
     arr2 = np.frombuffer(data2, dtype=np.int16)
@@ -99,4 +371,4 @@ def list_audio_devices() -> None:
         print(f"  Max Input Channels: {dev_info['maxInputChannels']}")
         print(f"  Max Output Channels: {dev_info['maxOutputChannels']}")
         print()
-    p.terminate()
+    p.terminate()
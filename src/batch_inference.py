@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Deque, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+
+# Whisper's decoder context, and faster-whisper's defaults for the first
+# timestamp (1 s) and for dropping a window as silence.
+_MAX_LENGTH = 448
+_TIME_PRECISION = 0.02
+_MAX_INITIAL_TIMESTAMP_INDEX = 50
+_NO_SPEECH_THRESHOLD = 0.6
+_LOG_PROB_THRESHOLD = -1.0
+# Options the joint decode reproduces; anything else goes through transcribe().
+_JOINT_OPTIONS = frozenset(
+    {
+        "beam_size",
+        "temperature",
+        "vad_filter",
+        "language",
+        "without_timestamps",
+        "max_new_tokens",
+        "initial_prompt",
+        "condition_on_previous_text",
+    }
+)
+
+
+@dataclass(frozen=True)
+class BatchReport:
+    size: int
+    wait_seconds: float
+    decode_seconds: float
+    audio_seconds: float
+
+    @property
+    def throughput(self) -> float:
+        """Seconds of audio decoded per second of decoding."""
+        return self.audio_seconds / self.decode_seconds if self.decode_seconds else 0.0
+
+
+@dataclass
+class BatchStats:
+    batches: int = 0
+    requests: int = 0
+    audio_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    wait_seconds: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    def summary(self) -> str:
+        throughput = self.audio_seconds / self.decode_seconds if self.decode_seconds else 0.0
+        mean_wait = self.wait_seconds / self.requests if self.requests else 0.0
+        return (
+            f"{self.batches} batches, {self.mean_batch_size:.1f} windows per batch, "
+            f"{throughput:.1f}x real time, {1000 * mean_wait:.0f} ms mean queueing"
+        )
+
+
+def _compression_ratio(text: str) -> float:
+    data = text.encode("utf-8")
+    return len(data) / len(zlib.compress(data)) if data else 0.0
+
+
+def decode_jointly(model: "WhisperModel", windows: list, options: dict) -> list:
+    """Encode and decode several windows of one model in single batched calls.
+
+    Goes below ``WhisperModel.transcribe`` to the CTranslate2 model, which
+    accepts a batch of mel spectrograms and one prompt per window: one
+    ``encode``, one ``detect_language`` when the language is open, and one
+    ``generate`` serve the whole batch. Each window must fit Whisper's 30 s
+    context. Returns a ``(segments, info)`` pair per window, with the
+    window's text as a single segment shaped like faster-whisper's.
+    """
+    import ctranslate2
+    from faster_whisper.tokenizer import Tokenizer
+
+    extractor = model.feature_extractor
+    # The extractor pads with 30 s of silence, so every window yields at
+    # least a full context of frames, as in transcribe().
+    features = np.stack([extractor(audio)[:, : extractor.nb_max_frames] for audio in windows])
+    encoded = model.model.encode(
+        ctranslate2.StorageView.from_array(np.ascontiguousarray(features, dtype=np.float32))
+    )
+
+    multilingual = model.model.is_multilingual
+    language = options.get("language")
+    if language is not None or not multilingual:
+        detected = [(language or "en", 1.0)] * len(windows)
+    else:
+        detected = [
+            (ranked[0][0][2:-2], ranked[0][1]) for ranked in model.model.detect_language(encoded)
+        ]
+
+    without_timestamps = bool(options.get("without_timestamps", False))
+    initial_prompt = options.get("initial_prompt")
+    tokenizers, prompts = [], []
+    for window_language, _ in detected:
+        tokenizer = Tokenizer(
+            model.hf_tokenizer, multilingual, task="transcribe", language=window_language
+        )
+        prompt = []
+        if initial_prompt:
+            prompt.append(tokenizer.sot_prev)
+            prompt.extend(tokenizer.encode(" " + initial_prompt.strip())[-(_MAX_LENGTH // 2 - 1) :])
+        prompt.extend(tokenizer.sot_sequence)
+        if without_timestamps:
+            prompt.append(tokenizer.no_timestamps)
+        tokenizers.append(tokenizer)
+        prompts.append(prompt)
+
+    max_length = _MAX_LENGTH
+    if options.get("max_new_tokens"):
+        longest = max(len(prompt) for prompt in prompts)
+        max_length = min(_MAX_LENGTH, longest + options["max_new_tokens"])
+    results = model.model.generate(
+        encoded,
+        prompts,
+        beam_size=options.get("beam_size", 5),
+        max_length=max_length,
+        return_scores=True,
+        return_no_speech_prob=True,
+        suppress_blank=True,
+        suppress_tokens=[-1],
+        max_initial_timestamp_index=_MAX_INITIAL_TIMESTAMP_INDEX,
+    )
+
+    decoded = []
+    for audio, result, tokenizer, (window_language, probability) in zip(
+        windows, results, tokenizers, detected
+    ):
+        duration = audio.size / extractor.sampling_rate
+        tokens = list(result.sequences_ids[0])
+        text = tokenizer.decode(tokens)
+        stamps = [token - tokenizer.timestamp_begin for token in tokens if token >= tokenizer.timestamp_begin]
+        avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+        segments = []
+        silent = result.no_speech_prob > _NO_SPEECH_THRESHOLD and avg_logprob < _LOG_PROB_THRESHOLD
+        if text.strip() and not silent:
+            segments.append(
+                SimpleNamespace(
+                    id=1,
+                    seek=0,
+                    start=stamps[0] * _TIME_PRECISION if stamps else 0.0,
+                    end=min(duration, stamps[-1] * _TIME_PRECISION) if len(stamps) > 1 else duration,
+                    text=text,
+                    tokens=tokens,
+                    temperature=0.0,
+                    avg_logprob=avg_logprob,
+                    compression_ratio=_compression_ratio(text),
+                    no_speech_prob=result.no_speech_prob,
+                    words=None,
+                )
+            )
+        info = SimpleNamespace(
+            language=window_language, language_probability=probability, duration=duration
+        )
+        decoded.append((segments, info))
+    return decoded
+
+
+def _joint_key(model: Any, audio: np.ndarray, options: dict) -> Optional[tuple]:
+    """Requests with equal keys can share one joint decode; None means never."""
+    extractor = getattr(model, "feature_extractor", None)
+    if extractor is None or not hasattr(model, "hf_tokenizer") or not hasattr(model, "model"):
+        return None
+    if audio.size > extractor.n_samples or not set(options) <= _JOINT_OPTIONS:
+        return None
+    if options.get("vad_filter") or options.get("temperature") != 0:
+        return None
+    return (
+        id(model),
+        options.get("beam_size", 5),
+        options.get("language"),
+        bool(options.get("without_timestamps", False)),
+        options.get("max_new_tokens"),
+        options.get("initial_prompt"),
+    )
+
+
+class _Request:
+    def __init__(self, model: "WhisperModel", audio: np.ndarray, options: dict) -> None:
+        self.model = model
+        self.audio = audio
+        self.options = options
+        self.key = _joint_key(model, audio, options)
+        self.queued = time.perf_counter()
+        self.done = threading.Event()
+        self.segments: list = []
+        self.info: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class BatchedDecoder:
+    """Collects windows from several transcribers and decodes them in batches.
+
+    ``transcribe`` blocks its caller until the window is decoded and
+    returns ``(segments, info)`` like ``WhisperModel.transcribe``. The
+    inference thread takes the first waiting window, then gathers more for
+    up to ``max_wait_seconds`` or until ``max_batch_size`` are ready.
+    Windows of the same faster-whisper model with compatible options go
+    through ``decode_jointly``, one encoder and one generate call for all
+    of them. The rest, such as decodes with word timestamps, and models
+    that are not faster-whisper models, are transcribed one by one.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        max_batch_size: int = 4,
+        max_wait_seconds: float = 0.03,
+        on_batch: Optional[Callable[[BatchReport], None]] = None,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait_seconds = max(0.0, max_wait_seconds)
+        self._on_batch = on_batch
+        self._pending: Deque[_Request] = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._joint = True
+        self.stats = BatchStats()
+        self._thread = threading.Thread(target=self._run, name="batch-decoder", daemon=True)
+        self._thread.start()
+
+    def transcribe(self, model: "WhisperModel", audio: np.ndarray, **options: Any) -> tuple[list, Any]:
+        request = _Request(model, audio, options)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("batched decoder is closed")
+            self._pending.append(request)
+            self._condition.notify_all()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.segments, request.info
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _next_batch(self) -> list[_Request]:
+        with self._condition:
+            while not self._pending and not self._closed:
+                self._condition.wait()
+            if not self._pending:
+                return []
+            deadline = self._pending[0].queued + self._max_wait_seconds
+            while len(self._pending) < self._max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            count = min(len(self._pending), self._max_batch_size)
+            return [self._pending.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            self._decode_batch(batch)
+
+    def _decode_batch(self, batch: list[_Request]) -> None:
+        started = time.perf_counter()
+        wait_seconds = sum(started - request.queued for request in batch)
+        groups: dict[tuple, list[_Request]] = {}
+        for request in batch:
+            if request.key is None or not self._joint:
+                self._decode_alone(request)
+            else:
+                groups.setdefault(request.key, []).append(request)
+        for group in groups.values():
+            if len(group) == 1:
+                self._decode_alone(group[0])
+            else:
+                self._decode_together(group)
+
+        report = BatchReport(
+            size=len(batch),
+            wait_seconds=wait_seconds / len(batch),
+            decode_seconds=time.perf_counter() - started,
+            audio_seconds=sum(request.audio.size for request in batch) / self._sample_rate,
+        )
+        self.stats.batches += 1
+        self.stats.requests += report.size
+        self.stats.audio_seconds += report.audio_seconds
+        self.stats.decode_seconds += report.decode_seconds
+        self.stats.wait_seconds += wait_seconds
+        if self._on_batch is not None:
+            self._on_batch(report)
+
+    def _decode_alone(self, request: _Request) -> None:
+        try:
+            segments, request.info = request.model.transcribe(request.audio, **request.options)
+            request.segments = list(segments)
+        except Exception as exc:
+            request.error = exc
+        finally:
+            request.done.set()
+
+    def _decode_together(self, group: list[_Request]) -> None:
+        first = group[0]
+        try:
+            results = decode_jointly(first.model, [request.audio for request in group], first.options)
+        except Exception as exc:
+            # Most likely a faster-whisper release whose internals differ.
+            print(f"Joint decoding failed ({exc}); decoding windows one by one.")
+            self._joint = False
+            for request in group:
+                self._decode_alone(request)
+            return
+        for request, (segments, info) in zip(group, results):
+            request.segments, request.info = segments, info
+            request.done.set()
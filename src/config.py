@@ -4,11 +4,42 @@ import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, Optional, Union
+from typing import Any, Mapping, Optional, Tuple, Union
 
 
+# Whisper consumes 16 kHz mono; devices may capture at other rates and are
+# resampled to this in the capture thread.
 DEFAULT_SAMPLE_RATE = 16000
 DEFAULT_CHUNK_SAMPLES = 4096
+MIN_CHUNK_SAMPLES = 256
+MAX_CHUNK_SAMPLES = 65536
+MIN_CAPTURE_SAMPLE_RATE = 8000
+MAX_CAPTURE_SAMPLE_RATE = 192000
+DEFAULT_CAPTURE_QUEUE_SIZE = 32
+DEFAULT_CAPTURE_BACKPRESSURE = "drop-oldest"
+
+BACKPRESSURE_POLICIES = ("block", "drop-oldest", "coalesce")
+STREAMING_POLICIES = ("window", "agreement", "endpoint")
+VAD_MODES = ("streaming", "whisper", "off")
+CAPTURE_SOURCE_MODES = ("mixed", "separate")
+WHISPER_DEVICES = ("auto", "cpu", "cuda")
+CATCHUP_POLICIES = ("off", "skip", "merge", "beam")
+
+# Defaults each capture profile applies unless the individual key is set:
+# chunk size in 16 kHz samples, callback delivery and capture queue length.
+CAPTURE_PROFILES = {
+    "balanced": {
+        "chunk_samples": DEFAULT_CHUNK_SAMPLES,
+        "callback": False,
+        "queue_size": DEFAULT_CAPTURE_QUEUE_SIZE,
+    },
+    "latency": {"chunk_samples": 1024, "callback": True, "queue_size": 64},
+    "throughput": {
+        "chunk_samples": 8192,
+        "callback": False,
+        "queue_size": DEFAULT_CAPTURE_QUEUE_SIZE,
+    },
+}
 
 _CONFIG_KEYS = {
     "WHISPER_MODEL_PATH",
@@ -16,7 +47,46 @@ _CONFIG_KEYS = {
     "WHISPER_LANGUAGE",
     "WHISPER_WINDOW_SECONDS",
     "WHISPER_OVERLAP_SECONDS",
+    "WHISPER_MIN_WINDOW_SECONDS",
+    "WHISPER_MAX_WINDOW_SECONDS",
     "WHISPER_BEAM_SIZE",
+    "WHISPER_DEVICE",
+    "WHISPER_CPU_THREADS",
+    "WHISPER_NUM_WORKERS",
+    "MODEL_CACHE_SIZE",
+    "MODEL_MEMORY_BUDGET_MB",
+    "MODEL_IDLE_UNLOAD_SECONDS",
+    "INFERENCE_WORKER",
+    "CAPTURE_QUEUE_SIZE",
+    "CAPTURE_BACKPRESSURE",
+    "CAPTURE_SOURCES",
+    "CAPTURE_NATIVE_FORMAT",
+    "CAPTURE_PROFILE",
+    "CAPTURE_CHUNK_SAMPLES",
+    "CAPTURE_SAMPLE_RATE",
+    "CAPTURE_CALLBACK",
+    "STREAMING_POLICY",
+    "SILENCE_GATE",
+    "SILENCE_GATE_MARGIN_DB",
+    "VAD_MODE",
+    "ENDPOINT_PAUSE_SECONDS",
+    "ADAPTIVE_WINDOW",
+    "TARGET_RTF",
+    "DECODE_DEADLINE_FACTOR",
+    "CATCHUP_POLICY",
+    "CATCHUP_BACKLOG_SECONDS",
+    "CATCHUP_TARGET_SECONDS",
+    "ADAPTIVE_BEAM",
+    "ADAPTIVE_BEAM_LOGPROB",
+    "ADAPTIVE_BEAM_COMPRESSION_RATIO",
+    "LANGUAGE_LOCK_WINDOWS",
+    "LANGUAGE_LOCK_PROBABILITY",
+    "LANGUAGE_RECHECK_SECONDS",
+    "WHISPER_MODEL_LADDER",
+    "WHISPER_LANGUAGE_MODELS",
+    "WHISPER_PARTIAL_MODEL_PATH",
+    "INFERENCE_BATCH_SIZE",
+    "INFERENCE_BATCH_WAIT_SECONDS",
 }
 _CONFIG_KEYS_LOOKUP = {key.lower(): key for key in _CONFIG_KEYS}
 
@@ -34,6 +104,44 @@ class Settings:
     whisper_compute_type: str
     whisper_beam_size: int
     whisper_language: Optional[str]
+    capture_queue_size: int = DEFAULT_CAPTURE_QUEUE_SIZE
+    capture_backpressure: str = DEFAULT_CAPTURE_BACKPRESSURE
+    capture_sources: str = "mixed"
+    capture_native_format: bool = True
+    capture_profile: str = "balanced"
+    capture_sample_rate: Optional[int] = None
+    capture_callback: bool = False
+    streaming_policy: str = "window"
+    silence_gate: bool = False
+    silence_gate_margin_db: float = 6.0
+    vad_mode: str = "streaming"
+    min_window_seconds: float = 1.0
+    max_window_seconds: float = 10.0
+    endpoint_pause_seconds: float = 0.5
+    adaptive_window: bool = False
+    target_rtf: float = 0.8
+    decode_deadline_factor: float = 0.0
+    catchup_policy: str = "off"
+    catchup_backlog_seconds: float = 3.0
+    catchup_target_seconds: float = 1.0
+    adaptive_beam: bool = False
+    adaptive_beam_logprob: float = -0.8
+    adaptive_beam_compression_ratio: float = 2.4
+    language_lock_windows: int = 0
+    language_lock_probability: float = 0.8
+    language_recheck_seconds: float = 60.0
+    whisper_model_ladder: Tuple[str, ...] = ()
+    whisper_language_models: Tuple[Tuple[str, str], ...] = ()
+    whisper_partial_model_path: Optional[str] = None
+    inference_batch_size: int = 1
+    inference_batch_wait_seconds: float = 0.03
+    whisper_device: str = "auto"
+    whisper_cpu_threads: int = 0
+    whisper_num_workers: int = 1
+    model_cache_size: int = 2
+    model_memory_budget_mb: int = 0
+    model_idle_unload_seconds: float = 0.0
+    inference_worker: bool = False
 
 
 def _flatten_config_data(raw: Any, prefix: str = "") -> dict[str, Any]:
@@ -110,6 +218,49 @@ def _coerce_to_str(value: Any, default: str) -> str:
     return str(value)
 
 
+def _parse_bool(value: Optional[Any], default: bool) -> bool:
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    normalized = str(value).strip().lower()
+    if normalized in {"1", "true", "yes", "on"}:
+        return True
+    if normalized in {"0", "false", "no", "off"}:
+        return False
+    return default
+
+
+def _parse_list(value: Optional[Any]) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        items = value.split(",")
+    elif isinstance(value, (list, tuple)):
+        items = [str(item) for item in value]
+    else:
+        return ()
+    return tuple(item.strip() for item in items if item.strip())
+
+
+def _parse_routes(value: Optional[Any]) -> Tuple[Tuple[str, str], ...]:
+    routes = []
+    for item in _parse_list(value):
+        language, separator, model_path = item.partition("=")
+        if separator and language.strip() and model_path.strip():
+            routes.append((language.strip().lower(), model_path.strip()))
+    return tuple(routes)
+
+
+def _parse_choice(value: Optional[Any], default: str, choices: tuple[str, ...]) -> str:
+    if value is None:
+        return default
+    normalized = str(value).strip().lower().replace("_", "-")
+    if normalized in choices:
+        return normalized
+    return default
+
+
 
 def normalize_config_key(key: str) -> str | None:
     if not isinstance(key, str):
@@ -174,7 +325,77 @@ def load_settings(
 
     window_seconds = _parse_float(merged.get("WHISPER_WINDOW_SECONDS"), 1.5, 0.5)
     overlap_seconds = _parse_float(merged.get("WHISPER_OVERLAP_SECONDS"), 0.4, 0.0)
+    min_window_seconds = _parse_float(merged.get("WHISPER_MIN_WINDOW_SECONDS"), 1.0, 0.5)
+    max_window_seconds = max(
+        min_window_seconds,
+        _parse_float(merged.get("WHISPER_MAX_WINDOW_SECONDS"), 10.0, 0.5),
+    )
+    endpoint_pause_seconds = _parse_float(merged.get("ENDPOINT_PAUSE_SECONDS"), 0.5, 0.1)
+    adaptive_window = _parse_bool(merged.get("ADAPTIVE_WINDOW"), False)
+    target_rtf = _parse_float(merged.get("TARGET_RTF"), 0.8, 0.05)
+    decode_deadline_factor = _parse_float(merged.get("DECODE_DEADLINE_FACTOR"), 0.0, 0.0)
+    catchup_policy = _parse_choice(merged.get("CATCHUP_POLICY"), "off", CATCHUP_POLICIES)
+    catchup_backlog_seconds = _parse_float(merged.get("CATCHUP_BACKLOG_SECONDS"), 3.0, 0.5)
+    catchup_target_seconds = min(
+        catchup_backlog_seconds,
+        _parse_float(merged.get("CATCHUP_TARGET_SECONDS"), 1.0, 0.0),
+    )
+    adaptive_beam = _parse_bool(merged.get("ADAPTIVE_BEAM"), False)
+    adaptive_beam_logprob = min(
+        0.0, _parse_float(merged.get("ADAPTIVE_BEAM_LOGPROB"), -0.8, float("-inf"))
+    )
+    adaptive_beam_compression_ratio = _parse_float(
+        merged.get("ADAPTIVE_BEAM_COMPRESSION_RATIO"), 2.4, 1.0
+    )
+    language_lock_windows = max(0, _parse_int(merged.get("LANGUAGE_LOCK_WINDOWS"), 0))
+    language_lock_probability = min(
+        1.0, _parse_float(merged.get("LANGUAGE_LOCK_PROBABILITY"), 0.8, 0.0)
+    )
+    language_recheck_seconds = _parse_float(merged.get("LANGUAGE_RECHECK_SECONDS"), 60.0, 0.0)
+    model_ladder = _parse_list(merged.get("WHISPER_MODEL_LADDER"))
+    language_models = _parse_routes(merged.get("WHISPER_LANGUAGE_MODELS"))
+    partial_model_path = _coerce_to_str(merged.get("WHISPER_PARTIAL_MODEL_PATH"), "").strip()
+    batch_size = max(1, _parse_int(merged.get("INFERENCE_BATCH_SIZE"), 1))
+    batch_wait_seconds = _parse_float(merged.get("INFERENCE_BATCH_WAIT_SECONDS"), 0.03, 0.0)
     beam_size = _parse_int(merged.get("WHISPER_BEAM_SIZE"), 1)
+    device = _parse_choice(merged.get("WHISPER_DEVICE"), "auto", WHISPER_DEVICES)
+    cpu_threads = max(0, _parse_int(merged.get("WHISPER_CPU_THREADS"), 0))
+    num_workers = max(1, _parse_int(merged.get("WHISPER_NUM_WORKERS"), 1))
+    model_cache_size = max(1, _parse_int(merged.get("MODEL_CACHE_SIZE"), 2))
+    model_memory_budget_mb = max(0, _parse_int(merged.get("MODEL_MEMORY_BUDGET_MB"), 0))
+    model_idle_unload_seconds = _parse_float(merged.get("MODEL_IDLE_UNLOAD_SECONDS"), 0.0, 0.0)
+    inference_worker = _parse_bool(merged.get("INFERENCE_WORKER"), False)
+    capture_profile = _parse_choice(
+        merged.get("CAPTURE_PROFILE"), "balanced", tuple(CAPTURE_PROFILES)
+    )
+    profile = CAPTURE_PROFILES[capture_profile]
+    chunk_samples = min(
+        MAX_CHUNK_SAMPLES,
+        max(
+            MIN_CHUNK_SAMPLES,
+            _parse_int(merged.get("CAPTURE_CHUNK_SAMPLES"), profile["chunk_samples"]),
+        ),
+    )
+    capture_sample_rate: Optional[int] = _parse_int(merged.get("CAPTURE_SAMPLE_RATE"), 0)
+    if not MIN_CAPTURE_SAMPLE_RATE <= capture_sample_rate <= MAX_CAPTURE_SAMPLE_RATE:
+        capture_sample_rate = None
+    capture_callback = _parse_bool(merged.get("CAPTURE_CALLBACK"), profile["callback"])
+    queue_size = max(1, _parse_int(merged.get("CAPTURE_QUEUE_SIZE"), profile["queue_size"]))
+    backpressure = _parse_choice(
+        merged.get("CAPTURE_BACKPRESSURE"),
+        DEFAULT_CAPTURE_BACKPRESSURE,
+        BACKPRESSURE_POLICIES,
+    )
+    capture_sources = _parse_choice(
+        merged.get("CAPTURE_SOURCES"), "mixed", CAPTURE_SOURCE_MODES
+    )
+    capture_native_format = _parse_bool(merged.get("CAPTURE_NATIVE_FORMAT"), True)
+    streaming_policy = _parse_choice(
+        merged.get("STREAMING_POLICY"), "window", STREAMING_POLICIES
+    )
+    silence_gate = _parse_bool(merged.get("SILENCE_GATE"), False)
+    silence_gate_margin_db = _parse_float(merged.get("SILENCE_GATE_MARGIN_DB"), 6.0, 0.0)
+    vad_mode = _parse_choice(merged.get("VAD_MODE"), "streaming", VAD_MODES)
 
     language_raw = merged.get("WHISPER_LANGUAGE")
     if language_raw is None:
@@ -187,13 +408,51 @@ def load_settings(
 
     return Settings(
         sample_rate=DEFAULT_SAMPLE_RATE,
-        chunk_samples=DEFAULT_CHUNK_SAMPLES,
+        chunk_samples=chunk_samples,
         window_seconds=window_seconds,
         overlap_seconds=overlap_seconds,
         whisper_model_path=_coerce_to_str(merged.get("WHISPER_MODEL_PATH"), "base"),
         whisper_compute_type=_coerce_to_str(merged.get("WHISPER_COMPUTE_TYPE"), "int8"),
         whisper_beam_size=beam_size,
         whisper_language=language,
+        capture_queue_size=queue_size,
+        capture_backpressure=backpressure,
+        capture_sources=capture_sources,
+        capture_native_format=capture_native_format,
+        capture_profile=capture_profile,
+        capture_sample_rate=capture_sample_rate,
+        capture_callback=capture_callback,
+        streaming_policy=streaming_policy,
+        silence_gate=silence_gate,
+        silence_gate_margin_db=silence_gate_margin_db,
+        vad_mode=vad_mode,
+        min_window_seconds=min_window_seconds,
+        max_window_seconds=max_window_seconds,
+        endpoint_pause_seconds=endpoint_pause_seconds,
+        adaptive_window=adaptive_window,
+        target_rtf=target_rtf,
+        decode_deadline_factor=decode_deadline_factor,
+        catchup_policy=catchup_policy,
+        catchup_backlog_seconds=catchup_backlog_seconds,
+        catchup_target_seconds=catchup_target_seconds,
+        adaptive_beam=adaptive_beam,
+        adaptive_beam_logprob=adaptive_beam_logprob,
+        adaptive_beam_compression_ratio=adaptive_beam_compression_ratio,
+        language_lock_windows=language_lock_windows,
+        language_lock_probability=language_lock_probability,
+        language_recheck_seconds=language_recheck_seconds,
+        whisper_model_ladder=model_ladder,
+        whisper_language_models=language_models,
+        whisper_partial_model_path=partial_model_path or None,
+        inference_batch_size=batch_size,
+        inference_batch_wait_seconds=batch_wait_seconds,
+        whisper_device=device,
+        whisper_cpu_threads=cpu_threads,
+        whisper_num_workers=num_workers,
+        model_cache_size=model_cache_size,
+        model_memory_budget_mb=model_memory_budget_mb,
+        model_idle_unload_seconds=model_idle_unload_seconds,
+        inference_worker=inference_worker,
     )
 
 
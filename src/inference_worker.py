@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from config import Settings
+
+
+_FLOAT32_BYTES = np.dtype(np.float32).itemsize
+
+
+class SharedAudioRing:
+    """Float32 sample ring in shared memory, written by one process at a time.
+
+    ``write`` stores a window contiguously after the previous one (wrapping
+    to the start when it would not fit) and returns its offset, so only the
+    offset and length have to cross the process boundary.
+    """
+
+    def __init__(self, capacity: int, name: Optional[str] = None) -> None:
+        self.capacity = capacity
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=capacity * _FLOAT32_BYTES)
+            self._owner = True
+        else:
+            # A spawned worker shares its parent's resource tracker, so
+            # attaching adds no second registration and the owner's unlink
+            # remains the only cleanup.
+            self._memory = shared_memory.SharedMemory(name=name)
+            self._owner = False
+        self._samples = np.ndarray((capacity,), dtype=np.float32, buffer=self._memory.buf)
+        self._head = 0
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def write(self, audio: np.ndarray) -> int:
+        count = audio.size
+        if count > self.capacity:
+            raise ValueError(f"window of {count} samples exceeds the {self.capacity}-sample ring")
+        if self._head + count > self.capacity:
+            self._head = 0
+        offset = self._head
+        self._samples[offset : offset + count] = audio
+        self._head = offset + count
+        return offset
+
+    def view(self, offset: int, count: int) -> np.ndarray:
+        return self._samples[offset : offset + count]
+
+    def close(self) -> None:
+        # Views into the buffer must be gone before the mapping can close.
+        del self._samples
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+def _load_worker_model(settings: Settings) -> Any:
+    from model_loader import configure_registry, get_model
+
+    # The worker process has a registry of its own.
+    configure_registry(settings)
+    return get_model(settings)
+
+
+def _worker_main(
+    connection: Connection,
+    ring_name: str,
+    capacity: int,
+    settings: Settings,
+    load: Callable[[Settings], Any],
+) -> None:
+    ring = SharedAudioRing(capacity, name=ring_name)
+    try:
+        started = time.perf_counter()
+        try:
+            model = load(settings)
+            segments, _ = model.transcribe(
+                np.zeros(settings.sample_rate, dtype=np.float32), beam_size=1, vad_filter=False
+            )
+            list(segments)
+        except Exception as exc:
+            connection.send(("error", f"model load failed: {exc}"))
+            return
+        connection.send(("ready", time.perf_counter() - started))
+
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                return
+            if message is None:
+                return
+            offset, count, options = message
+            started = time.perf_counter()
+            try:
+                segments, info = model.transcribe(ring.view(offset, count), **options)
+                result = ("ok", list(segments), info, time.perf_counter() - started)
+            except Exception as exc:
+                result = ("error", str(exc))
+            connection.send(result)
+    finally:
+        ring.close()
+
+
+@dataclass
+class WorkerStats:
+    calls: int = 0
+    decode_seconds: float = 0.0
+    round_trip_seconds: float = 0.0
+    restarts: int = 0
+    ready_seconds: Optional[float] = None
+
+    @property
+    def overhead_seconds(self) -> float:
+        """Mean time per call spent outside the model: transport and wake-ups."""
+        if not self.calls:
+            return 0.0
+        return (self.round_trip_seconds - self.decode_seconds) / self.calls
+
+    def summary(self) -> str:
+        return (
+            f"{self.calls} worker calls, {1000 * self.overhead_seconds:.1f} ms "
+            f"transport overhead per call, {self.restarts} restarts"
+        )
+
+
+class InferenceWorker:
+    """Runs the Whisper model in a child process behind ``transcribe``.
+
+    Audio goes through a ``SharedAudioRing`` and only offsets, decode
+    options and the resulting segments travel over a pipe. If the worker
+    dies, the call in flight fails and the next one starts a fresh worker,
+    up to ``max_restarts`` times. Calls from several threads are served one
+    at a time, as with an in-process model.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        ring_seconds: float = 60.0,
+        max_restarts: int = 5,
+        load: Callable[[Settings], Any] = _load_worker_model,
+    ) -> None:
+        self._settings = settings
+        self._load = load
+        self._max_restarts = max_restarts
+        self._ring = SharedAudioRing(max(1, int(ring_seconds * settings.sample_rate)))
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self._connection: Optional[Connection] = None
+        self._ready = False
+        self._failed = False
+        self.stats = WorkerStats()
+
+    def start(self) -> "InferenceWorker":
+        parent, child = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main,
+            args=(child, self._ring.name, self._ring.capacity, self._settings, self._load),
+            name="inference-worker",
+            daemon=True,
+        )
+        self._process.start()
+        child.close()
+        self._connection = parent
+        self._ready = False
+        return self
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def transcribe(self, audio: np.ndarray, **options: Any) -> tuple[list, Any]:
+        with self._lock:
+            if not self.alive:
+                self._restart()
+            offset = self._ring.write(np.asarray(audio, dtype=np.float32))
+            assert self._connection is not None
+            try:
+                if not self._ready:
+                    self._await_ready()
+                started = time.perf_counter()
+                self._connection.send((offset, audio.size, options))
+                reply = self._receive()
+            except (EOFError, OSError) as exc:
+                # Reap it now so the next call starts a fresh worker.
+                self._stop(timeout=0.5)
+                self._failed = True
+                raise RuntimeError(f"inference worker exited: {exc}") from exc
+            if reply[0] != "ok":
+                raise RuntimeError(f"inference worker: {reply[1]}")
+            _, segments, info, decode_seconds = reply
+            self.stats.calls += 1
+            self.stats.decode_seconds += decode_seconds
+            self.stats.round_trip_seconds += time.perf_counter() - started
+            return segments, info
+
+    def close(self, timeout: float = 2.0) -> None:
+        with self._lock:
+            self._stop(timeout)
+            self._ring.close()
+
+    def _await_ready(self) -> None:
+        reply = self._receive()
+        if reply[0] != "ready":
+            raise RuntimeError(f"inference worker: {reply[1]}")
+        self._ready = True
+        self.stats.ready_seconds = reply[1]
+        print(f"Inference worker ready in {reply[1]:.1f}s.")
+
+    def _receive(self) -> tuple:
+        assert self._connection is not None
+        while not self._connection.poll(0.1):
+            if not self.alive:
+                raise EOFError("worker process is gone")
+        return self._connection.recv()
+
+    def _restart(self) -> None:
+        if self.stats.restarts >= self._max_restarts:
+            raise RuntimeError("inference worker keeps failing; giving up")
+        if self._process is not None or self._failed:
+            self.stats.restarts += 1
+            print("Inference worker is not running; restarting it.")
+        self._failed = False
+        self._stop(timeout=0.5)
+        self.start()
+
+    def _stop(self, timeout: float) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.send(None)
+            except (OSError, BrokenPipeError):
+                pass
+            self._connection.close()
+            self._connection = None
+        if self._process is not None:
+            self._process.join(timeout)
+            if self._process.is_alive():
+                self._process.terminate()
+                self._process.join(timeout)
+            self._process = None
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class LanguageLock:
+    """Fixes the decoding language once detection has settled.
+
+    While unlocked every window runs faster-whisper's language detection.
+    After ``windows`` consecutive detections of the same language with at
+    least ``min_probability``, that language is passed to the model
+    directly, which skips detection and stops mid-sentence language flips.
+    Once ``recheck_seconds`` of audio has been decoded under the lock, one
+    window runs detection again; a confident different language releases
+    the lock and detection starts over from that window.
+    """
+
+    def __init__(self, windows: int, min_probability: float, recheck_seconds: float) -> None:
+        self.windows = max(1, windows)
+        self.min_probability = min_probability
+        self.recheck_seconds = recheck_seconds
+        self.language: Optional[str] = None
+        self._candidate: Optional[str] = None
+        self._count = 0
+        self._since_check = 0.0
+
+    @property
+    def checking(self) -> bool:
+        return (
+            self.language is not None
+            and self.recheck_seconds > 0
+            and self._since_check >= self.recheck_seconds
+        )
+
+    def decode_language(self) -> Optional[str]:
+        """Language to pass to the model for the next window; None detects."""
+        return None if self.checking else self.language
+
+    def observe(
+        self, language: Optional[str], probability: Optional[float], audio_seconds: float
+    ) -> bool:
+        """Record one decoded window; returns True when the locked language changed."""
+        if self.language is not None and not self.checking:
+            # The language was forced, so the reported one is just an echo.
+            self._since_check += audio_seconds
+            return False
+        if not language or probability is None:
+            return False
+        confident = probability >= self.min_probability
+
+        released = False
+        if self.language is not None:
+            self._since_check = 0.0
+            if not confident or language == self.language:
+                return False
+            self.language = None
+            self._candidate, self._count = None, 0
+            released = True
+
+        if not confident:
+            return released
+        if language == self._candidate:
+            self._count += 1
+        else:
+            self._candidate, self._count = language, 1
+        if self._count < self.windows:
+            return released
+        self.language = language
+        self._since_check = 0.0
+        return True
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+# Words starting this much before the committed end are still considered new,
+# since timestamps of the same word jitter slightly between decodes.
+_TIMESTAMP_TOLERANCE = 0.1
+_MAX_REPEATED_NGRAM = 5
+
+
+@dataclass(frozen=True)
+class Word:
+    start: float
+    end: float
+    text: str
+
+
+def _normalize(text: str) -> str:
+    return text.strip().lower().strip(".,!?;:\"'")
+
+
+def words_from_segments(
+    segments: Iterable[Any],
+    offset: float,
+    duration: float,
+) -> List[Word]:
+    """Flatten faster-whisper segments into absolute-time words.
+
+    Word timestamps are used when the model produced them; otherwise the
+    segment text is split on whitespace and spread evenly across the segment
+    (or the whole decoded audio when the segment has no timestamps either).
+    """
+    words: List[Word] = []
+    for segment in segments:
+        segment_words = getattr(segment, "words", None)
+        if segment_words:
+            for word in segment_words:
+                words.append(
+                    Word(offset + float(word.start), offset + float(word.end), word.word)
+                )
+            continue
+
+        tokens = str(getattr(segment, "text", "")).split()
+        if not tokens:
+            continue
+        start = float(getattr(segment, "start", 0.0) or 0.0)
+        end = float(getattr(segment, "end", duration) or duration)
+        step = max(end - start, 0.0) / len(tokens)
+        for index, token in enumerate(tokens):
+            words.append(
+                Word(
+                    offset + start + index * step,
+                    offset + start + (index + 1) * step,
+                    f" {token}",
+                )
+            )
+    return words
+
+
+def join_words(words: Iterable[Word]) -> str:
+    return "".join(word.text for word in words).strip()
+
+
+class HypothesisBuffer:
+    """LocalAgreement-2 commit policy over consecutive decoding hypotheses.
+
+    Each call to ``insert`` receives the words decoded from the current
+    (uncommitted) audio. The longest prefix on which it agrees with the
+    previous hypothesis is committed and returned; the remainder is kept as
+    the pending hypothesis for the next comparison.
+    """
+
+    def __init__(self) -> None:
+        self.committed_end = 0.0
+        self._committed: List[Word] = []
+        self._previous: List[Word] = []
+
+    @property
+    def pending(self) -> List[Word]:
+        return list(self._previous)
+
+    @property
+    def committed(self) -> List[Word]:
+        return list(self._committed)
+
+    def insert(self, words: Sequence[Word]) -> List[Word]:
+        candidates = [
+            word
+            for word in words
+            if word.start > self.committed_end - _TIMESTAMP_TOLERANCE
+        ]
+        candidates = self._drop_repeated_prefix(candidates)
+
+        agreed: List[Word] = []
+        for new, old in zip(candidates, self._previous):
+            if _normalize(new.text) != _normalize(old.text):
+                break
+            agreed.append(new)
+
+        self._previous = candidates[len(agreed) :]
+        self._commit(agreed)
+        return agreed
+
+    def flush(self) -> List[Word]:
+        """Commit whatever is pending, e.g. when the audio must be dropped."""
+        pending = self._previous
+        self._previous = []
+        self._commit(pending)
+        return pending
+
+    def prompt(self, max_chars: int = 200) -> Optional[str]:
+        text = join_words(self._committed)
+        return text[-max_chars:] if text else None
+
+    def _commit(self, words: List[Word]) -> None:
+        if not words:
+            return
+        self._committed.extend(words)
+        self.committed_end = words[-1].end
+        # Only the tail is needed for prompts and repeated n-gram detection.
+        del self._committed[: -4 * _MAX_REPEATED_NGRAM]
+
+    def _drop_repeated_prefix(self, words: List[Word]) -> List[Word]:
+        if not words or not self._committed:
+            return words
+        if abs(words[0].start - self.committed_end) >= 1.0:
+            return words
+        limit = min(len(words), len(self._committed), _MAX_REPEATED_NGRAM)
+        for size in range(limit, 0, -1):
+            tail = [_normalize(word.text) for word in self._committed[-size:]]
+            head = [_normalize(word.text) for word in words[:size]]
+            if tail == head:
+                return words[size:]
+        return words
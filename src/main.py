@@ -1,10 +1,10 @@
+from __future__ import annotations
+
 import argparse
 import sys
 import threading
+from typing import TYPE_CHECKING, Callable
 
-from PyQt5.QtWidgets import QApplication
-
-from audio_capture import list_audio_devices
 from config import (
     CONFIG_KEYS,
     Settings,
@@ -13,8 +13,12 @@ from config import (
     normalize_config_key,
     update_config_file,
 )
-from overlay import OverlayWindow
-from transcription import transcribe_audio, transcribe_both_audio
+
+# Qt, PyAudio and faster-whisper are imported only by the code paths that use
+# them, so `config` and `--list-devices` start without loading them.
+if TYPE_CHECKING:
+    from model_loader import ModelWarmup
+    from overlay import OverlayWindow
 
 
 def parse_args() -> argparse.Namespace:
@@ -133,27 +137,61 @@ def handle_config_command(args: argparse.Namespace) -> None:
         _print_config_values(snapshot or {})
 
 
-def start_transcription_thread(
+def list_audio_devices() -> None:
+    from audio_capture import list_audio_devices as print_audio_devices
+
+    print_audio_devices()
+
+
+def _run_transcription(
     overlay: OverlayWindow,
     settings: Settings,
     mic_only: bool,
     system_only: bool,
-) -> threading.Thread:
+) -> None:
+    # Imported on the worker thread so the window can show meanwhile.
+    from transcription import transcribe_audio, transcribe_both_audio
+
     if mic_only:
-        target = transcribe_audio
-        kwargs = {"overlay": overlay, "settings": settings, "use_system_audio": False}
+        transcribe_audio(overlay=overlay, settings=settings, use_system_audio=False)
     elif system_only:
-        target = transcribe_audio
-        kwargs = {"overlay": overlay, "settings": settings, "use_system_audio": True}
+        transcribe_audio(overlay=overlay, settings=settings, use_system_audio=True)
     else:
-        target = transcribe_both_audio
-        kwargs = {"overlay": overlay, "settings": settings}
+        transcribe_both_audio(overlay=overlay, settings=settings)
 
-    thread = threading.Thread(target=target, kwargs=kwargs, daemon=True)
+
+def start_transcription_thread(
+    overlay: OverlayWindow,
+    settings: Settings,
+    mic_only: bool,
+    system_only: bool,
+) -> threading.Thread:
+    thread = threading.Thread(
+        target=_run_transcription,
+        kwargs={
+            "overlay": overlay,
+            "settings": settings,
+            "mic_only": mic_only,
+            "system_only": system_only,
+        },
+        daemon=True,
+    )
     thread.start()
     return thread
 
 
+def _warmup_printer(warmup: ModelWarmup) -> Callable[[str], None]:
+    """Console listener for the warm-up; the overlay gets its own."""
+
+    def report(status: str) -> None:
+        if status.startswith("ready"):
+            print(f"Model {status}.")
+        elif status == "failed":
+            print(f"Model warm-up failed: {warmup.failed}")
+
+    return report
+
+
 def main() -> None:
     args = parse_args()
 
@@ -166,10 +204,27 @@ def main() -> None:
         return
 
     settings = load_settings(config_path=args.config_path)
+    # Load and warm up the model while the window and audio devices come up;
+    # faster-whisper itself is imported on the warm-up thread. The inference
+    # worker process warms up its own copy instead.
+    from model_loader import ModelWarmup, configure_registry
+
+    configure_registry(settings)
+    warmup = None
+    if not settings.inference_worker:
+        warmup = ModelWarmup(settings)
+        warmup.add_listener(_warmup_printer(warmup))
+        warmup.start()
+
+    from PyQt5.QtWidgets import QApplication
+
+    from overlay import OverlayWindow
 
     app = QApplication(sys.argv)
     overlay = OverlayWindow()
     overlay.set_status_info(settings.whisper_model_path, settings.whisper_language, settings.whisper_compute_type)
+    if warmup is not None:
+        warmup.add_listener(lambda status: overlay.update_status_field("Model", status))
 
     start_transcription_thread(
         overlay=overlay,
@@ -1,19 +1,449 @@
 from __future__ import annotations
 
-from functools import lru_cache
+import importlib.util
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Mapping, Optional, Sequence
 
-from faster_whisper import WhisperModel
+import numpy as np
 
 from config import Settings
 
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    """Everything that makes two loaded models interchangeable."""
+
+    model_path: str
+    compute_type: str
+    device: str = "auto"
+    cpu_threads: int = 0
+    num_workers: int = 1
+
+    @classmethod
+    def from_settings(cls, settings: Settings, model_path: Optional[str] = None) -> "ModelKey":
+        return cls(
+            model_path=model_path or settings.whisper_model_path,
+            compute_type=settings.whisper_compute_type,
+            device=settings.whisper_device,
+            cpu_threads=settings.whisper_cpu_threads,
+            num_workers=settings.whisper_num_workers,
+        )
+
+
+# Approximate parameter counts of the standard checkpoints, for sizing models
+# that are referenced by name and downloaded on first use.
+_MODEL_PARAMETERS = {
+    "tiny": 39_000_000,
+    "base": 74_000_000,
+    "small": 244_000_000,
+    "medium": 769_000_000,
+    "large": 1_550_000_000,
+    "distil-large": 756_000_000,
+    "turbo": 809_000_000,
+    "large-v3-turbo": 809_000_000,
+}
+_BYTES_PER_PARAMETER = {"int8": 1, "int16": 2, "float16": 2, "bfloat16": 2, "float32": 4}
+
+
+def estimate_model_bytes(key: ModelKey) -> int:
+    """Rough resident size of a model, used to keep the registry within budget.
+
+    A local CTranslate2 directory is sized by its weights file, wherever in
+    the directory it sits (a Hugging Face cache keeps it under a snapshot);
+    named checkpoints by parameter count times the width of the compute type.
+    """
+    path = Path(key.model_path)
+    if path.is_dir():
+        weights = [entry.stat().st_size for entry in path.rglob("model.bin") if entry.is_file()]
+        if weights:
+            return max(weights)
+
+    name = Path(key.model_path).name.lower()
+    matches = [known for known in _MODEL_PARAMETERS if known in name]
+    # The longest match wins, so "large-v3-turbo" is not sized as "large".
+    parameters = _MODEL_PARAMETERS[max(matches, key=len) if matches else "large"]
+    # Mixed types such as "int8_float16" keep most weights in the first type.
+    width = next(
+        (
+            size
+            for prefix, size in _BYTES_PER_PARAMETER.items()
+            if key.compute_type.startswith(prefix)
+        ),
+        4,
+    )
+    return parameters * width
+
+
+def _load_whisper_model(key: ModelKey) -> WhisperModel:
+    # Importing faster-whisper pulls in CTranslate2; defer it to the first load.
+    from faster_whisper import WhisperModel
 
-@lru_cache(maxsize=1)
-def _load_model(model_path: str, compute_type: str) -> WhisperModel:
     print(
-        f"Loading faster-whisper model '{model_path}' (compute_type={compute_type})"
+        f"Loading faster-whisper model '{key.model_path}' "
+        f"(device={key.device}, compute_type={key.compute_type}, "
+        f"cpu_threads={key.cpu_threads or 'auto'}, num_workers={key.num_workers})"
+    )
+    return WhisperModel(
+        key.model_path,
+        device=key.device,
+        compute_type=key.compute_type,
+        cpu_threads=key.cpu_threads,
+        num_workers=key.num_workers,
     )
-    return WhisperModel(model_path, device="auto", compute_type=compute_type)
 
 
-def get_model(settings: Settings) -> WhisperModel:
-    return _load_model(settings.whisper_model_path, settings.whisper_compute_type)
+class ModelRegistry:
+    """Keeps loaded models resident, keyed by their full inference config.
+
+    Up to ``max_models`` models stay loaded as long as their estimated sizes
+    fit in ``memory_budget_bytes`` (0 means no budget); loading another one
+    evicts the least recently used first. A model is only freed once the
+    transcribers still holding it drop it as well; until then it is handed
+    out again instead of being loaded twice. Concurrent requests for
+    a model that is being loaded wait for that load instead of starting a
+    second one, while requests for other models are not held up.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[ModelKey], WhisperModel] = _load_whisper_model,
+        max_models: int = 2,
+        memory_budget_bytes: int = 0,
+    ) -> None:
+        self._load = load
+        self.max_models = max_models
+        self.memory_budget_bytes = memory_budget_bytes
+        self._models: "OrderedDict[ModelKey, tuple[WhisperModel, int]]" = OrderedDict()
+        self._loading: dict[ModelKey, threading.Event] = {}
+        self._retired: "weakref.WeakValueDictionary[ModelKey, WhisperModel]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def __contains__(self, key: ModelKey) -> bool:
+        with self._lock:
+            return key in self._models
+
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(size for _, size in self._models.values())
+
+    def get(self, key: ModelKey) -> WhisperModel:
+        while True:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    return entry[0]
+                retired = self._retired.pop(key, None)
+                if retired is not None:
+                    self._admit(key, retired)
+                    return retired
+                pending = self._loading.get(key)
+                if pending is None:
+                    self._loading[key] = threading.Event()
+                    break
+            pending.wait()
+
+        try:
+            model = self._load(key)
+            with self._lock:
+                self._admit(key, model)
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def evict(self, key: ModelKey) -> bool:
+        with self._lock:
+            entry = self._models.pop(key, None)
+            if entry is None:
+                return False
+            self._retire(key, entry[0])
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+    def _admit(self, key: ModelKey, model: WhisperModel) -> None:
+        size = estimate_model_bytes(key)
+        self._make_room(size)
+        self._models[key] = (model, size)
+
+    def _retire(self, key: ModelKey, model: WhisperModel) -> None:
+        try:
+            self._retired[key] = model
+        except TypeError:
+            pass
+
+    def _make_room(self, size: int) -> None:
+        budget = self.memory_budget_bytes
+        while self._models and (
+            len(self._models) >= max(1, self.max_models)
+            or (budget and sum(s for _, s in self._models.values()) + size > budget)
+        ):
+            evicted, (model, _) = self._models.popitem(last=False)
+            self._retire(evicted, model)
+            self.evictions += 1
+            print(f"Unloading model '{evicted.model_path}' to make room.")
+
+
+_registry = ModelRegistry()
+
+
+def configure_registry(settings: Settings) -> None:
+    """Apply the session's cache limits; called once per process at startup."""
+    _registry.max_models = settings.model_cache_size
+    _registry.memory_budget_bytes = settings.model_memory_budget_mb * 1024 * 1024
+
+
+def get_model(settings: Settings, model_path: Optional[str] = None) -> WhisperModel:
+    return _registry.get(ModelKey.from_settings(settings, model_path))
+
+
+def release_model(settings: Settings, model_path: Optional[str] = None) -> bool:
+    """Drop the registry's reference so the model is freed once callers drop theirs."""
+    return _registry.evict(ModelKey.from_settings(settings, model_path))
+
+
+def process_memory_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read."""
+    if importlib.util.find_spec("psutil") is not None:
+        import psutil
+
+        return int(psutil.Process().memory_info().rss)
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as fh:
+            resident_pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class ModelWarmup:
+    """Loads the session's model and runs one decode on silence in the background.
+
+    The first CTranslate2 decode is much slower than the ones after it, so
+    paying for it during startup keeps it off the first caption. Progress is
+    passed to listeners as short status strings, and nothing is printed
+    from the warm-up thread; a listener added late is immediately told the
+    current status. The warmed-up model is left to the
+    registry rather than held here, so idle unloading can still free it.
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        load: Optional[Callable[[Settings], WhisperModel]] = None,
+    ) -> None:
+        self._settings = settings
+        self._load = load or get_model
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str], None]] = []
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+        self._done = threading.Event()
+        self._started = 0.0
+        self.status = "waiting"
+        self.ready = False
+        self.failed: Optional[BaseException] = None
+        self.time_to_ready: Optional[float] = None
+
+    def start(self) -> "ModelWarmup":
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+            status = self.status
+        listener(status)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes; True if the model is ready."""
+        self._done.wait(timeout)
+        return self.ready
+
+    def _report(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(status)
+
+    def _run(self) -> None:
+        settings = self._settings
+        try:
+            self._report("loading")
+            model = self._load(settings)
+            self._report("warming up")
+            silence = np.zeros(settings.sample_rate, dtype=np.float32)
+            segments, _ = model.transcribe(
+                silence,
+                beam_size=settings.whisper_beam_size,
+                temperature=0.0,
+                vad_filter=False,
+                language=settings.whisper_language,
+            )
+            for _ in segments:
+                pass
+        except Exception as exc:
+            self.failed = exc
+            self._report("failed")
+        else:
+            self.ready = True
+            self.time_to_ready = time.perf_counter() - self._started
+            self._report(f"ready in {self.time_to_ready:.1f}s")
+        finally:
+            self._done.set()
+
+
+class ModelLadder:
+    """Picks a cheaper or larger model from sustained real-time factors.
+
+    ``paths`` is ordered from the most to the least expensive model. Falling
+    behind (RTF above ``target_rtf``) for ``patience`` decodes in a row steps
+    down; running at under a third of the target for three times as long
+    steps back up, so a slower model is only tried with clear headroom.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        current: str,
+        target_rtf: float,
+        patience: int = 3,
+    ) -> None:
+        self.paths = list(paths)
+        if current not in self.paths:
+            self.paths.insert(0, current)
+        self.index = self.paths.index(current)
+        self.target_rtf = target_rtf
+        self.patience = patience
+        self.pending: Optional[str] = None
+        self._slow = 0
+        self._fast = 0
+
+    @property
+    def current(self) -> str:
+        return self.paths[self.index]
+
+    def observe(self, rtf: float) -> Optional[str]:
+        if self.pending is not None:
+            return None
+        self._slow = self._slow + 1 if rtf > self.target_rtf else 0
+        self._fast = self._fast + 1 if rtf < self.target_rtf / 3 else 0
+
+        if self._slow >= self.patience and self.index + 1 < len(self.paths):
+            self.pending = self.paths[self.index + 1]
+        elif self._fast >= 3 * self.patience and self.index > 0:
+            self.pending = self.paths[self.index - 1]
+        return self.pending
+
+    def commit(self, path: str) -> None:
+        self.index = self.paths.index(path)
+        self.cancel()
+
+    def cancel(self) -> None:
+        self.pending = None
+        self._slow = 0
+        self._fast = 0
+
+
+class LanguageRouter:
+    """Picks a specialised model for the session's detected language.
+
+    ``routes`` maps language codes to model paths, e.g. ``{"en": "base.en"}``.
+    Languages without a route, and sessions whose language is not known,
+    use the multilingual ``default_path``. ``select`` returns the path to
+    load when the language calls for a different model than ``current``;
+    the caller loads it in the background and then ``commit``s it.
+    """
+
+    def __init__(self, routes: Mapping[str, str], default_path: str) -> None:
+        self.routes = dict(routes)
+        self.default_path = default_path
+        self.current = default_path
+        self.pending: Optional[str] = None
+
+    @property
+    def specialised(self) -> bool:
+        return self.current != self.default_path
+
+    def route(self, language: Optional[str]) -> str:
+        if language is None:
+            return self.default_path
+        return self.routes.get(language, self.default_path)
+
+    def select(self, language: Optional[str]) -> Optional[str]:
+        target = self.route(language)
+        if target == self.current:
+            self.pending = None
+            return None
+        if target == self.pending:
+            return None
+        self.pending = target
+        return target
+
+    def commit(self, path: str) -> bool:
+        """Adopt a loaded model; False if the language moved on meanwhile."""
+        if path != self.pending:
+            return False
+        self.current = path
+        self.pending = None
+        return True
+
+
+class BackgroundModelLoader:
+    """Loads a model on a worker thread so decoding continues meanwhile."""
+
+    def __init__(self, load: Callable[[str], WhisperModel]) -> None:
+        self._load = load
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._ready: Optional[tuple[str, WhisperModel]] = None
+        self.failed: Optional[str] = None
+
+    @property
+    def loading(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def request(self, model_path: str) -> None:
+        if self.loading:
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(model_path,), name="model-loader", daemon=True
+        )
+        self._thread.start()
+
+    def take_ready(self) -> Optional[tuple[str, WhisperModel]]:
+        with self._lock:
+            ready, self._ready = self._ready, None
+            return ready
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self, model_path: str) -> None:
+        try:
+            model = self._load(model_path)
+        except Exception as exc:
+            print(f"Failed to load model '{model_path}': {exc}")
+            with self._lock:
+                self.failed = model_path
+            return
+        with self._lock:
+            self._ready = (model_path, model)
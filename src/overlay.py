@@ -13,8 +13,18 @@ from PyQt5.QtWidgets import (
 )
 
 
+_CAPTION_STYLE = "font-size: 20px; color: white;"
+_PARTIAL_CAPTION_STYLE = "font-size: 20px; color: rgba(255, 255, 255, 0.6); font-style: italic;"
+# Each source gets one line in the overlay, so only the tail of its caption is kept.
+_SOURCE_LINE_CHARS = 60
+
+
 class OverlayWindow(QWidget):
     text_requested = pyqtSignal(str)
+    partial_requested = pyqtSignal(str)
+    source_text_requested = pyqtSignal(str, str, bool)
+    status_field_requested = pyqtSignal(str, str)
+    status_info_requested = pyqtSignal(str, str, str)
 
     def __init__(self, width: int = 800, height: int = 90) -> None:
         super().__init__()
@@ -37,7 +47,7 @@ class OverlayWindow(QWidget):
 
         self.label = QLabel(self)
         self.label.setCursor(Qt.CursorShape.SizeAllCursor)
-        self.label.setStyleSheet("font-size: 20px; color: white;")
+        self.label.setStyleSheet(_CAPTION_STYLE)
         self.label.setAlignment(Qt.AlignCenter)  # type: ignore
         self.label.setWordWrap(True)
         self.label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
@@ -82,19 +92,38 @@ class OverlayWindow(QWidget):
 
         self._drag_pos: Optional[QPoint] = None
         self._info_visible = False
+        self._status_base = ""
+        self._status_fields: dict[str, str] = {}
+        self._source_lines: dict[str, tuple[str, bool]] = {}
         self._set_toggle_arrow()
         self.text_requested.connect(self._apply_text)
+        self.partial_requested.connect(self._apply_partial)
+        self.source_text_requested.connect(self._apply_source_text)
+        self.status_field_requested.connect(self._apply_status_field)
+        self.status_info_requested.connect(self._apply_status_info)
         self.show()
 
     def display_text(self, text: str) -> None:
         if text.strip():
             self.text_requested.emit(text)
 
+    def display_partial(self, text: str) -> None:
+        """Show a provisional caption until the next ``display_text`` replaces it."""
+        if text.strip():
+            self.partial_requested.emit(text)
+
+    def display_source_text(self, source: str, text: str, partial: bool = False) -> None:
+        """Show captions per audio source, one labelled line each."""
+        if text.strip():
+            self.source_text_requested.emit(source, text, partial)
+
     def set_status_info(self, model: str, language: Optional[str], compute_type: str) -> None:
-        language_display = language if language else "Auto"
-        self.info_label.setText(
-            f"Model: {model}    Language: {language_display}    Compute: {compute_type}"
-        )
+        """Set the header of the status panel; safe to call from any thread."""
+        self.status_info_requested.emit(model, language or "", compute_type)
+
+    def update_status_field(self, name: str, value: str) -> None:
+        """Show a runtime value in the status panel; safe to call from any thread."""
+        self.status_field_requested.emit(name, value)
 
     def _set_toggle_arrow(self) -> None:
         self.toggle_button.setText("\u25B4" if self._info_visible else "\u25BE")
@@ -105,8 +134,44 @@ class OverlayWindow(QWidget):
         self._set_toggle_arrow()
 
     def _apply_text(self, text: str) -> None:
+        self.label.setStyleSheet(_CAPTION_STYLE)
+        self.label.setText(text)
+
+    def _apply_partial(self, text: str) -> None:
+        self.label.setStyleSheet(_PARTIAL_CAPTION_STYLE)
         self.label.setText(text)
 
+    def _apply_source_text(self, source: str, text: str, partial: bool) -> None:
+        text = text.strip()
+        if len(text) > _SOURCE_LINE_CHARS:
+            text = text[-_SOURCE_LINE_CHARS:].split(" ", 1)[-1]
+        self._source_lines[source] = (text, partial)
+        lines = [
+            f"{name}: {line}" + (" \u2026" if is_partial else "")
+            for name, (line, is_partial) in self._source_lines.items()
+        ]
+        self.label.setStyleSheet(_CAPTION_STYLE)
+        self.label.setText("\n".join(lines))
+
+    def _apply_status_info(self, model: str, language: str, compute_type: str) -> None:
+        language_display = language if language else "Auto"
+        self._status_base = (
+            f"Model: {model}    Language: {language_display}    Compute: {compute_type}"
+        )
+        self._render_status()
+
+    def _apply_status_field(self, name: str, value: str) -> None:
+        if value:
+            self._status_fields[name] = value
+        else:
+            self._status_fields.pop(name, None)
+        self._render_status()
+
+    def _render_status(self) -> None:
+        parts = [self._status_base] if self._status_base else []
+        parts.extend(f"{name}: {value}" for name, value in self._status_fields.items())
+        self.info_label.setText("    ".join(parts))
+
     def mousePressEvent(self, event) -> None:  # type: ignore[override]
         if event.button() == Qt.MouseButton.LeftButton:
             self._drag_pos = event.globalPos() - self.frameGeometry().topLeft()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from typing import Optional
+
+
+class RealTimeFactor:
+    """Smoothed ratio of decode time to the duration of the decoded audio."""
+
+    def __init__(self, smoothing: float = 0.3) -> None:
+        self._smoothing = smoothing
+        self.value: Optional[float] = None
+
+    def update(self, decode_seconds: float, audio_seconds: float) -> float:
+        sample = decode_seconds / audio_seconds if audio_seconds > 0 else 0.0
+        if self.value is None:
+            self.value = sample
+        else:
+            self.value += self._smoothing * (sample - self.value)
+        return self.value
+
+
+class AdaptiveWindow:
+    """Grows or shrinks the streaming window to keep the RTF under a target.
+
+    Falling behind grows the window (fewer, better amortised decodes) and
+    halves the overlap, which is decoded twice. With plenty of headroom the
+    window shrinks again for lower latency and the overlap is restored to
+    its configured share of the window.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float,
+        overlap_seconds: float,
+        minimum: float,
+        maximum: float,
+        target_rtf: float,
+    ) -> None:
+        self.minimum = min(minimum, maximum)
+        self.maximum = max(minimum, maximum)
+        self.target_rtf = target_rtf
+        self.window_seconds = min(max(window_seconds, self.minimum), self.maximum)
+        self._overlap_ratio = overlap_seconds / window_seconds if window_seconds else 0.0
+        self.overlap_seconds = min(overlap_seconds, self.window_seconds * self._overlap_ratio)
+
+    def update(self, rtf: float) -> bool:
+        window, overlap = self.window_seconds, self.overlap_seconds
+        if rtf > self.target_rtf:
+            window = min(self.maximum, window * 1.25)
+            overlap = overlap * 0.5
+        elif rtf < 0.5 * self.target_rtf:
+            window = max(self.minimum, window * 0.9)
+            overlap = min(window * self._overlap_ratio, max(overlap * 1.25, 0.05 * window))
+        else:
+            return False
+
+        changed = abs(window - self.window_seconds) > 1e-6 or abs(
+            overlap - self.overlap_seconds
+        ) > 1e-6
+        self.window_seconds, self.overlap_seconds = window, overlap
+        return changed
+
+
+class CatchUp:
+    """Decides when the transcriber has fallen far enough behind to catch up.
+
+    The backlog is how long a chunk waited between capture and reaching the
+    transcriber. Catch-up starts once it exceeds ``enter_seconds`` and ends
+    only when it is back at ``target_seconds``, so the mode does not flap
+    around a single threshold.
+    """
+
+    def __init__(self, policy: str, enter_seconds: float, target_seconds: float) -> None:
+        self.policy = policy
+        self.enter_seconds = enter_seconds
+        self.target_seconds = min(target_seconds, enter_seconds)
+        self.active = False
+        self.episodes = 0
+        self.backlog_seconds = 0.0
+
+    def update(self, backlog_seconds: float) -> Optional[bool]:
+        """Record a backlog sample; returns the new state when it changes."""
+        self.backlog_seconds = backlog_seconds
+        if not self.active and backlog_seconds > self.enter_seconds:
+            self.active = True
+            self.episodes += 1
+            return True
+        if self.active and backlog_seconds <= self.target_seconds:
+            self.active = False
+            return False
+        return None
+
+
+class DecodeCost:
+    """Online fit of decode time against the number of generated tokens.
+
+    Whisper encodes a padded 30 s chunk for every window, so a decode costs
+    a roughly fixed encoder pass plus a per-token cost for the text. The
+    fit uses exponentially weighted moments so it follows load changes;
+    until the token counts vary enough to separate the two terms, the whole
+    cost is charged per token, which errs towards fewer tokens.
+    """
+
+    def __init__(self, smoothing: float = 0.1) -> None:
+        self._smoothing = smoothing
+        self.samples = 0
+        self._tokens = 0.0
+        self._seconds = 0.0
+        self._tokens_sq = 0.0
+        self._product = 0.0
+
+    def update(self, tokens: int, seconds: float) -> None:
+        if tokens <= 0:
+            return
+        self.samples += 1
+        weight = 1.0 if self.samples == 1 else self._smoothing
+        self._tokens += weight * (tokens - self._tokens)
+        self._seconds += weight * (seconds - self._seconds)
+        self._tokens_sq += weight * (tokens * tokens - self._tokens_sq)
+        self._product += weight * (tokens * seconds - self._product)
+
+    def estimate(self) -> Optional[tuple[float, float]]:
+        """(fixed seconds, seconds per token), or None before any decode."""
+        if not self.samples:
+            return None
+        variance = self._tokens_sq - self._tokens**2
+        if self.samples >= 3 and variance >= 1.0:
+            per_token = (self._product - self._tokens * self._seconds) / variance
+            if per_token > 0:
+                return max(0.0, self._seconds - per_token * self._tokens), per_token
+        return 0.0, self._seconds / self._tokens
+
+    def tokens_within(self, seconds: float) -> Optional[int]:
+        estimate = self.estimate()
+        if estimate is None:
+            return None
+        fixed, per_token = estimate
+        return max(0, int((seconds - fixed) / per_token))
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from audio_buffer import float32_to_pcm16
+
+
+_PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+
+def downmix_pcm16(chunk: bytes, channels: int) -> np.ndarray:
+    """Average interleaved int16 channels into float32 mono in [-1, 1)."""
+    samples = np.frombuffer(chunk, dtype=np.int16)
+    if channels > 1:
+        samples = samples[: samples.size - samples.size % channels].reshape(-1, channels)
+        mono = samples.mean(axis=1, dtype=np.float32)
+    else:
+        mono = samples.astype(np.float32)
+    mono *= _PCM16_SCALE
+    return mono
+
+
+class PolyphaseResampler:
+    """Streaming rational resampler with a windowed-sinc polyphase filter.
+
+    The rate ratio is reduced to ``up / down`` and each output sample is a
+    dot product of ``taps_per_phase`` input samples with one phase of the
+    anti-aliasing filter, computed for the whole chunk at once. The last
+    input samples and the fractional read position carry over between
+    calls, so chunk boundaries leave no clicks or gaps.
+    """
+
+    def __init__(self, input_rate: int, output_rate: int, taps_per_phase: int = 24) -> None:
+        divisor = math.gcd(input_rate, output_rate)
+        self.up = output_rate // divisor
+        self.down = input_rate // divisor
+        self._taps = taps_per_phase
+
+        length = taps_per_phase * self.up
+        cutoff = 0.5 / max(self.up, self.down) * 0.92
+        n = np.arange(length) - (length - 1) / 2.0
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, 8.0)
+        prototype *= self.up / prototype.sum()
+        # bank[phase, m] multiplies the input ``m`` samples before the newest
+        # one; stored oldest-first so it lines up with the sliding windows.
+        self._bank = prototype.reshape(taps_per_phase, self.up).T[:, ::-1].astype(np.float32)
+
+        self._history = np.zeros(taps_per_phase - 1, dtype=np.float32)
+        self._position = (taps_per_phase - 1) * self.up
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if self.up == self.down:
+            return samples
+        data = np.concatenate((self._history, samples))
+        last = data.size * self.up - 1
+        count = max(0, (last - self._position) // self.down + 1)
+
+        positions = self._position + self.down * np.arange(count)
+        newest = positions // self.up
+        windows = sliding_window_view(data, self._taps)[newest - (self._taps - 1)]
+        output = np.einsum("ij,ij->i", windows, self._bank[positions % self.up])
+
+        keep = self._taps - 1
+        self._position += self.down * count - (data.size - keep) * self.up
+        self._history = data[data.size - keep :].copy()
+        return output.astype(np.float32, copy=False)
+
+
+class CaptureConverter:
+    """Turns native-format int16 capture chunks into mono PCM at the target rate."""
+
+    def __init__(self, input_rate: int, channels: int, output_rate: int) -> None:
+        self.input_rate = input_rate
+        self.channels = max(1, channels)
+        self.output_rate = output_rate
+        self._resampler = PolyphaseResampler(input_rate, output_rate)
+
+    @property
+    def passthrough(self) -> bool:
+        return self.channels == 1 and self.input_rate == self.output_rate
+
+    def convert(self, chunk: bytes) -> bytes:
+        if self.passthrough:
+            return chunk
+        mono = downmix_pcm16(chunk, self.channels)
+        return float32_to_pcm16(self._resampler.process(mono))
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from audio_buffer import SampleBuffer, float32_to_pcm16, pcm16_to_float32
+
+
+# Drift is only estimated once this much audio has arrived; before that the
+# ratio of two nearly identical rates is dominated by arrival jitter.
+_DRIFT_WARMUP_SECONDS = 5.0
+# Real devices drift by tens of ppm; anything beyond 1% is a measurement glitch.
+_MAX_RATIO_CORRECTION = 0.01
+
+
+class DeviceClock:
+    """Estimates a capture device's effective sample rate from arrival times."""
+
+    def __init__(self, nominal_rate: int) -> None:
+        self.nominal_rate = nominal_rate
+        self.samples = 0
+        self.jitter_seconds = 0.0
+        self._first_arrival: Optional[float] = None
+        self._first_samples = 0
+        self._last_arrival: Optional[float] = None
+        self._last_count = 0
+
+    def record(self, count: int, timestamp: float) -> None:
+        if self._first_arrival is None:
+            self._first_arrival = timestamp
+            self._first_samples = count
+        elif self._last_arrival is not None:
+            expected = self._last_count / self.nominal_rate
+            deviation = abs((timestamp - self._last_arrival) - expected)
+            self.jitter_seconds += 0.1 * (deviation - self.jitter_seconds)
+        self._last_arrival = timestamp
+        self._last_count = count
+        self.samples += count
+
+    def record_dropped(self, count: int) -> None:
+        """Count samples that were captured but discarded before arriving here."""
+        # Before the first arrival they would only inflate the first chunk.
+        if self._first_arrival is not None:
+            self.samples += count
+
+    @property
+    def measured_seconds(self) -> float:
+        if self._first_arrival is None or self._last_arrival is None:
+            return 0.0
+        return self._last_arrival - self._first_arrival
+
+    @property
+    def rate(self) -> Optional[float]:
+        # Samples of the first chunk were captured before the first timestamp.
+        elapsed = self.measured_seconds
+        if elapsed < _DRIFT_WARMUP_SECONDS:
+            return None
+        return (self.samples - self._first_samples) / elapsed
+
+
+@dataclass
+class AlignmentStats:
+    drift_ppm: float = 0.0
+    latency_seconds: float = 0.0
+    mic_jitter_seconds: float = 0.0
+    system_jitter_seconds: float = 0.0
+    underruns: int = 0
+    overflows: int = 0
+
+    def summary(self) -> str:
+        return (
+            f"drift {self.drift_ppm:+.0f} ppm, system latency "
+            f"{1000 * self.latency_seconds:.0f} ms, jitter "
+            f"{1000 * self.mic_jitter_seconds:.0f}/{1000 * self.system_jitter_seconds:.0f} ms, "
+            f"{self.underruns} underruns, {self.overflows} overflows"
+        )
+
+
+class StreamAligner:
+    """Mixes system audio into the microphone stream on the mic's clock.
+
+    Microphone chunks drive the output. System audio waits in a jitter
+    buffer and is resampled by the measured ratio of the two device clocks,
+    plus a small correction that holds the buffer at its primed fill level,
+    so the offset between the two devices stays constant over long sessions
+    instead of growing with clock drift. When the system device falls
+    behind or stops, silence is mixed in for the missing samples rather
+    than another source's audio.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        prefill_seconds: float = 0.25,
+        max_latency_seconds: float = 1.0,
+        correction_seconds: float = 10.0,
+    ) -> None:
+        self._sample_rate = sample_rate
+        self._prefill = max(1, int(prefill_seconds * sample_rate))
+        self._max_latency = max(3 * self._prefill, int(max_latency_seconds * sample_rate))
+        self._correction_samples = max(1.0, correction_seconds * sample_rate)
+        self.mic_clock = DeviceClock(sample_rate)
+        self.system_clock = DeviceClock(sample_rate)
+        self._system = SampleBuffer(self._max_latency)
+        self._position = 0.0
+        self._target_fill: Optional[float] = None
+        self.system_ended = False
+        self.stats = AlignmentStats()
+
+    def push_system(self, chunk: bytes, timestamp: Optional[float] = None) -> None:
+        count = self._system.append_pcm16(chunk)
+        if not count:
+            return
+        self.system_clock.record(count, time.monotonic() if timestamp is None else timestamp)
+        self._limit_system()
+
+    def skip_system(self, count: int) -> None:
+        """Stand in silence for ``count`` system samples lost before arrival."""
+        if count <= 0:
+            return
+        self.system_clock.record_dropped(count)
+        self._system.append(np.zeros(count, dtype=np.float32))
+        self._limit_system()
+
+    def skip_mic(self, count: int) -> None:
+        """Account for ``count`` microphone samples lost before arrival.
+
+        The system audio captured alongside them is skipped as well, so the
+        two streams stay in step.
+        """
+        if count <= 0:
+            return
+        self.mic_clock.record_dropped(count)
+        if self._target_fill is not None:
+            self._position = min(self._position + self._ratio() * count, float(self._system.size))
+            self._drop_system(int(self._position))
+
+    def end_system(self) -> None:
+        self.system_ended = True
+
+    def mix(self, mic_chunk: bytes, timestamp: Optional[float] = None) -> bytes:
+        mic = pcm16_to_float32(mic_chunk)
+        count = mic.size
+        if not count:
+            return mic_chunk
+        self.mic_clock.record(count, time.monotonic() if timestamp is None else timestamp)
+        if self.system_ended and not self._system.size:
+            return mic_chunk
+
+        if self._target_fill is None and not self._primed(count):
+            system = np.zeros(count, dtype=np.float32)
+        else:
+            system = self._take_system(count, self._ratio())
+        mixed = (mic + system) * 0.5
+        self._update_stats()
+        return float32_to_pcm16(mixed)
+
+    def _primed(self, count: int) -> bool:
+        # Hold system audio back until the buffer can absorb arrival jitter.
+        if self._system.size < count + self._prefill and not self.system_ended:
+            return False
+        self._target_fill = float(self._system.size)
+        return True
+
+    def _ratio(self) -> float:
+        assert self._target_fill is not None
+        fill = self._system.size - self._position
+        ratio = 1.0
+        mic_rate, system_rate = self.mic_clock.rate, self.system_clock.rate
+        if mic_rate and system_rate:
+            ratio = system_rate / mic_rate
+        # Pull the buffer back towards its initial fill over correction_seconds.
+        ratio += (fill - self._target_fill) / self._correction_samples
+        return min(max(ratio, 1.0 - _MAX_RATIO_CORRECTION), 1.0 + _MAX_RATIO_CORRECTION)
+
+    def _take_system(self, count: int, ratio: float) -> np.ndarray:
+        buffered = self._system.view()
+        positions = self._position + ratio * np.arange(count)
+        available = np.count_nonzero(positions <= buffered.size - 1)
+        output = np.zeros(count, dtype=np.float32)
+
+        if available:
+            output[:available] = np.interp(
+                positions[:available], np.arange(buffered.size), buffered
+            )
+        if available < count:
+            if not self.system_ended:
+                self.stats.underruns += 1
+            # Everything buffered was used; prime the buffer again.
+            self._system.clear()
+            self._position = 0.0
+            self._target_fill = None
+            return output
+
+        self._position += ratio * count
+        consumed = int(self._position)
+        self._drop_system(consumed)
+        return output
+
+    def _limit_system(self) -> None:
+        if self._system.size > self._max_latency:
+            self._drop_system(self._system.size - self._max_latency)
+            self.stats.overflows += 1
+
+    def _drop_system(self, count: int) -> None:
+        count = min(count, self._system.size)
+        self._system.keep_tail(self._system.size - count)
+        self._position = max(0.0, self._position - count)
+
+    def _update_stats(self) -> None:
+        mic_rate, system_rate = self.mic_clock.rate, self.system_clock.rate
+        if mic_rate and system_rate:
+            self.stats.drift_ppm = 1e6 * (system_rate / mic_rate - 1.0)
+        self.stats.latency_seconds = (self._system.size - self._position) / self._sample_rate
+        self.stats.mic_jitter_seconds = self.mic_clock.jitter_seconds
+        self.stats.system_jitter_seconds = self.system_clock.jitter_seconds
@@ -1,16 +1,130 @@
 from __future__ import annotations
 
+import gc
+import threading
+import time
 from contextlib import ExitStack
-from typing import Callable, Optional
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
 
 import numpy as np
 import pyaudio
 from faster_whisper import WhisperModel
 
+from audio_buffer import SampleBuffer, pcm16_to_float32
+from batch_inference import BatchedDecoder, BatchReport
 from config import Settings
-from model_loader import get_model
+from inference_worker import InferenceWorker
+from language_lock import LanguageLock
+from local_agreement import HypothesisBuffer, Word, join_words, words_from_segments
+from model_loader import (
+    BackgroundModelLoader,
+    LanguageRouter,
+    ModelLadder,
+    get_model,
+    process_memory_bytes,
+    release_model,
+)
 from overlay import OverlayWindow
-from audio_capture import managed_input_stream, find_loopback_devices, mix_audio
+from realtime import AdaptiveWindow, CatchUp, DecodeCost, RealTimeFactor
+from stream_alignment import StreamAligner
+from voice_activity import EnergyGate, StreamingVad, create_streaming_vad, onnxruntime_available
+from audio_capture import (
+    FrameQueue,
+    captured_frames,
+    managed_input_stream,
+    find_loopback_devices,
+)
+
+
+# Uncommitted audio kept for context before trimming at word level, and the
+# longest input Whisper accepts before pending words are force-committed.
+_AGREEMENT_TRIM_SECONDS = 15.0
+_AGREEMENT_MAX_SECONDS = 30.0
+_CAPTION_CHARS = 200
+# Partial captions below this much audio are mostly hallucinated noise.
+_PARTIAL_MIN_SECONDS = 0.5
+# faster-whisper's own cut-off for treating a segment as silence.
+_NO_SPEECH_PROB = 0.6
+# faster-whisper rejects max_new_tokens that would take the prompt plus the
+# generated text past 448 tokens, and prompts can use up to 224; budgets that
+# allow more tokens than this are left uncapped.
+_MAX_CAPPED_TOKENS = 200
+_MIN_CAPPED_TOKENS = 8
+# Language routing needs a locked language; this many windows unless configured.
+_ROUTING_LOCK_WINDOWS = 3
+
+
+@dataclass
+class TranscriberStats:
+    windows: int = 0
+    model_calls: int = 0
+    skipped_silent: int = 0
+    audio_seconds: float = 0.0
+    decode_seconds: float = 0.0
+    partial_calls: int = 0
+    partial_seconds: float = 0.0
+    latency_samples: int = 0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+    deadline_cuts: int = 0
+    overrun_seconds: float = 0.0
+    catchups: int = 0
+    skipped_backlog_seconds: float = 0.0
+    greedy_first: int = 0
+    beam_redecodes: int = 0
+
+    @property
+    def real_time_factor(self) -> float:
+        return self.decode_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    @property
+    def beam_fraction(self) -> float:
+        """Share of greedy-first decodes that had to be redone with the full beam."""
+        return self.beam_redecodes / self.greedy_first if self.greedy_first else 0.0
+
+    @property
+    def mean_latency_seconds(self) -> float:
+        return self.latency_seconds / self.latency_samples if self.latency_samples else 0.0
+
+    def record_latency(self, seconds: float) -> None:
+        self.latency_samples += 1
+        self.latency_seconds += seconds
+        self.max_latency_seconds = max(self.max_latency_seconds, seconds)
+
+    def summary(self) -> str:
+        summary = (
+            f"{self.windows} windows, {self.model_calls} model calls, "
+            f"{self.skipped_silent} skipped as silence, "
+            f"RTF {self.real_time_factor:.2f}"
+        )
+        if self.latency_samples:
+            summary += (
+                f", latency {1000 * self.mean_latency_seconds:.0f} ms mean / "
+                f"{1000 * self.max_latency_seconds:.0f} ms max"
+            )
+        if self.deadline_cuts or self.overrun_seconds:
+            summary += (
+                f", {self.deadline_cuts} decodes capped by the deadline "
+                f"({self.overrun_seconds:.1f}s over budget)"
+            )
+        if self.greedy_first:
+            summary += f", {self.beam_fraction:.0%} of decodes redone with the full beam"
+        if self.catchups:
+            summary += f", {self.catchups} catch-ups"
+            if self.skipped_backlog_seconds:
+                summary += f" ({self.skipped_backlog_seconds:.1f}s of stale audio skipped)"
+        return summary
+
+
+def _format_memory(size: Optional[int]) -> str:
+    if size is None:
+        return "unknown"
+    return f"{size / (1024 * 1024):.0f} MB"
+
+
+def _join_caption(committed: str, pending: str) -> str:
+    return " ".join(part for part in (committed.strip(), pending.strip()) if part)
 
 
 class StreamingTranscriber:
@@ -19,75 +133,961 @@ class StreamingTranscriber:
         settings: Settings,
         overlay: OverlayWindow,
         model_factory: Optional[Callable[[], WhisperModel]] = None,
+        vad: Optional[StreamingVad] = None,
+        model_path_factory: Optional[Callable[[str], WhisperModel]] = None,
+        partial_model_factory: Optional[Callable[[], WhisperModel]] = None,
+        decoder: Optional[BatchedDecoder] = None,
     ) -> None:
         self.settings = settings
         self.overlay = overlay
-        self._buffer = np.zeros(0, dtype=np.float32)
         self._last_text = ""
         self._window_size = max(1, int(settings.sample_rate * settings.window_seconds))
         self._overlap_size = max(0, int(settings.sample_rate * settings.overlap_seconds))
+        capacity = self._window_size
+        if settings.streaming_policy == "endpoint":
+            capacity = max(capacity, int(settings.sample_rate * settings.max_window_seconds))
+        self._samples = SampleBuffer(capacity + settings.chunk_samples)
         self._model_factory = model_factory or (lambda: get_model(settings))
         self._model: Optional[WhisperModel] = None
-        self._vad_enabled = True
+        self._model_path_factory = model_path_factory or (
+            lambda path: get_model(settings, path)
+        )
+        self._decoder = decoder
+
+        # Two-tier cascade: a small model drafts partial captions between the
+        # windows that the main model decodes into the final text.
+        self._partial_model_factory = partial_model_factory
+        partial_path = settings.whisper_partial_model_path
+        if self._partial_model_factory is None and partial_path:
+            self._partial_model_factory = lambda: get_model(settings, partial_path)
+        self._partial_model: Optional[WhisperModel] = None
+
+        self._vad = vad
+        self._whisper_vad = False
+        if vad is None and settings.vad_mode != "off":
+            if not onnxruntime_available():
+                print("onnxruntime not available; disabling VAD for this session.")
+            elif settings.vad_mode == "streaming":
+                self._vad = create_streaming_vad(settings.sample_rate)
+            else:
+                self._whisper_vad = True
+
+        self._hypothesis: Optional[HypothesisBuffer] = None
+        if settings.streaming_policy == "agreement":
+            self._hypothesis = HypothesisBuffer()
+        self._offset = 0.0
+        self._undecoded = 0
+        self._caption = ""
+
+        self._endpointing = settings.streaming_policy == "endpoint"
+        self._utterance_active = False
+        self._trailing_silence = 0.0
+        # (end index in the buffer, mean energy) for each chunk of the utterance.
+        self._chunk_levels: list[tuple[int, float]] = []
+
+        self.stats = TranscriberStats()
+        # The gate always tells speech from silence, for endpointing, idle
+        # unloading and partial captions; silence_gate decides whether windows
+        # it heard nothing in are skipped.
+        self._gate = EnergyGate(margin_db=settings.silence_gate_margin_db)
+        self._heard_speech = False
+        self._captured_at: Optional[float] = None
+
+        self._rtf = RealTimeFactor()
+        self._decode_cost = DecodeCost()
+        self._adaptive: Optional[AdaptiveWindow] = None
+        if settings.adaptive_window and not self._endpointing:
+            self._adaptive = AdaptiveWindow(
+                settings.window_seconds,
+                settings.overlap_seconds,
+                settings.min_window_seconds,
+                settings.max_window_seconds,
+                settings.target_rtf,
+            )
+            self._apply_window(self._adaptive.window_seconds, self._adaptive.overlap_seconds)
+
+        self._catchup: Optional[CatchUp] = None
+        self._backlog_status = ""
+        if settings.catchup_policy != "off":
+            self._catchup = CatchUp(
+                settings.catchup_policy,
+                settings.catchup_backlog_seconds,
+                settings.catchup_target_seconds,
+            )
 
-    def submit(self, chunk: bytes) -> None:
+        self._ladder: Optional[ModelLadder] = None
+        self._model_loader: Optional[BackgroundModelLoader] = None
+        if settings.whisper_model_ladder:
+            self._ladder = ModelLadder(
+                settings.whisper_model_ladder,
+                settings.whisper_model_path,
+                settings.target_rtf,
+            )
+            self._model_loader = BackgroundModelLoader(self._model_path_factory)
+
+        # Language routing: once the language is locked, switch to the model
+        # configured for it (e.g. base.en) and back to the multilingual model
+        # when a recheck finds a different language.
+        self._router: Optional[LanguageRouter] = None
+        self._route_loader: Optional[BackgroundModelLoader] = None
+        routes = settings.whisper_language_models if settings.whisper_language is None else ()
+        if routes and (self._ladder is not None or settings.inference_worker):
+            print("Language model routing is disabled with a model ladder or inference worker.")
+        elif routes:
+            self._router = LanguageRouter(dict(routes), settings.whisper_model_path)
+            self._route_loader = BackgroundModelLoader(self._model_path_factory)
+
+        self._language_lock: Optional[LanguageLock] = None
+        lock_windows = settings.language_lock_windows
+        if self._router is not None and not lock_windows:
+            lock_windows = _ROUTING_LOCK_WINDOWS
+        if settings.whisper_language is None and lock_windows:
+            self._language_lock = LanguageLock(
+                lock_windows,
+                settings.language_lock_probability,
+                settings.language_recheck_seconds,
+            )
+
+        # Idle unloading: after model_idle_unload_seconds without speech the
+        # models are released, and the first speech afterwards reloads them in
+        # the background while its audio waits in the buffer. An inference
+        # worker keeps its own copy of the model, which this cannot release.
+        self._idle_unload_seconds = settings.model_idle_unload_seconds
+        if self._idle_unload_seconds and settings.inference_worker:
+            print("Idle model unloading is disabled with an inference worker.")
+            self._idle_unload_seconds = 0.0
+        self._silent_seconds = 0.0
+        self._idle_state = "active"
+        self._reloader: Optional[BackgroundModelLoader] = None
+        if self._idle_unload_seconds:
+            self._reloader = BackgroundModelLoader(lambda path: self._load_model(path))
+
+    def submit(self, chunk: bytes, captured_at: Optional[float] = None) -> None:
+        """Feed one capture chunk.
+
+        ``captured_at`` is the monotonic time the chunk left the device; when
+        given, each decode records the latency from there to its caption,
+        and the chunk's wait drives catch-up mode.
+        """
         if not chunk:
             return
+        self._captured_at = captured_at
+        if self._catchup is not None and captured_at is not None:
+            chunk_seconds = len(chunk) / 2 / self.settings.sample_rate
+            if self._track_backlog(time.monotonic() - captured_at, chunk_seconds):
+                return
 
-        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32) / 32768.0
-        if not samples.size:
+        if self._vad is None:
+            appended = self._samples.append_pcm16(chunk)
+            if not appended:
+                return
+            heard = speech = self._gate.is_speech(
+                self._samples.view()[-appended:]
+            )
+        else:
+            # Only speech reaches the buffer; the VAD already judged every sample.
+            speech_frames = self._vad.speech_frames
+            appended = self._samples.append(self._vad.process(pcm16_to_float32(chunk)))
+            heard = appended > 0
+            speech = self._vad.speech_frames > speech_frames
+        self._undecoded += appended
+        self._heard_speech = self._heard_speech or heard
+        if self._reloader is not None and not self._manage_idle_model(
+            heard, len(chunk) / 2 / self.settings.sample_rate
+        ):
             return
 
-        self._buffer = np.concatenate((self._buffer, samples))
-        if self._buffer.size < self._window_size:
+        windows = self.stats.windows
+        if self._vad is not None and self._vad.utterance_ended:
+            self._end_utterance()
+        elif self._endpointing:
+            self._advance_endpoint(len(chunk) / 2 / self.settings.sample_rate, speech, appended)
+        elif self._hypothesis is not None:
+            self._advance_agreement()
+        else:
+            self._advance_window()
+
+        # Draft a partial caption only when this chunk did not close a window.
+        closed_window = self.stats.windows != windows
+        if self._partial_model_factory is not None and not closed_window and self._heard_speech:
+            self._decode_partial()
+
+    @property
+    def _buffer(self) -> np.ndarray:
+        return self._samples.view()
+
+    def _advance_window(self) -> None:
+        if self._samples.size < self._window_size:
+            return
+        self.stats.windows += 1
+
+        if self._take_speech_flag():
+            self._decode_window()
+        else:
+            self.stats.skipped_silent += 1
+
+        if self._overlap_size and self._overlap_size < self._samples.size:
+            self._samples.keep_tail(self._overlap_size)
+        else:
+            self._samples.clear()
+
+    def _decode_window(self, audio: Optional[np.ndarray] = None) -> None:
+        # The model reads the buffer in place; it is only compacted afterwards.
+        if audio is None:
+            audio = self._samples.view()
+        self._emit(self._transcribe_audio(audio))
+
+    def _advance_endpoint(self, chunk_seconds: float, speech: bool, appended: int) -> None:
+        """Close windows at pauses instead of at a fixed length.
+
+        A pause of ``endpoint_pause_seconds`` closes the window once it holds
+        at least ``min_window_seconds``; a pause twice as long ends the
+        utterance and flushes it whatever its length. Speech running past
+        ``max_window_seconds`` is cut at the quietest chunk boundary.
+        """
+        settings = self.settings
+        rate = settings.sample_rate
+        if appended:
+            recent = self._samples.view()[-appended:]
+            self._chunk_levels.append(
+                (self._samples.size, float(np.dot(recent, recent)) / appended)
+            )
+
+        if speech:
+            self._utterance_active = True
+            self._trailing_silence = 0.0
+        else:
+            self._trailing_silence += chunk_seconds
+
+        if not self._utterance_active:
+            # Nothing said yet: only keep a short pre-roll of the silence.
+            preroll = min(self._samples.size, int(settings.endpoint_pause_seconds * rate))
+            self._samples.keep_tail(preroll)
+            self._chunk_levels = [(preroll, level) for _, level in self._chunk_levels[-1:]]
+            self._heard_speech = False
             return
 
-        audio = self._buffer.copy()
-        text = self._transcribe_audio(audio)
+        buffered = self._samples.size / rate
+        pause = self._trailing_silence >= settings.endpoint_pause_seconds
+        utterance_end = self._trailing_silence >= 2 * settings.endpoint_pause_seconds
+        if (pause and buffered >= settings.min_window_seconds) or utterance_end:
+            self._end_utterance()
+        elif buffered >= settings.max_window_seconds:
+            self._cut_at_quietest_chunk()
 
+    def _cut_at_quietest_chunk(self) -> None:
+        min_size = int(self.settings.min_window_seconds * self.settings.sample_rate)
+        candidates = [entry for entry in self._chunk_levels[:-1] if entry[0] >= min_size]
+        cut = min(candidates, key=lambda entry: entry[1])[0] if candidates else self._samples.size
+
+        self.stats.windows += 1
+        self._decode_window(self._samples.view()[:cut])
+        self._samples.keep_tail(self._samples.size - cut)
+        self._chunk_levels = [(end - cut, level) for end, level in self._chunk_levels if end > cut]
+
+    def _advance_agreement(self) -> None:
+        if self._undecoded < self._window_size:
+            return
+        self.stats.windows += 1
+
+        if self._take_speech_flag():
+            self._decode_agreement()
+        else:
+            # Nothing new was said: settle the pending words and drop the audio.
+            self.stats.skipped_silent += 1
+            self._settle_agreement()
+
+    def _end_utterance(self) -> None:
+        """Decode the buffered speech now instead of waiting for a full window."""
+        if self._samples.size and self._take_speech_flag():
+            self.stats.windows += 1
+            if self._hypothesis is None:
+                self._decode_window()
+            elif self._undecoded:
+                self._decode_agreement()
+
+        if self._hypothesis is not None:
+            self._settle_agreement()
+        else:
+            self._samples.clear()
+        self._utterance_active = False
+        self._trailing_silence = 0.0
+        self._chunk_levels = []
+
+    def _decode_agreement(self) -> None:
+        hypothesis = self._hypothesis
+        assert hypothesis is not None
+        audio = self._samples.view()
+        segments = self._decode(
+            audio,
+            word_timestamps=True,
+            initial_prompt=hypothesis.prompt(),
+        )
+        words = words_from_segments(
+            segments, self._offset, audio.size / self.settings.sample_rate
+        )
+        self._commit_caption(hypothesis.insert(words))
+        self._emit(_join_caption(self._caption, join_words(hypothesis.pending)))
+        self._trim_committed_audio(segments)
+
+    def _trim_committed_audio(self, segments: list) -> None:
+        hypothesis = self._hypothesis
+        assert hypothesis is not None
+        rate = self.settings.sample_rate
+        buffered = self._samples.size / rate
+        committed = hypothesis.committed_end - self._offset
+
+        cut = 0.0
+        for segment in segments:
+            end = getattr(segment, "end", None)
+            if end is not None and end <= committed + 1e-3:
+                cut = max(cut, float(end))
+
+        if not cut and buffered > _AGREEMENT_TRIM_SECONDS and committed > 0:
+            cut = committed
+        if not cut and buffered > _AGREEMENT_MAX_SECONDS:
+            self._commit_caption(hypothesis.flush())
+            cut = buffered
+
+        drop = min(self._samples.size, int(cut * rate))
+        if drop <= 0:
+            return
+        self._samples.keep_tail(self._samples.size - drop)
+        self._offset += drop / rate
+
+    def _settle_agreement(self) -> None:
+        hypothesis = self._hypothesis
+        assert hypothesis is not None
+        self._commit_caption(hypothesis.flush())
+        self._emit(self._caption)
+        self._offset += self._samples.size / self.settings.sample_rate
+        self._samples.clear()
+        self._undecoded = 0
+
+    def _track_backlog(self, backlog_seconds: float, chunk_seconds: float) -> bool:
+        """Update catch-up mode; returns True when the chunk is skipped as stale."""
+        catchup = self._catchup
+        assert catchup is not None
+        changed = catchup.update(backlog_seconds)
+        if changed is True:
+            self.stats.catchups += 1
+            print(
+                f"Decoding is {backlog_seconds:.1f}s behind the audio; "
+                f"catching up ({catchup.policy})."
+            )
+            if catchup.policy == "merge":
+                # Fewer, larger decodes: one window may span the whole backlog.
+                self._apply_window(self.settings.max_window_seconds, 0.0)
+            elif catchup.policy == "skip" and self._hypothesis is not None:
+                # Settle what is buffered so the skipped gap falls between
+                # utterances rather than inside the decoded audio.
+                self._settle_agreement()
+        elif changed is False:
+            print(f"Caught up; backlog is {backlog_seconds:.1f}s.")
+            if catchup.policy == "merge":
+                self._restore_window()
+
+        status = f"{backlog_seconds:.1f}s"
+        if catchup.active:
+            status += f" (catching up: {catchup.policy})"
+        if status != self._backlog_status:
+            self._backlog_status = status
+            self._report_status("Backlog", status)
+
+        if not self._catching_up("skip"):
+            return False
+        self.stats.skipped_backlog_seconds += chunk_seconds
+        if self._hypothesis is not None:
+            # The buffer is empty while skipping; keep the offset on the
+            # capture timeline.
+            self._offset += chunk_seconds
+        return True
+
+    def _catching_up(self, policy: str) -> bool:
+        return self._catchup is not None and self._catchup.active and self._catchup.policy == policy
+
+    def _restore_window(self) -> None:
+        if self._adaptive is not None:
+            self._apply_window(self._adaptive.window_seconds, self._adaptive.overlap_seconds)
+        else:
+            self._apply_window(self.settings.window_seconds, self.settings.overlap_seconds)
+
+    def _apply_window(self, window_seconds: float, overlap_seconds: float) -> None:
+        rate = self.settings.sample_rate
+        self._window_size = max(1, int(rate * window_seconds))
+        self._overlap_size = max(0, int(rate * overlap_seconds))
+
+    def _record_decode(self, decode_seconds: float, new_seconds: float) -> None:
+        """Account one decode against the audio it added to the transcript.
+
+        Overlap audio is decoded again by every window, so throughput is the
+        decode time over the hop, not over the whole window.
+        """
+        self.stats.decode_seconds += decode_seconds
+        self.stats.audio_seconds += new_seconds
+        if self._captured_at is not None:
+            latency = time.monotonic() - self._captured_at
+            self.stats.record_latency(latency)
+            self._report_status("Latency", f"{1000 * latency:.0f} ms")
+        if new_seconds <= 0:
+            # Only already decoded audio, e.g. an utterance ending on the overlap.
+            return
+        rtf = self._rtf.update(decode_seconds, new_seconds)
+
+        if self._adaptive is not None and self._adaptive.update(rtf):
+            if not self._catching_up("merge"):
+                self._apply_window(self._adaptive.window_seconds, self._adaptive.overlap_seconds)
+            self._report_status(
+                "Window",
+                f"{self._adaptive.window_seconds:.1f}s/{self._adaptive.overlap_seconds:.1f}s",
+            )
+        self._report_status("RTF", f"{rtf:.2f}")
+
+        if self._ladder is not None and self._model_loader is not None:
+            target = self._ladder.observe(rtf)
+            if target is not None:
+                print(f"Real-time factor {rtf:.2f}; loading model '{target}' in the background.")
+                self._model_loader.request(target)
+
+    def _record_deadline(self, cut: bool, overrun_seconds: float) -> None:
+        if not cut and overrun_seconds <= 0:
+            return
+        self.stats.deadline_cuts += int(cut)
+        self.stats.overrun_seconds += max(0.0, overrun_seconds)
+        self._report_status(
+            "Deadline",
+            f"{self.stats.deadline_cuts} capped, {self.stats.overrun_seconds:.1f}s over",
+        )
+
+    def _report_status(self, name: str, value: str) -> None:
+        self.overlay.update_status_field(name, value)
+
+    def _take_speech_flag(self) -> bool:
+        """Whether the window should be decoded; clears the speech seen so far."""
+        heard, self._heard_speech = self._heard_speech, False
+        # An idle-unloaded model is not reloaded for silence either.
+        return heard or not (self.settings.silence_gate or self._idle_state != "active")
+
+    def _commit_caption(self, words: list[Word]) -> None:
+        text = join_words(words)
+        if not text:
+            return
+        caption = f"{self._caption} {text}".strip()
+        if len(caption) > _CAPTION_CHARS:
+            caption = caption[-_CAPTION_CHARS:]
+            caption = caption.split(" ", 1)[-1]
+        self._caption = caption
+
+    def _emit(self, text: str) -> None:
         if text and text != self._last_text:
             self.overlay.display_text(text)
             self._last_text = text
 
-        if self._overlap_size and self._overlap_size < self._buffer.size:
-            self._buffer = self._buffer[-self._overlap_size :]
-        else:
-            self._buffer = np.zeros(0, dtype=np.float32)
+    def _emit_partial(self, text: str) -> None:
+        if text and text != self._last_text:
+            self.overlay.display_partial(text)
+            # Whatever final text comes next must replace the partial.
+            self._last_text = ""
+
+    def _decode_partial(self) -> None:
+        audio = self._samples.view()
+        if audio.size < int(_PARTIAL_MIN_SECONDS * self.settings.sample_rate):
+            return
+        assert self._partial_model_factory is not None
+        if self._partial_model is None:
+            self._partial_model = self._partial_model_factory()
+
+        started = time.perf_counter()
+        try:
+            segments, _ = self._partial_model.transcribe(
+                audio,
+                beam_size=1,
+                temperature=0.0,
+                vad_filter=False,
+                language=self._language(),
+                condition_on_previous_text=False,
+                without_timestamps=True,
+            )
+            text = "".join(segment.text for segment in segments).strip()
+        except Exception as exc:
+            print(f"Partial transcription error: {exc}")
+            return
+        finally:
+            self.stats.partial_calls += 1
+            self.stats.partial_seconds += time.perf_counter() - started
+
+        if self._hypothesis is not None:
+            text = _join_caption(self._caption, text)
+        self._emit_partial(text)
 
     def _transcribe_audio(self, audio: np.ndarray) -> str:
-        attempts = 2 if self._vad_enabled else 1
-        for attempt in range(attempts):
-            try:
-                model = self._get_model()
-                segments, _ = model.transcribe(
-                    audio,
-                    beam_size=self.settings.whisper_beam_size,
-                    temperature=0.0,
-                    vad_filter=self._vad_enabled,
-                    language=self.settings.whisper_language,
+        """Decode a window for its text alone.
+
+        faster-whisper returns nothing for a window under 30 s until all of
+        it is decoded, so the caption can only appear sooner if the decode
+        is shorter. Only the text is used here, so the timestamp tokens
+        around every segment are not generated at all.
+        """
+        segments = self._decode(audio, without_timestamps=True)
+        return "".join(segment.text for segment in segments).strip()
+
+    def _decode(self, audio: np.ndarray, **options: Any) -> list:
+        """Run the model and collect its segments.
+
+        faster-whisper decodes each 30 s chunk in full before yielding its
+        segments, so for the windows used here, which are shorter than that,
+        all segments arrive together. With a shared batched decoder the
+        measured time includes waiting for the batch.
+
+        With ``decode_deadline_factor`` set, the window's budget is that
+        multiple of its duration. faster-whisper cannot be interrupted once
+        a window is being decoded, so the budget is enforced up front: the
+        measured decode cost converts the time left into ``max_new_tokens``,
+        which stops runaway output such as hallucination loops.
+
+        With ``adaptive_beam`` the window is decoded greedily first and only
+        decoded again with ``whisper_beam_size`` when the greedy result
+        looks unreliable.
+
+        ``audio`` is always the head of the buffer; the samples appended
+        since the last decode are the new audio it adds.
+        """
+        undecoded = min(self._undecoded, self._samples.size)
+        new_samples = max(0, audio.size - (self._samples.size - undecoded))
+        self._undecoded = min(undecoded, self._samples.size - audio.size)
+        try:
+            model = self._get_model()
+            started = time.perf_counter()
+            options = dict(
+                beam_size=1 if self._catching_up("beam") else self.settings.whisper_beam_size,
+                temperature=0.0,
+                vad_filter=self._whisper_vad,
+                language=self._language(),
+                **options,
+            )
+            audio_seconds = audio.size / self.settings.sample_rate
+            deadline: Optional[float] = None
+            if self.settings.decode_deadline_factor:
+                deadline = started + self.settings.decode_deadline_factor * audio_seconds
+
+            if self.settings.adaptive_beam and options["beam_size"] > 1:
+                decoded, info, cut = self._run_model(
+                    model, audio, dict(options, beam_size=1), deadline
                 )
-                return "".join(segment.text for segment in segments).strip()
-            except Exception as exc:
-                message = str(exc).lower()
-                missing_vad_dep = "requires the onnxruntime package" in message
-                if self._vad_enabled and missing_vad_dep:
-                    print("onnxruntime not available; disabling VAD filter for this session.")
-                    self._vad_enabled = False
-                    continue
-                print(f"Transcription error: {exc}")
-                break
-        return ""
+                self.stats.greedy_first += 1
+                in_time = deadline is None or time.perf_counter() < deadline
+                if not cut and in_time and self._needs_wider_beam(decoded):
+                    self.stats.beam_redecodes += 1
+                    decoded, info, second_cut = self._run_model(model, audio, options, deadline)
+                    cut = cut or second_cut
+                self._report_status(
+                    "Beam", f"{self.stats.beam_fraction:.0%} at beam {options['beam_size']}"
+                )
+            else:
+                decoded, info, cut = self._run_model(model, audio, options, deadline)
+            if deadline is not None:
+                self._record_deadline(cut, time.perf_counter() - deadline)
+            self._record_decode(
+                time.perf_counter() - started, new_samples / self.settings.sample_rate
+            )
+            if self._language_lock is not None:
+                self._observe_language(info, audio_seconds)
+            return decoded
+        except Exception as exc:
+            print(f"Transcription error: {exc}")
+        return []
+
+    def _run_model(
+        self,
+        model: WhisperModel,
+        audio: np.ndarray,
+        options: dict,
+        deadline: Optional[float],
+    ) -> tuple[list, Any, bool]:
+        """One model pass.
+
+        Returns the segments, the transcription info and whether the
+        deadline's token cap cut the text short.
+        """
+        self.stats.model_calls += 1
+        cap = self._deadline_tokens(deadline)
+        if cap is not None:
+            options = dict(options, max_new_tokens=cap)
+        started = time.perf_counter()
+        if self._decoder is not None:
+            segments, info = self._decoder.transcribe(model, audio, **options)
+        else:
+            segments, info = model.transcribe(audio, **options)
+        decoded = list(segments)
+        tokens = sum(len(getattr(segment, "tokens", None) or ()) for segment in decoded)
+        if self._decoder is None:
+            # Batched timings include queueing, which says nothing about cost.
+            self._decode_cost.update(tokens, time.perf_counter() - started)
+        return decoded, info, cap is not None and tokens >= cap
+
+    def _deadline_tokens(self, deadline: Optional[float]) -> Optional[int]:
+        """max_new_tokens that should finish by ``deadline``, or None for no cap."""
+        if deadline is None:
+            return None
+        tokens = self._decode_cost.tokens_within(deadline - time.perf_counter())
+        if tokens is None or tokens >= _MAX_CAPPED_TOKENS:
+            return None
+        return max(_MIN_CAPPED_TOKENS, tokens)
+
+    def _language(self) -> Optional[str]:
+        if self._language_lock is not None:
+            return self._language_lock.decode_language()
+        return self.settings.whisper_language
+
+    def _observe_language(self, info: Any, audio_seconds: float) -> None:
+        lock = self._language_lock
+        assert lock is not None
+        changed = lock.observe(
+            getattr(info, "language", None),
+            getattr(info, "language_probability", None),
+            audio_seconds,
+        )
+        if not changed:
+            return
+        if lock.language is not None:
+            print(f"Locked the language to '{lock.language}'.")
+            shown: Optional[str] = f"{lock.language} (locked)"
+        else:
+            print("Detected a different language; detecting it on every window again.")
+            shown = None
+        self.overlay.set_status_info(
+            self._current_model_path(), shown, self.settings.whisper_compute_type
+        )
+        if self._router is not None:
+            self._route_language(lock.language)
+
+    def _needs_wider_beam(self, segments: list) -> bool:
+        for segment in segments:
+            ratio = getattr(segment, "compression_ratio", None)
+            if ratio is not None and ratio > self.settings.adaptive_beam_compression_ratio:
+                # Repetitive output: greedy decoding is stuck in a loop.
+                return True
+            logprob = getattr(segment, "avg_logprob", None)
+            no_speech = getattr(segment, "no_speech_prob", None) or 0.0
+            # Low confidence on what is probably silence is not worth a rerun.
+            if (
+                logprob is not None
+                and logprob < self.settings.adaptive_beam_logprob
+                and no_speech < _NO_SPEECH_PROB
+            ):
+                return True
+        return False
 
     def _get_model(self) -> WhisperModel:
+        if self._model_loader is not None:
+            self._swap_loaded_model()
+        if self._router is not None:
+            self._swap_routed_model()
+            lock = self._language_lock
+            if self._router.specialised and lock is not None and lock.checking:
+                # Specialised models such as base.en cannot detect the language.
+                return self._model_factory()
         if self._model is None:
-            self._model = self._model_factory()
+            self._model = self._load_model(self._current_model_path())
         return self._model
 
+    def _manage_idle_model(self, heard: bool, chunk_seconds: float) -> bool:
+        """Unload after a long silence and reload on speech.
 
-def _consume_stream(stream, settings: Settings, transcriber: StreamingTranscriber) -> None:
+        Returns False while a reload is in flight: the chunk stays in the
+        buffer and is decoded once the model is back.
+        """
+        if self._idle_state == "active":
+            self._silent_seconds = 0.0 if heard else self._silent_seconds + chunk_seconds
+            if self._silent_seconds >= self._idle_unload_seconds and self._model is not None:
+                self._unload_idle_model()
+            return True
+
+        reloader = self._reloader
+        assert reloader is not None
+        if self._idle_state == "unloaded":
+            if not heard:
+                return True
+            print("Speech resumed; reloading the model.")
+            self._report_status("Model", "reloading")
+            self._idle_state = "reloading"
+            reloader.request(self._current_model_path())
+
+        ready = reloader.take_ready()
+        if ready is not None:
+            self._model = ready[1]
+            print(f"Model reloaded ({_format_memory(process_memory_bytes())} resident).")
+        elif reloader.failed is None:
+            return False
+        else:
+            # Fall back to loading on the first decode, as at startup.
+            reloader.failed = None
+        self._idle_state = "active"
+        self._silent_seconds = 0.0
+        self._report_status("Model", "ready")
+        return True
+
+    def _unload_idle_model(self) -> None:
+        before = process_memory_bytes()
+        self._model = None
+        self._partial_model = None
+        release_model(self.settings, self._current_model_path())
+        if self.settings.whisper_partial_model_path:
+            release_model(self.settings, self.settings.whisper_partial_model_path)
+        gc.collect()
+        after = process_memory_bytes()
+        self._idle_state = "unloaded"
+        print(
+            f"Unloaded the model after {self._silent_seconds:.0f}s without speech "
+            f"(resident memory {_format_memory(before)} -> {_format_memory(after)})."
+        )
+        self._report_status("Model", f"unloaded ({_format_memory(after)})")
+
+    def _current_model_path(self) -> str:
+        if self._ladder is not None:
+            return self._ladder.current
+        if self._router is not None:
+            return self._router.current
+        return self.settings.whisper_model_path
+
+    def _load_model(self, model_path: str) -> WhisperModel:
+        if model_path != self.settings.whisper_model_path:
+            return self._model_path_factory(model_path)
+        return self._model_factory()
+
+    def _swap_loaded_model(self) -> None:
+        loader, ladder = self._model_loader, self._ladder
+        assert loader is not None and ladder is not None
+        ready = loader.take_ready()
+        if ready is None:
+            if loader.failed is not None:
+                loader.failed = None
+                ladder.cancel()
+            return
+
+        # Swapping between decodes keeps every window on a single model.
+        model_path, self._model = ready
+        ladder.commit(model_path)
+        self._rtf = RealTimeFactor()
+        print(f"Switched to model '{model_path}'.")
+        self._report_status("Active model", model_path)
+
+    def _route_language(self, language: Optional[str]) -> None:
+        router, loader = self._router, self._route_loader
+        assert router is not None and loader is not None
+        target = router.select(language)
+        if target is None:
+            return
+        print(f"Language '{language or 'unknown'}'; loading model '{target}' in the background.")
+        loader.request(target)
+
+    def _swap_routed_model(self) -> None:
+        router, loader = self._router, self._route_loader
+        assert router is not None and loader is not None
+        ready = loader.take_ready()
+        if ready is None:
+            if loader.failed is not None:
+                loader.failed = None
+                router.pending = None
+            elif router.pending is not None and not loader.loading:
+                loader.request(router.pending)
+            return
+
+        model_path, model = ready
+        if not router.commit(model_path):
+            # The language changed while this model loaded; fetch the new one.
+            if router.pending is not None:
+                loader.request(router.pending)
+            return
+        # The swap happens between decodes, so no window mixes two models.
+        self._model = model
+        print(f"Switched to model '{model_path}'.")
+        self._report_status("Active model", model_path)
+
+
+class SourceOverlay:
+    """Routes one audio source's captions to its own line of a shared overlay."""
+
+    def __init__(self, overlay: OverlayWindow, source: str) -> None:
+        self._overlay = overlay
+        self.source = source
+
+    def display_text(self, text: str) -> None:
+        self._overlay.display_source_text(self.source, text)
+
+    def display_partial(self, text: str) -> None:
+        self._overlay.display_source_text(self.source, text, partial=True)
+
+    def update_status_field(self, name: str, value: str) -> None:
+        self._overlay.update_status_field(f"{self.source} {name}", value)
+
+    def set_status_info(self, model: str, language: Optional[str], compute_type: str) -> None:
+        # The header line is shared, so each source reports its language as a field.
+        self.update_status_field("Language", language or "")
+
+
+def _consume_sources(
+    sources: list[tuple[FrameQueue, StreamingTranscriber]],
+    idle_wait: float,
+) -> None:
+    """Feed several capture queues to their transcribers from one thread.
+
+    Sources are visited round-robin, one chunk at a time, so a window that
+    closes on one source is decoded between chunks of the other and both
+    share the model without concurrent calls.
+    """
+    active = list(sources)
+    while active:
+        progressed = False
+        for source in list(active):
+            frames, transcriber = source
+            chunk = frames.get(timeout=0)
+            if chunk is not None:
+                transcriber.submit(chunk, captured_at=frames.last_timestamp)
+                progressed = True
+            elif frames.closed:
+                active.remove(source)
+        if not progressed and active:
+            active[0][0].wait(timeout=idle_wait)
+
+
+def _consume_sources_concurrently(
+    sources: list[tuple[FrameQueue, StreamingTranscriber]],
+) -> None:
+    """Feed each capture queue from its own thread.
+
+    Used with a shared batched decoder: every transcriber blocks while its
+    window is decoded, so the sources must not wait on each other.
+    """
+    threads = [
+        threading.Thread(
+            target=_consume_frames,
+            args=source,
+            name=f"consume-{index}",
+            daemon=True,
+        )
+        for index, source in enumerate(sources)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        while thread.is_alive():
+            thread.join(timeout=0.5)
+
+
+def _consume_aligned(
+    mic_frames: FrameQueue,
+    system_frames: FrameQueue,
+    aligner: StreamAligner,
+    transcriber: StreamingTranscriber,
+) -> None:
+    """Mix system audio into the microphone stream on the mic's clock.
+
+    System frames are paired with each mic chunk by capture stamp: only those
+    queued by the time the chunk was are moved into the aligner, and later
+    ones wait in their queue. After a decode stall the backlog therefore
+    stays in the capture queues instead of overflowing the jitter buffer.
+    """
+    reported = 0.0
+    mic_dropped = system_dropped = 0
     while True:
-        chunk = stream.read(settings.chunk_samples, exception_on_overflow=False)
-        transcriber.submit(chunk)
+        mic_data = mic_frames.get()
+        if mic_data is None:
+            break
+        # Capture-time stamps, so the clocks measure the devices rather than
+        # when this loop got round to draining them.
+        captured_at = mic_frames.last_timestamp
+
+        # Frames the capture queues discarded were still captured; the clocks
+        # must count them or the drift estimate is biased after every drop.
+        # Dropped system frames were older than any still queued.
+        aligner.skip_system((system_frames.dropped_bytes - system_dropped) // 2)
+        system_dropped = system_frames.dropped_bytes
+        while True:
+            system_data = system_frames.get_until(captured_at)
+            if system_data is None:
+                break
+            aligner.push_system(system_data, timestamp=system_frames.last_timestamp)
+        if system_frames.closed and not len(system_frames) and not aligner.system_ended:
+            print("System audio stopped; continuing with the microphone only.")
+            aligner.end_system()
+
+        aligner.skip_mic((mic_frames.dropped_bytes - mic_dropped) // 2)
+        mic_dropped = mic_frames.dropped_bytes
+
+        transcriber.submit(aligner.mix(mic_data, timestamp=captured_at), captured_at=captured_at)
+
+        measured = aligner.mic_clock.measured_seconds
+        if measured - reported >= 1.0:
+            reported = measured
+            stats = aligner.stats
+            transcriber.overlay.update_status_field(
+                "Drift",
+                f"{stats.drift_ppm:+.0f} ppm, {1000 * stats.latency_seconds:.0f} ms",
+            )
+
+
+def _start_batched_decoder(overlay: OverlayWindow, settings: Settings) -> BatchedDecoder:
+    def report(batch: BatchReport) -> None:
+        overlay.update_status_field(
+            "Batch",
+            f"{batch.size} x {batch.throughput:.1f}x RT, "
+            f"wait {1000 * batch.wait_seconds:.0f} ms",
+        )
+
+    # Load the shared model before several threads can ask for it at once.
+    get_model(settings)
+    print(
+        f"Batching up to {settings.inference_batch_size} windows, "
+        f"waiting at most {1000 * settings.inference_batch_wait_seconds:.0f} ms."
+    )
+    return BatchedDecoder(
+        settings.sample_rate,
+        max_batch_size=settings.inference_batch_size,
+        max_wait_seconds=settings.inference_batch_wait_seconds,
+        on_batch=report,
+    )
+
+
+def _close_batched_decoder(decoder: BatchedDecoder) -> None:
+    decoder.close(timeout=1.0)
+    print(f"Batch stats: {decoder.stats.summary()}")
+
+
+def _start_inference_worker(settings: Settings) -> Optional[InferenceWorker]:
+    if not settings.inference_worker:
+        return None
+    print("Running the model in a separate worker process.")
+    return InferenceWorker(settings).start()
+
+
+def _worker_model_factory(
+    worker: Optional[InferenceWorker],
+) -> Optional[Callable[[], WhisperModel]]:
+    # The worker stands in for the model: it exposes the same transcribe().
+    if worker is None:
+        return None
+    return lambda: worker  # type: ignore[return-value]
+
+
+def _close_inference_worker(worker: Optional[InferenceWorker]) -> None:
+    if worker is None:
+        return
+    worker.close()
+    print(f"Inference worker: {worker.stats.summary()}")
+
+
+def _consume_frames(frames: FrameQueue, transcriber: StreamingTranscriber) -> None:
+    while True:
+        chunk = frames.get()
+        if chunk is None:
+            break
+        transcriber.submit(chunk, captured_at=frames.last_timestamp)
+
+
+def _consume_stream(stream, settings: Settings, transcriber: StreamingTranscriber) -> None:
+    with captured_frames(stream, settings) as frames:
+        _consume_frames(frames, transcriber)
 
 
 def transcribe_audio(
@@ -95,7 +1095,10 @@ def transcribe_audio(
     settings: Settings,
     use_system_audio: bool = False,
 ) -> None:
-    transcriber = StreamingTranscriber(settings, overlay)
+    worker = _start_inference_worker(settings)
+    transcriber = StreamingTranscriber(
+        settings, overlay, model_factory=_worker_model_factory(worker)
+    )
     p = pyaudio.PyAudio()
 
     try:
@@ -121,10 +1124,16 @@ def transcribe_audio(
         print("Stopping transcription...")
     finally:
         p.terminate()
+        print(f"Transcription stats: {transcriber.stats.summary()}")
+        _close_inference_worker(worker)
 
 
 def transcribe_both_audio(overlay: OverlayWindow, settings: Settings) -> None:
-    transcriber = StreamingTranscriber(settings, overlay)
+    transcribers: list[tuple[str, StreamingTranscriber]] = []
+    aligners: list[StreamAligner] = []
+    decoder: Optional[BatchedDecoder] = None
+    worker = _start_inference_worker(settings)
+    model_factory = _worker_model_factory(worker)
     p = pyaudio.PyAudio()
 
     try:
@@ -142,26 +1151,58 @@ def transcribe_both_audio(overlay: OverlayWindow, settings: Settings) -> None:
             else:
                 print("No loopback device found. Using microphone only.")
 
-            print("Listening for speech from both microphone and system audio...")
-
-            while True:
-                mic_data = mic_stream.read(
-                    settings.chunk_samples, exception_on_overflow=False
+            mic_frames = stack.enter_context(
+                captured_frames(mic_stream, settings, name="mic-capture")
+            )
+            system_frames: Optional[FrameQueue] = None
+            if system_stream is not None:
+                system_frames = stack.enter_context(
+                    captured_frames(system_stream, settings, name="system-capture")
                 )
+            chunk_seconds = settings.chunk_samples / settings.sample_rate
 
-                if system_stream is not None:
-                    try:
-                        system_data = system_stream.read(
-                            settings.chunk_samples, exception_on_overflow=False
-                        )
-                    except IOError:
-                        system_data = mic_data
+            if settings.capture_sources == "separate" and system_frames is not None:
+                print("Transcribing microphone and system audio separately...")
+                if settings.inference_batch_size > 1:
+                    decoder = _start_batched_decoder(overlay, settings)
+                    stack.callback(_close_batched_decoder, decoder)
+                # Both pipelines resolve the same cached model through get_model.
+                mic_transcriber = StreamingTranscriber(
+                    settings,
+                    SourceOverlay(overlay, "Me"),
+                    model_factory=model_factory,
+                    decoder=decoder,
+                )
+                system_transcriber = StreamingTranscriber(
+                    settings,
+                    SourceOverlay(overlay, "Them"),
+                    model_factory=model_factory,
+                    decoder=decoder,
+                )
+                transcribers = [("Me", mic_transcriber), ("Them", system_transcriber)]
+                sources = [(mic_frames, mic_transcriber), (system_frames, system_transcriber)]
+                if decoder is not None:
+                    _consume_sources_concurrently(sources)
                 else:
-                    system_data = mic_data
+                    _consume_sources(sources, idle_wait=chunk_seconds / 2)
+                return
+
+            transcriber = StreamingTranscriber(settings, overlay, model_factory=model_factory)
+            transcribers = [("Mixed", transcriber)]
+            print("Listening for speech from both microphone and system audio...")
+            if system_frames is None:
+                _consume_frames(mic_frames, transcriber)
+                return
 
-                mixed_data = mix_audio(mic_data, system_data)
-                transcriber.submit(mixed_data)
+            aligner = StreamAligner(settings.sample_rate, prefill_seconds=chunk_seconds)
+            aligners = [aligner]
+            _consume_aligned(mic_frames, system_frames, aligner, transcriber)
     except KeyboardInterrupt:
         print("Stopping transcription...")
     finally:
         p.terminate()
+        for source, transcriber in transcribers:
+            print(f"Transcription stats ({source}): {transcriber.stats.summary()}")
+        for aligner in aligners:
+            print(f"Device alignment: {aligner.stats.summary()}")
+        _close_inference_worker(worker)
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import importlib.util
+import math
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Deque, List, Optional
+
+import numpy as np
+
+
+def _db_to_amplitude(db: float) -> float:
+    return 10.0 ** (db / 20.0)
+
+
+class EnergyGate:
+    """Cheap per-chunk speech detector based on RMS level and zero crossings.
+
+    A chunk counts as speech when its RMS is ``margin_db`` above the tracked
+    noise floor (and above an absolute minimum level). Near the threshold,
+    chunks with a very high zero-crossing rate are treated as hiss rather
+    than voice. The noise floor follows quiet chunks quickly and creeps up
+    slowly during sustained sound, so a fan that starts mid-meeting is
+    eventually absorbed into the floor. A few chunks of hangover keep word
+    endings attached to the speech before them.
+    """
+
+    def __init__(
+        self,
+        margin_db: float = 6.0,
+        min_level_db: float = -55.0,
+        max_zero_crossing_rate: float = 0.35,
+        hangover_chunks: int = 2,
+    ) -> None:
+        self._margin = _db_to_amplitude(margin_db)
+        self._min_level = _db_to_amplitude(min_level_db)
+        self._max_zero_crossing_rate = max_zero_crossing_rate
+        self._hangover_chunks = hangover_chunks
+        self._hangover = 0
+        self.noise_floor = _db_to_amplitude(-60.0)
+        self.chunks = 0
+        self.speech_chunks = 0
+
+    def is_speech(self, samples: np.ndarray) -> bool:
+        count = samples.size
+        if not count:
+            return False
+        self.chunks += 1
+
+        rms = math.sqrt(float(np.dot(samples, samples)) / count)
+        crossings = np.count_nonzero(np.signbit(samples[1:]) != np.signbit(samples[:-1]))
+        zero_crossing_rate = crossings / count
+
+        threshold = max(self.noise_floor * self._margin, self._min_level)
+        loud = rms > threshold and (
+            zero_crossing_rate <= self._max_zero_crossing_rate or rms > 2 * threshold
+        )
+        self._track_noise_floor(rms, loud)
+
+        if loud:
+            self._hangover = self._hangover_chunks
+        elif self._hangover:
+            self._hangover -= 1
+            loud = True
+
+        if loud:
+            self.speech_chunks += 1
+        return loud
+
+    def _track_noise_floor(self, rms: float, loud: bool) -> None:
+        if rms < self.noise_floor:
+            rate = 0.5
+        elif loud:
+            rate = 0.002
+        else:
+            rate = 0.05
+        self.noise_floor = max(1e-5, self.noise_floor + rate * (rms - self.noise_floor))
+
+
+@lru_cache(maxsize=1)
+def onnxruntime_available() -> bool:
+    return importlib.util.find_spec("onnxruntime") is not None
+
+
+class _SileroProbability:
+    """Stateful speech probability over consecutive frames of one stream.
+
+    Supports both the Silero v4 model bundled with faster-whisper < 1.0.3
+    (``get_initial_state``, 1024-sample frames) and the v5 model with an
+    extra context tensor (``get_initial_states``, 512-sample frames).
+    """
+
+    def __init__(self, model: Any, sample_rate: int) -> None:
+        self._model = model
+        self._sample_rate = sample_rate
+        self._context: Any = None
+        if hasattr(model, "get_initial_states"):
+            self._state, self._context = model.get_initial_states(batch_size=1)
+            self.frame_samples = 512
+        else:
+            self._state = model.get_initial_state(batch_size=1)
+            self.frame_samples = 1024
+
+    def __call__(self, frame: np.ndarray) -> float:
+        if self._context is None:
+            prob, self._state = self._model(frame, self._state, self._sample_rate)
+        else:
+            prob, self._state, self._context = self._model(
+                frame, self._state, self._context, self._sample_rate
+            )
+        return float(np.asarray(prob).reshape(-1)[0])
+
+
+class StreamingVad:
+    """Frame-by-frame voice activity filter that sees every sample once.
+
+    ``process`` returns only the samples that belong to speech, including a
+    short pre-roll before speech starts and the trailing pause until the
+    speech is considered over. The speech/non-speech state is kept across
+    calls, so window boundaries downstream do not reset it.
+    """
+
+    def __init__(
+        self,
+        speech_probability: Callable[[np.ndarray], float],
+        frame_samples: int,
+        sample_rate: int,
+        threshold: float = 0.5,
+        min_silence_ms: int = 500,
+        speech_pad_ms: int = 200,
+    ) -> None:
+        self._speech_probability = speech_probability
+        self._frame_samples = frame_samples
+        self._threshold = threshold
+        self._release_threshold = max(0.0, threshold - 0.15)
+        frame_ms = 1000.0 * frame_samples / sample_rate
+        self._min_silence_frames = max(1, int(math.ceil(min_silence_ms / frame_ms)))
+        self._preroll: Deque[np.ndarray] = deque(
+            maxlen=max(1, int(math.ceil(speech_pad_ms / frame_ms)))
+        )
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._silent_frames = 0
+        self.triggered = False
+        self.utterance_ended = False
+        self.frames = 0
+        self.speech_frames = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        self.utterance_ended = False
+        data = np.concatenate((self._pending, samples)) if self._pending.size else samples
+        frame_count = data.size // self._frame_samples
+        speech: List[np.ndarray] = []
+
+        for index in range(frame_count):
+            frame = data[index * self._frame_samples : (index + 1) * self._frame_samples]
+            prob = self._speech_probability(frame)
+            self.frames += 1
+            if prob >= self._threshold:
+                if not self.triggered:
+                    self.triggered = True
+                    speech.extend(self._preroll)
+                    self._preroll.clear()
+                self._silent_frames = 0
+                self.speech_frames += 1
+                speech.append(frame)
+            elif self.triggered:
+                speech.append(frame)
+                if prob < self._release_threshold:
+                    self._silent_frames += 1
+                if self._silent_frames >= self._min_silence_frames:
+                    self.triggered = False
+                    self.utterance_ended = True
+                    self._silent_frames = 0
+            else:
+                self._preroll.append(frame.copy())
+
+        self._pending = data[frame_count * self._frame_samples :].copy()
+        if not speech:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(speech)
+
+
+def create_streaming_vad(sample_rate: int) -> Optional[StreamingVad]:
+    if not onnxruntime_available():
+        return None
+    try:
+        from faster_whisper.vad import get_vad_model
+    except ImportError:
+        return None
+    probability = _SileroProbability(get_vad_model(), sample_rate)
+    return StreamingVad(probability, probability.frame_samples, sample_rate)
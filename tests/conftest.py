@@ -319,10 +319,11 @@ class _PyAudioModule(types.ModuleType):
 class _FasterWhisperModel:
     _callback = None
 
-    def __init__(self, model_path, device="auto", compute_type="int8"):
+    def __init__(self, model_path, device="auto", compute_type="int8", **options):
         self.model_path = model_path
         self.device = device
         self.compute_type = compute_type
+        self.options = options
 
     def transcribe(self, audio, **kwargs):
         if callable(self.__class__._callback):
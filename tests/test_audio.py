@@ -1,9 +1,12 @@
 ﻿import numpy as np
+import pytest
 
 import pyaudio
 
 from src.config import Settings
 from src.audio_capture import (
+    CaptureThread,
+    FrameQueue,
     list_audio_devices,
     stream_frames,
     managed_input_stream,
@@ -85,3 +88,132 @@ def test_stream_frames_yields_from_stream(monkeypatch):
     frames = stream_frames(stream, chunk_samples=4)
     assert next(frames) == b"abcd"
     assert next(frames) == b"wxyz"
+
+
+def test_frame_queue_drop_oldest_discards_head():
+    frames = FrameQueue(2, policy="drop-oldest")
+    for frame in (b"a", b"b", b"c"):
+        frames.put(frame)
+
+    assert frames.dropped == 1
+    assert frames.get(timeout=0) == b"b"
+    assert frames.get(timeout=0) == b"c"
+    assert frames.get(timeout=0) is None
+
+
+def test_frame_queue_coalesce_keeps_all_audio():
+    frames = FrameQueue(2, policy="coalesce")
+    for frame in (b"aa", b"bb", b"cc", b"dd"):
+        frames.put(frame)
+
+    assert len(frames) == 2
+    assert frames.coalesced == 2
+    assert frames.get(timeout=0) == b"aa"
+    assert frames.get(timeout=0) == b"bbccdd"
+
+
+def test_frame_queue_coalesced_frame_keeps_oldest_stamp(monkeypatch):
+    clock = iter([1.0, 2.0, 3.0])
+    monkeypatch.setattr("src.audio_capture.time.monotonic", lambda: next(clock))
+    frames = FrameQueue(1, policy="coalesce")
+    for frame in (b"aa", b"bb", b"cc"):
+        frames.put(frame)
+
+    assert frames.get(timeout=0) == b"aabbcc"
+    assert frames.last_timestamp == 1.0
+
+
+def test_frame_queue_block_waits_for_consumer():
+    import threading
+
+    frames = FrameQueue(1, policy="block")
+    frames.put(b"first")
+    producer = threading.Thread(target=frames.put, args=(b"second",))
+    producer.start()
+    producer.join(timeout=0.05)
+    assert producer.is_alive()
+
+    assert frames.get(timeout=1) == b"first"
+    producer.join(timeout=1)
+    assert not producer.is_alive()
+    assert frames.get(timeout=1) == b"second"
+
+
+def test_capture_thread_closes_queue_on_stream_error():
+    class FailingStream(MockStream):
+        def read(self, chunk_samples, exception_on_overflow=False):
+            if self._index < len(self.frames):
+                return super().read(chunk_samples, exception_on_overflow)
+            raise IOError("device lost")
+
+    frames = FrameQueue(8)
+    capture = CaptureThread(FailingStream([b"abcd", b"efgh"]), 2, frames)
+    capture.start()
+    capture.join(timeout=1)
+
+    assert isinstance(capture.error, IOError)
+    assert frames.get(timeout=1) == b"abcd"
+    assert frames.get(timeout=1) == b"efgh"
+    assert frames.get(timeout=1) is None
+
+
+def test_managed_input_stream_opens_native_format_and_converts(monkeypatch):
+    opened = {}
+    stereo = np.zeros((12288, 2), dtype=np.int16)
+    stereo[:, 0] = 1000
+    stereo[:, 1] = 3000
+
+    def open_stream(self, **kwargs):
+        opened.update(kwargs)
+        return MockStream([stereo.tobytes()])
+
+    monkeypatch.setattr(pyaudio.PyAudio, "open", open_stream)
+    monkeypatch.setattr(
+        pyaudio.PyAudio,
+        "devices",
+        [{"name": "Speakers (loopback)", "defaultSampleRate": 48000.0, "maxInputChannels": 2}],
+    )
+    settings = Settings(
+        sample_rate=16000,
+        chunk_samples=4096,
+        window_seconds=1.0,
+        overlap_seconds=0.0,
+        whisper_model_path="base",
+        whisper_compute_type="int8",
+        whisper_beam_size=1,
+        whisper_language=None,
+    )
+
+    p = pyaudio.PyAudio()
+    with managed_input_stream(p, settings, device_index=0) as stream:
+        mono = np.frombuffer(stream.read(4096), dtype=np.int16)
+
+    assert (opened["rate"], opened["channels"], opened["frames_per_buffer"]) == (48000, 2, 12288)
+    assert mono.size == 4096
+    # Past the filter's start-up transient the two channels are averaged.
+    assert np.all(np.abs(mono[100:] - 2000) <= 2)
+
+
+def test_callback_stream_assembles_chunks_from_small_buffers(monkeypatch):
+    from src.audio_capture import CallbackStream
+
+    monkeypatch.setattr(pyaudio, "paContinue", 0, raising=False)
+    stream = CallbackStream(bytes_per_frame=2, timeout=0.05)
+
+    for start in range(0, 6, 2):
+        assert stream.callback(np.arange(start, start + 2, dtype=np.int16).tobytes(), 2, {}, 0) == (
+            None,
+            0,
+        )
+
+    assert np.frombuffer(stream.read(4), dtype=np.int16).tolist() == [0, 1, 2, 3]
+    with pytest.raises(IOError):
+        stream.read(4)
+
+
+def test_frame_queue_stamps_frames():
+    frames = FrameQueue(4)
+    frames.put(b"ab")
+
+    assert frames.get(timeout=0) == b"ab"
+    assert frames.last_timestamp is not None
@@ -0,0 +1,30 @@
+import numpy as np
+
+from src.audio_buffer import SampleBuffer
+
+
+def test_sample_buffer_converts_pcm16_in_place():
+    buffer = SampleBuffer(8)
+    storage = buffer.view().base
+
+    values = np.array([-32768, -16384, 0, 16384], dtype=np.int16)
+    assert buffer.append_pcm16(values.tobytes()) == 4
+    assert buffer.append_pcm16(values.tobytes()) == 4
+
+    np.testing.assert_array_equal(
+        buffer.view(), np.tile(values.astype(np.float32) / 32768.0, 2)
+    )
+    assert buffer.view().base is storage
+    assert buffer.view().flags["C_CONTIGUOUS"]
+
+
+def test_sample_buffer_keep_tail_and_growth():
+    buffer = SampleBuffer(4)
+    buffer.append_pcm16(np.arange(4, dtype=np.int16).tobytes())
+    buffer.keep_tail(1)
+    np.testing.assert_array_equal(buffer.view(), np.array([3 / 32768.0], dtype=np.float32))
+
+    buffer.append_pcm16(np.arange(10, dtype=np.int16).tobytes())
+    assert buffer.size == 11
+    assert buffer.capacity >= 11
+    assert buffer.view()[0] == np.float32(3 / 32768.0)
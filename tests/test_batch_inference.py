@@ -0,0 +1,179 @@
+import sys
+import threading
+from types import ModuleType, SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.batch_inference import BatchedDecoder
+
+
+class _Model:
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(kwargs)
+        if audio.size == 0:
+            raise ValueError("empty window")
+        return iter([SimpleNamespace(text=f"{audio.size} samples")]), None
+
+
+def test_windows_from_two_streams_share_one_batch():
+    model = _Model()
+    reports = []
+    decoder = BatchedDecoder(16000, max_batch_size=2, max_wait_seconds=5.0, on_batch=reports.append)
+    results = {}
+
+    def submit(name, size):
+        segments, _ = decoder.transcribe(model, np.zeros(size, dtype=np.float32), beam_size=1)
+        results[name] = [segment.text for segment in segments]
+
+    threads = [
+        threading.Thread(target=submit, args=("mic", 16000)),
+        threading.Thread(target=submit, args=("system", 8000)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=2)
+    decoder.close(timeout=1)
+
+    assert results == {"mic": ["16000 samples"], "system": ["8000 samples"]}
+    assert model.calls == [{"beam_size": 1}, {"beam_size": 1}]
+    assert [report.size for report in reports] == [2]
+    assert reports[0].audio_seconds == pytest.approx(1.5)
+    assert decoder.stats.batches == 1
+    assert decoder.stats.mean_batch_size == 2
+
+
+def test_lone_window_is_decoded_after_max_wait_and_errors_reach_caller():
+    decoder = BatchedDecoder(16000, max_batch_size=4, max_wait_seconds=0.01)
+
+    segments, _ = decoder.transcribe(_Model(), np.zeros(160, dtype=np.float32))
+    assert segments[0].text == "160 samples"
+    with pytest.raises(ValueError):
+        decoder.transcribe(_Model(), np.zeros(0, dtype=np.float32))
+    decoder.close(timeout=1)
+
+    assert decoder.stats.batches == 2
+    with pytest.raises(RuntimeError):
+        decoder.transcribe(_Model(), np.zeros(160, dtype=np.float32))
+
+
+class _Tokenizer:
+    sot_prev = 1
+    sot_sequence = [2, 3]
+    no_timestamps = 4
+    timestamp_begin = 1000
+
+    def __init__(self, hf_tokenizer, multilingual, task, language):
+        self.language = language
+
+    def encode(self, text):
+        return [5] * len(text.split())
+
+    def decode(self, tokens):
+        return f"{self.language}:" + " ".join(str(t) for t in tokens if t < self.timestamp_begin)
+
+
+class _Extractor:
+    sampling_rate = 16000
+    n_samples = 480000
+    nb_max_frames = 3000
+
+    def __call__(self, audio):
+        return np.zeros((80, 3000 + audio.size // 160), dtype=np.float32)
+
+
+class _Engine:
+    is_multilingual = True
+
+    def __init__(self):
+        self.encoded = []
+        self.generated = []
+
+    def encode(self, features):
+        self.encoded.append(features.shape)
+        return features
+
+    def detect_language(self, encoded):
+        return [[("<|ja|>", 0.9)], [("<|en|>", 0.8)]][: encoded.shape[0]]
+
+    def generate(self, encoded, prompts, **kwargs):
+        self.generated.append((prompts, kwargs))
+        return [
+            SimpleNamespace(sequences_ids=[[1000, 7 + i, 1050]], scores=[-0.2], no_speech_prob=0.01)
+            for i in range(len(prompts))
+        ]
+
+
+class _WhisperModel(_Model):
+    def __init__(self):
+        super().__init__()
+        self.feature_extractor = _Extractor()
+        self.hf_tokenizer = object()
+        self.model = _Engine()
+
+
+@pytest.fixture
+def ctranslate2_modules(monkeypatch):
+    ctranslate2 = ModuleType("ctranslate2")
+    ctranslate2.StorageView = SimpleNamespace(from_array=lambda array: array)
+    tokenizer = ModuleType("faster_whisper.tokenizer")
+    tokenizer.Tokenizer = _Tokenizer
+    monkeypatch.setitem(sys.modules, "ctranslate2", ctranslate2)
+    monkeypatch.setitem(sys.modules, "faster_whisper.tokenizer", tokenizer)
+
+
+def _decode_pair(decoder, model, **options):
+    results = {}
+
+    def submit(name, size):
+        results[name] = decoder.transcribe(model, np.zeros(size, dtype=np.float32), **options)
+
+    threads = [
+        threading.Thread(target=submit, args=("mic", 16000)),
+        threading.Thread(target=submit, args=("system", 32000)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=2)
+    return results
+
+
+def test_batch_shares_one_encode_and_generate_call(ctranslate2_modules):
+    model = _WhisperModel()
+    decoder = BatchedDecoder(16000, max_batch_size=2, max_wait_seconds=5.0)
+    results = _decode_pair(decoder, model, beam_size=1, temperature=0.0, max_new_tokens=20)
+    decoder.close(timeout=1)
+
+    assert model.calls == []
+    assert model.model.encoded == [(2, 80, 3000)]
+    [(prompts, options)] = model.model.generated
+    assert prompts == [[2, 3], [2, 3]]
+    assert options["beam_size"] == 1
+    assert options["max_length"] == 22
+    assert {name: info.duration for name, (_, info) in results.items()} == {"mic": 1.0, "system": 2.0}
+    texts = set()
+    for segments, info in results.values():
+        [segment] = segments
+        assert (segment.start, segment.end) == (0.0, 1.0)
+        assert segment.text.startswith(f"{info.language}:")
+        texts.add(segment.text)
+    assert texts == {"ja:7", "en:8"}
+
+
+def test_word_timestamp_decodes_are_not_batched(ctranslate2_modules):
+    model = _WhisperModel()
+    decoder = BatchedDecoder(16000, max_batch_size=2, max_wait_seconds=5.0)
+    results = _decode_pair(decoder, model, beam_size=1, temperature=0.0, word_timestamps=True)
+    decoder.close(timeout=1)
+
+    assert model.model.encoded == []
+    assert len(model.calls) == 2
+    assert {segments[0].text for segments, _ in results.values()} == {
+        "16000 samples",
+        "32000 samples",
+    }
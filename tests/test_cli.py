@@ -81,10 +81,14 @@ def test_main_list_devices_invokes_helper(monkeypatch):
 class _OverlayProbe:
     def __init__(self):
         self.status_calls = []
+        self.fields = {}
 
     def set_status_info(self, model, language, compute):
         self.status_calls.append((model, language, compute))
 
+    def update_status_field(self, name, value):
+        self.fields[name] = value
+
 
 def _patch_runtime_dependencies(monkeypatch, settings=None):
     overlay_instances = []
@@ -98,7 +102,8 @@ def _patch_runtime_dependencies(monkeypatch, settings=None):
         settings = _make_settings()
 
     monkeypatch.setattr(sys, "argv", ["prog"])
-    monkeypatch.setattr("src.main.OverlayWindow", overlay_factory)
+    # main imports the overlay lazily from the top-level ``overlay`` module.
+    monkeypatch.setattr("overlay.OverlayWindow", overlay_factory)
     monkeypatch.setattr("src.main.load_settings", lambda config_path=None: settings)
 
     thread_args = {}
@@ -200,3 +205,36 @@ def test_main_uses_custom_config_path(monkeypatch, tmp_path):
     assert captured_paths["config_path"] == str(custom_config)
     assert exit_called["code"] == 0
 
+
+
+def test_importing_main_skips_heavy_dependencies():
+    import subprocess
+    from pathlib import Path
+
+    src = Path(__file__).resolve().parents[1] / "src"
+    code = (
+        "import sys; sys.path.insert(0, sys.argv[1]); import main; "
+        "print([m for m in ('PyQt5', 'pyaudio', 'faster_whisper', 'numpy') if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(src)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_warmup_printer_reports_only_the_outcome(capsys):
+    from src import main
+
+    warmup = types.SimpleNamespace(failed=RuntimeError("no such model"))
+    report = main._warmup_printer(warmup)
+    for status in ("waiting", "loading", "warming up", "ready in 1.2s", "failed"):
+        report(status)
+
+    assert capsys.readouterr().out.splitlines() == [
+        "Model ready in 1.2s.",
+        "Model warm-up failed: no such model",
+    ]
@@ -28,3 +28,102 @@ def test_load_settings_handles_bad_json(tmp_path):
     assert settings.whisper_model_path == "base"
     assert settings.whisper_compute_type == "int8"
     assert settings.whisper_language is None
+    # The silence gate discards quiet speech, so it is opt-in.
+    assert settings.silence_gate is False
+
+
+def test_load_settings_capture_queue_keys(tmp_path):
+    config_path = tmp_path / "settings.json"
+    config_path.write_text(
+        json.dumps({"capture": {"queue_size": 0, "backpressure": "COALESCE"}}),
+        encoding="utf-8",
+    )
+
+    settings = load_settings(env={}, config_path=str(config_path))
+    assert settings.capture_queue_size == 1
+    assert settings.capture_backpressure == "coalesce"
+
+    settings = load_settings(env={"CAPTURE_BACKPRESSURE": "bogus"}, config_path=str(config_path))
+    assert settings.capture_backpressure == "drop-oldest"
+
+
+def test_load_settings_parses_model_ladder(tmp_path):
+    config_path = tmp_path / "settings.json"
+    config_path.write_text(
+        json.dumps({"whisper_model_ladder": ["large-v3", "medium", ""]}),
+        encoding="utf-8",
+    )
+
+    settings = load_settings(env={}, config_path=str(config_path))
+    assert settings.whisper_model_ladder == ("large-v3", "medium")
+
+    settings = load_settings(env={"WHISPER_MODEL_LADDER": "small, base"}, config_path=str(config_path))
+    assert settings.whisper_model_ladder == ("small", "base")
+
+
+def test_load_settings_parses_language_model_routes(tmp_path):
+    config_path = tmp_path / "settings.json"
+    config_path.write_text(
+        json.dumps({"whisper_language_models": ["EN=base.en", "ja", "de = small"]}),
+        encoding="utf-8",
+    )
+
+    settings = load_settings(env={}, config_path=str(config_path))
+    assert settings.whisper_language_models == (("en", "base.en"), ("de", "small"))
+
+
+def test_load_settings_capture_profiles(tmp_path):
+    config_path = tmp_path / "settings.json"
+    config_path.write_text(json.dumps({"capture": {"profile": "latency"}}), encoding="utf-8")
+
+    settings = load_settings(env={}, config_path=str(config_path))
+    assert (settings.chunk_samples, settings.capture_callback, settings.capture_queue_size) == (
+        1024,
+        True,
+        64,
+    )
+
+    settings = load_settings(
+        env={"CAPTURE_CHUNK_SAMPLES": "2048", "CAPTURE_CALLBACK": "false"},
+        config_path=str(config_path),
+    )
+    assert (settings.chunk_samples, settings.capture_callback) == (2048, False)
+
+    settings = load_settings(
+        env={"CAPTURE_PROFILE": "throughput", "CAPTURE_SAMPLE_RATE": "48000"},
+        config_path=str(config_path),
+    )
+    assert (settings.chunk_samples, settings.capture_sample_rate) == (8192, 48000)
+    assert settings.sample_rate == 16000
+
+
+def test_load_settings_rejects_out_of_range_capture_values(tmp_path):
+    settings = load_settings(
+        env={"CAPTURE_CHUNK_SAMPLES": "16", "CAPTURE_SAMPLE_RATE": "1000", "CAPTURE_PROFILE": "x"},
+        config_path=str(tmp_path / "missing.json"),
+    )
+
+    assert settings.capture_profile == "balanced"
+    assert settings.chunk_samples == 256
+    assert settings.capture_sample_rate is None
+
+
+def test_load_settings_inference_device_keys(tmp_path):
+    settings = load_settings(
+        env={
+            "WHISPER_DEVICE": "CUDA",
+            "WHISPER_CPU_THREADS": "6",
+            "WHISPER_NUM_WORKERS": "0",
+            "MODEL_CACHE_SIZE": "3",
+            "MODEL_MEMORY_BUDGET_MB": "4096",
+            "MODEL_IDLE_UNLOAD_SECONDS": "300",
+        },
+        config_path=str(tmp_path / "missing.json"),
+    )
+
+    assert settings.whisper_device == "cuda"
+    assert settings.whisper_cpu_threads == 6
+    assert settings.whisper_num_workers == 1
+    assert settings.model_cache_size == 3
+    assert settings.model_memory_budget_mb == 4096
+    assert settings.model_idle_unload_seconds == 300
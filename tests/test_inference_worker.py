@@ -0,0 +1,65 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.config import Settings
+from src.inference_worker import InferenceWorker, SharedAudioRing
+
+
+class _EchoModel:
+    def transcribe(self, audio, **options):
+        if audio.size == 13:
+            os._exit(1)
+        text = f"{audio.size} samples, sum {float(audio.sum()):.1f}, beam {options.get('beam_size')}"
+        return iter([SimpleNamespace(text=text)]), SimpleNamespace(language="en")
+
+
+def _load_echo_model(settings):
+    return _EchoModel()
+
+
+def _settings():
+    return Settings(
+        sample_rate=16000,
+        chunk_samples=4096,
+        window_seconds=1.0,
+        overlap_seconds=0.0,
+        whisper_model_path="base",
+        whisper_compute_type="int8",
+        whisper_beam_size=1,
+        whisper_language=None,
+    )
+
+
+def test_shared_audio_ring_wraps_to_keep_windows_contiguous():
+    ring = SharedAudioRing(10)
+    try:
+        assert ring.write(np.arange(6, dtype=np.float32)) == 0
+        assert ring.write(np.full(6, 7, dtype=np.float32)) == 0
+        assert ring.write(np.ones(4, dtype=np.float32)) == 6
+        assert ring.view(6, 4).tolist() == [1, 1, 1, 1]
+        with pytest.raises(ValueError):
+            ring.write(np.zeros(11, dtype=np.float32))
+    finally:
+        ring.close()
+
+
+def test_worker_decodes_from_shared_memory_and_restarts_after_crash():
+    worker = InferenceWorker(_settings(), ring_seconds=1.0, load=_load_echo_model).start()
+    try:
+        segments, info = worker.transcribe(np.full(100, 0.5, dtype=np.float32), beam_size=3)
+        assert [segment.text for segment in segments] == ["100 samples, sum 50.0, beam 3"]
+        assert info.language == "en"
+
+        with pytest.raises(RuntimeError):
+            worker.transcribe(np.zeros(13, dtype=np.float32))
+
+        segments, _ = worker.transcribe(np.ones(8, dtype=np.float32))
+        assert segments[0].text.startswith("8 samples, sum 8.0")
+        assert worker.stats.restarts == 1
+        assert worker.stats.calls == 2
+        assert worker.stats.ready_seconds is not None
+    finally:
+        worker.close()
@@ -0,0 +1,36 @@
+from src.language_lock import LanguageLock
+
+
+def test_lock_needs_consecutive_confident_detections():
+    lock = LanguageLock(windows=3, min_probability=0.8, recheck_seconds=0.0)
+
+    assert not lock.observe("en", 0.95, 1.0)
+    assert not lock.observe("en", 0.5, 1.0)  # unsure windows neither count nor reset
+    assert not lock.observe("de", 0.9, 1.0)
+    assert not lock.observe("en", 0.9, 1.0)
+    assert not lock.observe("en", 0.9, 1.0)
+    assert lock.decode_language() is None
+
+    assert lock.observe("en", 0.9, 1.0)
+    assert lock.language == "en"
+    assert lock.decode_language() == "en"
+
+
+def test_periodic_recheck_keeps_or_releases_the_lock():
+    lock = LanguageLock(windows=1, min_probability=0.8, recheck_seconds=5.0)
+    assert lock.observe("en", 0.9, 1.0)
+
+    lock.observe("en", 1.0, 3.0)
+    assert lock.decode_language() == "en"
+    lock.observe("en", 1.0, 3.0)
+    assert lock.decode_language() is None  # the next window detects again
+
+    assert not lock.observe("en", 0.97, 2.0)
+    assert lock.decode_language() == "en"
+
+    for _ in range(2):
+        lock.observe("en", 1.0, 3.0)
+    assert lock.checking
+    # A confident new language moves the lock at once with windows=1.
+    assert lock.observe("ja", 0.92, 2.0)
+    assert lock.language == "ja"
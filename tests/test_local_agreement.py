@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+from src.local_agreement import HypothesisBuffer, Word, join_words, words_from_segments
+
+
+def _words(*items):
+    return [Word(start, end, f" {text}") for start, end, text in items]
+
+
+def test_hypothesis_buffer_commits_agreed_prefix():
+    buffer = HypothesisBuffer()
+
+    assert buffer.insert(_words((0.0, 0.4, "hello"), (0.4, 0.8, "word"))) == []
+    committed = buffer.insert(
+        _words((0.0, 0.4, "Hello"), (0.4, 0.8, "world"), (0.8, 1.2, "again"))
+    )
+
+    assert join_words(committed) == "Hello"
+    assert buffer.committed_end == 0.4
+    assert join_words(buffer.pending) == "world again"
+
+
+def test_hypothesis_buffer_skips_recommitted_words():
+    buffer = HypothesisBuffer()
+    buffer.insert(_words((0.0, 0.5, "good"), (0.5, 1.0, "morning")))
+    buffer.insert(_words((0.0, 0.5, "good"), (0.5, 1.0, "morning")))
+    assert buffer.committed_end == 1.0
+
+    # The decoder re-emits the committed tail with shifted timestamps.
+    buffer.insert(_words((0.95, 1.3, "morning"), (1.3, 1.6, "everyone")))
+    committed = buffer.insert(_words((0.95, 1.3, "morning"), (1.3, 1.6, "everyone")))
+
+    assert join_words(committed) == "everyone"
+
+
+def test_words_from_segments_falls_back_to_segment_text():
+    segments = [
+        SimpleNamespace(
+            text=" a b",
+            start=0.0,
+            end=1.0,
+            words=[
+                SimpleNamespace(start=0.0, end=0.5, word=" a"),
+                SimpleNamespace(start=0.5, end=1.0, word=" b"),
+            ],
+        ),
+        SimpleNamespace(text=" c d", start=1.0, end=2.0, words=None),
+    ]
+
+    words = words_from_segments(segments, offset=10.0, duration=2.0)
+
+    assert [word.text.strip() for word in words] == ["a", "b", "c", "d"]
+    assert words[0].start == 10.0
+    assert words[3].end == 12.0
@@ -0,0 +1,187 @@
+from src.model_loader import BackgroundModelLoader, ModelLadder
+
+
+def test_model_ladder_steps_down_after_sustained_slowness():
+    ladder = ModelLadder(["large-v3", "medium", "small"], "medium", target_rtf=0.8, patience=2)
+
+    assert ladder.observe(1.2) is None
+    assert ladder.observe(0.5) is None
+    assert ladder.observe(1.2) is None
+    assert ladder.observe(1.3) == "small"
+    # Nothing else is proposed while the switch is pending.
+    assert ladder.observe(2.0) is None
+
+    ladder.commit("small")
+    assert ladder.current == "small"
+    assert ladder.observe(1.5) is None
+    assert ladder.observe(1.5) is None
+
+
+def test_model_ladder_steps_up_only_with_clear_headroom():
+    ladder = ModelLadder(["medium", "small"], "base", target_rtf=0.9, patience=1)
+    assert ladder.paths == ["base", "medium", "small"]
+
+    ladder.commit("small")
+    assert [ladder.observe(0.2) for _ in range(3)] == [None, None, "medium"]
+
+
+def test_background_loader_hands_over_model():
+    loaded = []
+    loader = BackgroundModelLoader(lambda path: loaded.append(path) or f"model:{path}")
+
+    loader.request("small")
+    loader.wait(timeout=1)
+
+    assert loaded == ["small"]
+    assert loader.take_ready() == ("small", "model:small")
+    assert loader.take_ready() is None
+
+
+def _warmup_settings():
+    from src.config import Settings
+
+    return Settings(
+        sample_rate=16000,
+        chunk_samples=4096,
+        window_seconds=1.0,
+        overlap_seconds=0.0,
+        whisper_model_path="base",
+        whisper_compute_type="int8",
+        whisper_beam_size=1,
+        whisper_language="en",
+    )
+
+
+def test_model_warmup_loads_and_decodes_silence(capsys):
+    from types import SimpleNamespace
+
+    from src.model_loader import ModelWarmup
+
+    decoded = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            decoded.append((audio.size, float(abs(audio).max()), kwargs["language"]))
+            return iter([SimpleNamespace(text="")]), None
+
+    model = Model()
+    warmup = ModelWarmup(_warmup_settings(), load=lambda settings: model).start()
+
+    assert warmup.wait(timeout=1) is True
+    assert decoded == [(16000, 0.0, "en")]
+    assert warmup.time_to_ready is not None
+
+    statuses = []
+    warmup.add_listener(statuses.append)
+    assert statuses == [f"ready in {warmup.time_to_ready:.1f}s"]
+    assert capsys.readouterr().out == ""
+
+
+def test_model_warmup_reports_failure(capsys):
+    from src.model_loader import ModelWarmup
+
+    def load(settings):
+        raise RuntimeError("no such model")
+
+    statuses = []
+    warmup = ModelWarmup(_warmup_settings(), load=load)
+    warmup.add_listener(statuses.append)
+    warmup.start()
+
+    assert warmup.wait(timeout=1) is False
+    assert isinstance(warmup.failed, RuntimeError)
+    assert statuses == ["waiting", "loading", "failed"]
+    # Progress goes to listeners only; the CLI attaches its own printer.
+    assert capsys.readouterr().out == ""
+
+
+def test_model_registry_keeps_distinct_configs_resident():
+    from src.model_loader import ModelKey, ModelRegistry
+
+    loads = []
+    registry = ModelRegistry(load=lambda key: loads.append(key) or object(), max_models=2)
+    small = ModelKey("small", "int8")
+    small_threads = ModelKey("small", "int8", cpu_threads=4)
+    medium = ModelKey("medium", "int8")
+
+    first = registry.get(small)
+    assert registry.get(small_threads) is not first
+    assert registry.get(small) is first
+    assert len(loads) == 2
+
+    # small was used most recently, so the threaded variant is evicted.
+    registry.get(medium)
+    assert small in registry and medium in registry
+    assert small_threads not in registry
+    assert registry.evictions == 1
+
+
+def test_model_registry_evicts_to_stay_within_memory_budget():
+    from src.model_loader import ModelKey, ModelRegistry, estimate_model_bytes
+
+    base, medium = ModelKey("base", "int8"), ModelKey("medium", "float16")
+    assert estimate_model_bytes(base) == 74_000_000
+    assert estimate_model_bytes(medium) == 2 * 769_000_000
+
+    registry = ModelRegistry(load=lambda key: object(), max_models=4, memory_budget_bytes=1_600_000_000)
+    registry.get(base)
+    registry.get(medium)
+
+    assert base not in registry and medium in registry
+    assert registry.resident_bytes == 2 * 769_000_000
+
+
+def test_local_model_directory_is_sized_by_its_weights(tmp_path):
+    from src.model_loader import ModelKey, estimate_model_bytes
+
+    snapshot = tmp_path / "my-finetune" / "snapshots" / "abc123"
+    snapshot.mkdir(parents=True)
+    (snapshot / "model.bin").write_bytes(b"0" * 1234)
+
+    # The name matches no known checkpoint, so it would otherwise be "large".
+    assert estimate_model_bytes(ModelKey(str(tmp_path / "my-finetune"), "float32")) == 1234
+
+
+def test_get_model_leaves_the_configured_limits_alone(monkeypatch):
+    from dataclasses import replace
+
+    import src.model_loader as model_loader
+
+    registry = model_loader.ModelRegistry(load=lambda key: object())
+    monkeypatch.setattr(model_loader, "_registry", registry)
+    settings = replace(_warmup_settings(), model_cache_size=3, model_memory_budget_mb=100)
+
+    model_loader.configure_registry(settings)
+    model_loader.get_model(replace(settings, model_cache_size=1, model_memory_budget_mb=0))
+
+    assert registry.max_models == 3
+    assert registry.memory_budget_bytes == 100 * 1024 * 1024
+
+
+def test_model_registry_loads_once_for_concurrent_requests():
+    import threading
+
+    from src.model_loader import ModelKey, ModelRegistry
+
+    release = threading.Event()
+    loads = []
+
+    def load(key):
+        loads.append(key)
+        release.wait(timeout=1)
+        return object()
+
+    registry = ModelRegistry(load=load)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get(ModelKey("base", "int8"))))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=1)
+
+    assert len(loads) == 1
+    assert len(results) == 3 and all(result is results[0] for result in results)
@@ -64,3 +64,40 @@ def test_overlay_status_and_drag():
     pos = overlay.pos()
     assert pos.x() == 20
     assert pos.y() == 25
+
+
+def test_overlay_status_fields_extend_panel():
+    overlay = OverlayWindow()
+    overlay.set_status_info(model="small", language="en", compute_type="int8")
+
+    overlay.update_status_field("RTF", "0.42")
+    assert overlay.info_label.text().endswith("Compute: int8    RTF: 0.42")
+
+    overlay.update_status_field("RTF", "")
+    assert "RTF" not in overlay.info_label.text()
+
+
+def test_overlay_partial_caption_is_styled_until_final_text():
+    overlay = OverlayWindow()
+
+    overlay.display_partial("draft words")
+    assert overlay.label.text() == "draft words"
+    assert "italic" in overlay.label._style
+
+    overlay.display_text("final words")
+    assert overlay.label.text() == "final words"
+    assert "italic" not in overlay.label._style
+
+
+def test_overlay_shows_one_line_per_source():
+    overlay = OverlayWindow()
+
+    overlay.display_source_text("Me", "hello there")
+    overlay.display_source_text("Them", "general", partial=True)
+    overlay.display_source_text("Me", "x " * 40 + "latest words")
+
+    lines = overlay.label.text().split("\n")
+    assert lines[0].startswith("Me: ")
+    assert lines[0].endswith("latest words")
+    assert len(lines[0]) <= len("Me: ") + 60
+    assert lines[1] == "Them: general …"
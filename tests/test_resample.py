@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from src.resample import CaptureConverter, PolyphaseResampler, downmix_pcm16
+
+
+def test_downmix_averages_interleaved_channels():
+    frames = np.array([[1000, 3000], [-2000, 0]], dtype=np.int16)
+
+    mono = downmix_pcm16(frames.tobytes(), channels=2)
+
+    assert mono == pytest.approx(np.array([2000, -1000]) / 32768.0)
+
+
+@pytest.mark.parametrize("input_rate", [48000, 44100])
+def test_resampler_is_continuous_across_chunks(input_rate):
+    tone = np.sin(2 * np.pi * 440 * np.arange(input_rate) / input_rate).astype(np.float32)
+
+    whole = PolyphaseResampler(input_rate, 16000).process(tone)
+    chunked = PolyphaseResampler(input_rate, 16000)
+    pieces = [chunked.process(tone[i : i + 1234]) for i in range(0, tone.size, 1234)]
+
+    assert sum(piece.size for piece in pieces) == whole.size == 16000
+    assert np.concatenate(pieces) == pytest.approx(whole, abs=1e-5)
+
+
+def test_resampler_removes_content_above_output_nyquist():
+    hiss = np.sin(2 * np.pi * 12000 * np.arange(48000) / 48000).astype(np.float32)
+
+    output = PolyphaseResampler(48000, 16000).process(hiss)
+
+    assert np.sqrt(np.mean(output[200:] ** 2)) < 0.01
+
+
+def test_converter_passes_matching_format_through():
+    chunk = np.arange(8, dtype=np.int16).tobytes()
+
+    assert CaptureConverter(16000, 1, 16000).convert(chunk) is chunk
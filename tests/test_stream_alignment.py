@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.stream_alignment import StreamAligner
+
+
+RATE = 16000
+CHUNK = 4096
+
+
+def _chunk(value):
+    return np.full(CHUNK, value, dtype=np.int16).tobytes()
+
+
+def test_aligner_tracks_drift_without_growing_latency():
+    aligner = StreamAligner(RATE, prefill_seconds=CHUNK / RATE)
+    drift = 500e-6
+    mic_time, system_time = 0.0, 0.003
+    latencies = []
+
+    # Ten minutes with the system device running 500 ppm fast.
+    for _ in range(int(600 * RATE / CHUNK)):
+        mic_time += CHUNK / RATE
+        while system_time <= mic_time:
+            aligner.push_system(_chunk(0), timestamp=system_time)
+            system_time += CHUNK / RATE / (1 + drift)
+        aligner.mix(_chunk(0), timestamp=mic_time)
+        latencies.append(aligner.stats.latency_seconds)
+
+    assert aligner.stats.drift_ppm == pytest.approx(500, abs=20)
+    assert aligner.stats.underruns == 0
+    assert aligner.stats.overflows == 0
+    # Uncorrected, 500 ppm over ten minutes would add 300 ms of backlog.
+    assert max(latencies[-100:]) - min(latencies[-100:]) < 0.3 * CHUNK / RATE
+
+
+def test_missing_system_audio_is_silence_not_microphone():
+    aligner = StreamAligner(RATE, prefill_seconds=CHUNK / RATE)
+
+    priming = np.frombuffer(aligner.mix(_chunk(1000)), dtype=np.int16)
+    assert np.all(priming == 500)
+
+    for _ in range(2):
+        aligner.push_system(_chunk(3000))
+    mixed = np.frombuffer(aligner.mix(_chunk(1000)), dtype=np.int16)
+    assert np.all(mixed == 2000)
+
+    aligner.end_system()
+    # The buffered system audio is played out, then the mic passes through.
+    assert np.all(np.frombuffer(aligner.mix(_chunk(1000)), dtype=np.int16) == 2000)
+    assert np.frombuffer(aligner.mix(_chunk(1000)), dtype=np.int16)[-1] == 500
+    assert aligner.mix(_chunk(1000)) == _chunk(1000)
+    assert aligner.stats.underruns == 0
+
+
+def test_dropped_mic_chunks_keep_drift_and_offset():
+    aligner = StreamAligner(RATE, prefill_seconds=CHUNK / RATE)
+    mic_time, system_time = 0.0, 0.003
+    latencies = []
+
+    # One mic chunk in fifty never reaches the aligner, as after queue drops.
+    for index in range(int(60 * RATE / CHUNK)):
+        mic_time += CHUNK / RATE
+        while system_time <= mic_time:
+            aligner.push_system(_chunk(0), timestamp=system_time)
+            system_time += CHUNK / RATE
+        if index % 50 == 49:
+            aligner.skip_mic(CHUNK)
+            continue
+        aligner.mix(_chunk(0), timestamp=mic_time)
+        latencies.append(aligner.stats.latency_seconds)
+
+    assert aligner.stats.drift_ppm == pytest.approx(0, abs=20)
+    assert aligner.stats.underruns == 0
+    assert aligner.stats.overflows == 0
+    assert max(latencies[-100:]) - min(latencies[-100:]) < 0.3 * CHUNK / RATE
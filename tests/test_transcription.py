@@ -1,8 +1,10 @@
 ﻿import sys
+import time
 from pathlib import Path
 from types import SimpleNamespace
 
 import numpy as np
+import pytest
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_ROOT = PROJECT_ROOT / "src"
@@ -12,16 +14,29 @@ for candidate in (SRC_ROOT, PROJECT_ROOT):
         sys.path.insert(0, candidate_str)
 
 from src.config import Settings
-from src.transcription import StreamingTranscriber
+from src.audio_capture import FrameQueue
+from src.stream_alignment import StreamAligner
+from src.transcription import StreamingTranscriber, _consume_aligned, _consume_stream
 
 
 class _OverlayRecorder:
     def __init__(self) -> None:
         self.texts = []
+        self.partials = []
+        self.status = {}
 
     def display_text(self, text: str) -> None:
         self.texts.append(text)
 
+    def display_partial(self, text: str) -> None:
+        self.partials.append(text)
+
+    def update_status_field(self, name: str, value: str) -> None:
+        self.status[name] = value
+
+    def set_status_info(self, model: str, language, compute_type: str) -> None:
+        self.status["Info"] = (model, language, compute_type)
+
 
 def _make_settings(**overrides):
     defaults = dict(
@@ -94,31 +109,866 @@ def test_transcriber_retains_overlap():
     np.testing.assert_allclose(transcriber._buffer, expected)
 
 
-def test_transcriber_disables_vad_when_onnx_missing(capsys):
+def test_transcriber_disables_vad_when_onnx_missing(capsys, monkeypatch):
     overlay = _OverlayRecorder()
+    monkeypatch.setattr("src.transcription.onnxruntime_available", lambda: False)
 
     class Model:
         def __init__(self):
-            self.calls = 0
+            self.kwargs = []
 
         def transcribe(self, audio, **kwargs):
-            self.calls += 1
-            if self.calls == 1:
-                raise RuntimeError("requires the onnxruntime package")
+            self.kwargs.append(kwargs)
             return ([SimpleNamespace(text="hi")], None)
 
     model = Model()
     transcriber = StreamingTranscriber(
-        settings=_make_settings(chunk_samples=8),
+        settings=_make_settings(chunk_samples=8, vad_mode="whisper"),
         overlay=overlay,
         model_factory=lambda: model,
     )
 
-    chunk = _make_chunk([2000] * 8)
-    transcriber.submit(chunk)
-
     captured = capsys.readouterr()
     assert "onnxruntime not available" in captured.out
+
+    transcriber.submit(_make_chunk([2000] * 8))
     assert overlay.texts == ["hi"]
-    assert model.calls == 2
-    assert transcriber._vad_enabled is False
+    assert [kwargs["vad_filter"] for kwargs in model.kwargs] == [False]
+    # Window captions only need the text, so no timestamp tokens are decoded.
+    assert [kwargs["without_timestamps"] for kwargs in model.kwargs] == [True]
+    assert transcriber._vad is None
+
+
+def test_streaming_vad_feeds_only_speech_and_flushes_at_pause():
+    from src.voice_activity import StreamingVad
+
+    overlay = _OverlayRecorder()
+    decoded = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            decoded.append(np.array(audio))
+            assert kwargs["vad_filter"] is False
+            return ([SimpleNamespace(text=f"utterance {len(decoded)}")], None)
+
+    probabilities = []
+
+    def speech_probability(frame):
+        prob = 0.9 if frame[0] > 0.02 else 0.0
+        probabilities.append(prob)
+        return prob
+
+    vad = StreamingVad(
+        speech_probability,
+        frame_samples=4,
+        sample_rate=8,
+        min_silence_ms=1000,
+        speech_pad_ms=500,
+    )
+    transcriber = StreamingTranscriber(
+        settings=_make_settings(window_seconds=4.0),
+        overlay=overlay,
+        model_factory=lambda: Model(),
+        vad=vad,
+    )
+
+    quiet = _make_chunk([10] * 4)
+    loud = _make_chunk([2000] * 4)
+    for chunk in (quiet, quiet, loud, loud, quiet):
+        transcriber.submit(chunk)
+    assert decoded == []
+
+    transcriber.submit(quiet)
+
+    # One frame of pre-roll, the speech and the trailing pause; no leading silence.
+    assert len(probabilities) == 6
+    assert len(decoded) == 1
+    assert decoded[0].size == 5 * 4
+    assert overlay.texts == ["utterance 1"]
+    assert transcriber._buffer.size == 0
+
+
+def test_consume_stream_decodes_on_separate_thread_from_capture():
+    import threading
+
+    overlay = _OverlayRecorder()
+    frames = [_make_chunk([500] * 4) for _ in range(4)]
+    threads = {}
+
+    class Stream:
+        def read(self, chunk_samples, exception_on_overflow=False):
+            threads.setdefault("capture", threading.current_thread())
+            if frames:
+                return frames.pop(0)
+            raise IOError("stream closed")
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            threads["inference"] = threading.current_thread()
+            return ([SimpleNamespace(text="queued")], None)
+
+    settings = _make_settings()
+    transcriber = StreamingTranscriber(
+        settings=settings,
+        overlay=overlay,
+        model_factory=lambda: Model(),
+    )
+
+    _consume_stream(Stream(), settings, transcriber)
+
+    assert overlay.texts == ["queued"]
+    assert threads["capture"] is not threads["inference"]
+
+
+def test_transcriber_reuses_sample_storage_across_windows():
+    overlay = _OverlayRecorder()
+    seen = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            seen.append(audio)
+            return ([SimpleNamespace(text=f"w{len(seen)}")], None)
+
+    settings = _make_settings(overlap_seconds=0.5)
+    transcriber = StreamingTranscriber(
+        settings=settings,
+        overlay=overlay,
+        model_factory=lambda: Model(),
+    )
+    storage = transcriber._buffer.base
+
+    for _ in range(6):
+        transcriber.submit(_make_chunk([1200] * 4))
+
+    assert overlay.texts == ["w1", "w2", "w3", "w4", "w5"]
+    assert transcriber._buffer.base is storage
+    assert all(np.shares_memory(audio, storage) for audio in seen)
+
+
+def test_agreement_policy_commits_and_trims_decoded_audio():
+    overlay = _OverlayRecorder()
+    decoded = []
+    hypotheses = [
+        [(0.0, 0.5, " one"), (0.5, 1.0, " too")],
+        [(0.0, 0.5, " one"), (0.5, 1.0, " two"), (1.0, 1.5, " three")],
+        [(0.0, 0.5, " two"), (0.5, 1.0, " three")],
+    ]
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            decoded.append(len(audio))
+            assert kwargs["word_timestamps"] is True
+            assert "without_timestamps" not in kwargs
+            words = [
+                SimpleNamespace(start=start, end=end, word=word)
+                for start, end, word in hypotheses.pop(0)
+            ]
+            segments = [
+                SimpleNamespace(
+                    text="".join(w.word for w in group),
+                    start=group[0].start,
+                    end=group[-1].end,
+                    words=group,
+                )
+                for group in (words[:1], words[1:])
+            ]
+            return (segments, None)
+
+    settings = _make_settings(streaming_policy="agreement")
+    transcriber = StreamingTranscriber(
+        settings=settings,
+        overlay=overlay,
+        model_factory=lambda: Model(),
+    )
+
+    chunk = _make_chunk([1000] * 8)
+    transcriber.submit(chunk)
+    transcriber.submit(chunk)
+    assert overlay.texts == ["one too", "one two three"]
+    # "one" was agreed on, so its segment (0.0-0.5 s) is dropped from the buffer.
+    assert transcriber._offset == 0.5
+    assert transcriber._buffer.size == 12
+
+    transcriber.submit(chunk)
+    assert decoded == [8, 16, 20]
+    assert overlay.texts[-1] == "one two three"
+    assert transcriber._caption == "one two three"
+
+
+def test_silence_gate_skips_model_on_quiet_windows():
+    overlay = _OverlayRecorder()
+    calls = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            calls.append(len(audio))
+            return ([SimpleNamespace(text="speech")], None)
+
+    transcriber = StreamingTranscriber(
+        settings=_make_settings(chunk_samples=8, silence_gate=True),
+        overlay=overlay,
+        model_factory=lambda: Model(),
+    )
+
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        transcriber.submit(_make_chunk(rng.integers(-3, 4, 8)))
+    assert calls == []
+
+    tone = (8000 * np.sin(np.arange(8) * 0.7)).astype(np.int16)
+    transcriber.submit(tone.tobytes())
+
+    assert calls == [8]
+    assert overlay.texts == ["speech"]
+    assert transcriber.stats.windows == 5
+    assert transcriber.stats.skipped_silent == 4
+    assert transcriber.stats.model_calls == 1
+
+
+def _endpoint_transcriber(decoded, **overrides):
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            decoded.append(np.array(audio))
+            return ([SimpleNamespace(text=f"window {len(decoded)}")], None)
+
+    options = dict(
+        streaming_policy="endpoint",
+        vad_mode="off",
+        min_window_seconds=2.0,
+        max_window_seconds=4.0,
+        endpoint_pause_seconds=0.5,
+    )
+    options.update(overrides)
+    settings = _make_settings(**options)
+    return StreamingTranscriber(
+        settings=settings,
+        overlay=_OverlayRecorder(),
+        model_factory=lambda: Model(),
+    )
+
+
+def test_endpoint_policy_flushes_short_utterance_at_pause():
+    decoded = []
+    transcriber = _endpoint_transcriber(
+        decoded, min_window_seconds=3.0, max_window_seconds=6.0
+    )
+    quiet = _make_chunk([0] * 4)
+    loud = _make_chunk([3000, -3000] * 2)
+
+    # Two chunks of gate hangover follow the speech before the pause starts.
+    for chunk in (quiet, quiet, quiet, loud, quiet, quiet, quiet):
+        transcriber.submit(chunk)
+    # A short pause does not close a window below the minimum length...
+    assert decoded == []
+
+    transcriber.submit(quiet)
+    # ...but a pause twice as long ends the utterance right away, and the
+    # leading silence was trimmed to a short pre-roll.
+    assert len(decoded) == 1
+    assert decoded[0].size == 4 * 6
+    assert transcriber.overlay.texts == ["window 1"]
+    assert transcriber._buffer.size == 0
+
+
+def test_endpoint_policy_cuts_long_speech_at_quietest_chunk():
+    decoded = []
+    transcriber = _endpoint_transcriber(decoded, silence_gate=False)
+    levels = [3000, 3000, 3000, 3000, 3000, 200, 3000, 3000]
+
+    for level in levels:
+        transcriber.submit(_make_chunk([level, -level] * 2))
+
+    # The 4 s maximum is reached on the last chunk; the cut lands after the quiet one.
+    assert len(decoded) == 1
+    assert decoded[0].size == 6 * 4
+    assert transcriber._buffer.size == 2 * 4
+
+
+def test_adaptive_window_grows_when_decoding_falls_behind(monkeypatch):
+    overlay = _OverlayRecorder()
+    clock = {"now": 0.0}
+    monkeypatch.setattr("src.transcription.time.perf_counter", lambda: clock["now"])
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            # Every decode takes twice as long as the audio it covers.
+            clock["now"] += 2.0 * len(audio) / 8
+            return ([SimpleNamespace(text="slow")], None)
+
+    settings = _make_settings(
+        window_seconds=1.0,
+        overlap_seconds=0.5,
+        min_window_seconds=1.0,
+        max_window_seconds=2.0,
+        adaptive_window=True,
+        target_rtf=0.8,
+        silence_gate=False,
+    )
+    transcriber = StreamingTranscriber(
+        settings=settings,
+        overlay=overlay,
+        model_factory=lambda: Model(),
+    )
+
+    for _ in range(12):
+        transcriber.submit(_make_chunk([900] * 4))
+
+    assert transcriber._window_size == 16
+    assert transcriber._overlap_size < 4
+    assert overlay.status["Window"].startswith("2.0s/")
+    # Measured over the hop, the overlap decoded twice makes it worse than 2.
+    assert float(overlay.status["RTF"]) > 2.0
+    assert transcriber.stats.real_time_factor > 2.0
+
+
+def test_real_time_factor_is_measured_over_the_hop(monkeypatch):
+    overlay = _OverlayRecorder()
+    clock = {"now": 0.0}
+    monkeypatch.setattr("src.transcription.time.perf_counter", lambda: clock["now"])
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            # 0.8x the window, which looks under a 1.0 target per window.
+            clock["now"] += 0.8 * len(audio) / 8
+            return ([SimpleNamespace(text="steady")], None)
+
+    transcriber = StreamingTranscriber(
+        settings=_make_settings(window_seconds=1.5, overlap_seconds=0.4, silence_gate=False),
+        overlay=overlay,
+        model_factory=lambda: Model(),
+    )
+
+    for _ in range(12 + 9 * 30):
+        transcriber.submit(_make_chunk([900]))
+
+    # 12-sample windows keep 3 samples of overlap, so each adds 9 new ones.
+    assert transcriber.stats.windows == 31
+    assert float(overlay.status["RTF"]) == pytest.approx(0.8 * 12 / 9, abs=0.01)
+
+
+def test_model_ladder_swaps_to_cheaper_model_between_windows(monkeypatch):
+    overlay = _OverlayRecorder()
+    clock = {"now": 0.0}
+    monkeypatch.setattr("src.transcription.time.perf_counter", lambda: clock["now"])
+    used = []
+
+    class Model:
+        def __init__(self, name, cost):
+            self.name = name
+            self.cost = cost
+
+        def transcribe(self, audio, **kwargs):
+            used.append(self.name)
+            clock["now"] += self.cost * len(audio) / 8
+            return ([SimpleNamespace(text=self.name)], None)
+
+    settings = _make_settings(
+        whisper_model_path="large-v3",
+        whisper_model_ladder=("large-v3", "small"),
+        target_rtf=0.8,
+        silence_gate=False,
+    )
+    transcriber = StreamingTranscriber(
+        settings=settings,
+        overlay=overlay,
+        model_factory=lambda: Model("large-v3", 2.0),
+        model_path_factory=lambda path: Model(path, 0.1),
+    )
+
+    chunk = _make_chunk([800] * 8)
+    for _ in range(3):
+        transcriber.submit(chunk)
+    transcriber._model_loader.wait(timeout=1)
+    transcriber.submit(chunk)
+
+    assert used == ["large-v3", "large-v3", "large-v3", "small"]
+    assert transcriber._ladder.current == "small"
+    assert overlay.status["Active model"] == "small"
+
+
+def test_cascade_drafts_partials_with_small_model_until_window_closes():
+    overlay = _OverlayRecorder()
+    calls = []
+
+    class Model:
+        def __init__(self, name):
+            self.name = name
+
+        def transcribe(self, audio, **kwargs):
+            calls.append((self.name, len(audio)))
+            return ([SimpleNamespace(text=f"{self.name} {len(audio)}")], None)
+
+    transcriber = StreamingTranscriber(
+        settings=_make_settings(chunk_samples=2, window_seconds=1.0, silence_gate=False),
+        overlay=overlay,
+        model_factory=lambda: Model("final"),
+        partial_model_factory=lambda: Model("tiny"),
+    )
+
+    chunk = _make_chunk([700] * 2)
+    for _ in range(6):
+        transcriber.submit(chunk)
+
+    # Nothing below half a second, then a partial per chunk until the window closes.
+    assert calls == [("tiny", 4), ("tiny", 6), ("final", 8), ("tiny", 4)]
+    assert overlay.partials == ["tiny 4", "tiny 6", "tiny 4"]
+    assert overlay.texts == ["final 8"]
+
+
+@pytest.mark.parametrize("batch_size", [1, 2])
+def test_separate_sources_share_model_and_label_captions(monkeypatch, batch_size):
+    import pyaudio
+    from faster_whisper import WhisperModel
+
+    from src.transcription import transcribe_both_audio
+
+    class Stream:
+        def __init__(self, frames):
+            self.frames = list(frames)
+
+        def read(self, chunk_samples, exception_on_overflow=False):
+            if self.frames:
+                return self.frames.pop(0)
+            raise IOError("stream closed")
+
+        def stop_stream(self):
+            pass
+
+        def close(self):
+            pass
+
+    streams = {
+        None: Stream([_make_chunk([1000] * 4)] * 2),
+        1: Stream([_make_chunk([-2000] * 4)] * 2),
+    }
+    monkeypatch.setattr(
+        pyaudio.PyAudio,
+        "devices",
+        [{"name": "Microphone", "hostApi": 0}, {"name": "Speakers (loopback)", "hostApi": 0}],
+    )
+    monkeypatch.setattr(
+        pyaudio.PyAudio,
+        "open_callback",
+        staticmethod(lambda **kwargs: streams[kwargs["input_device_index"]]),
+    )
+    models = set()
+
+    def transcribe(audio, **kwargs):
+        return ([SimpleNamespace(text="loud" if audio[0] > 0 else "quiet")], None)
+
+    WhisperModel.set_transcribe_callback(transcribe)
+    monkeypatch.setattr(
+        "src.transcription.get_model",
+        lambda settings, path=None: models.add(id(shared)) or shared,
+    )
+    shared = WhisperModel("base")
+
+    class Overlay:
+        def __init__(self):
+            self.lines = []
+            self.status = {}
+
+        def display_source_text(self, source, text, partial=False):
+            self.lines.append((source, text))
+
+        def update_status_field(self, name, value):
+            self.status[name] = value
+
+    overlay = Overlay()
+    settings = _make_settings(capture_sources="separate", inference_batch_size=batch_size)
+    transcribe_both_audio(overlay, settings)
+
+    assert sorted(overlay.lines) == [("Me", "loud"), ("Them", "quiet")]
+    assert len(models) == 1
+    assert ("Batch" in overlay.status) == (batch_size > 1)
+
+
+def test_consume_sources_interleaves_queues():
+    from src.audio_capture import FrameQueue
+    from src.transcription import _consume_sources
+
+    order = []
+
+    class Recorder:
+        def __init__(self, name):
+            self.name = name
+
+        def submit(self, chunk, captured_at=None):
+            order.append((self.name, chunk))
+
+    first, second = FrameQueue(8), FrameQueue(8)
+    for chunk in (b"a1", b"a2", b"a3"):
+        first.put(chunk)
+    second.put(b"b1")
+    first.close()
+    second.close()
+
+    _consume_sources([(first, Recorder("a")), (second, Recorder("b"))], idle_wait=0.01)
+
+    assert order == [("a", b"a1"), ("b", b"b1"), ("a", b"a2"), ("a", b"a3")]
+
+
+def test_transcriber_records_capture_to_caption_latency():
+    import time
+
+    overlay = _OverlayRecorder()
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            return ([SimpleNamespace(text="hello")], None)
+
+    transcriber = StreamingTranscriber(
+        _make_settings(silence_gate=False, vad_mode="off"), overlay, model_factory=Model
+    )
+    transcriber.submit(_make_chunk([100] * 4), captured_at=time.monotonic())
+    transcriber.submit(_make_chunk([100] * 4), captured_at=time.monotonic() - 0.2)
+
+    assert transcriber.stats.latency_samples == 1
+    assert transcriber.stats.max_latency_seconds >= 0.2
+    assert "Latency" in overlay.status
+    assert "latency" in transcriber.stats.summary()
+
+
+def test_idle_model_is_released_and_reloaded_without_losing_audio(capsys):
+    overlay = _OverlayRecorder()
+    loads = []
+    decoded = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            decoded.append(audio.copy())
+            return ([SimpleNamespace(text="speech")], None)
+
+    def load():
+        loads.append(True)
+        return Model()
+
+    transcriber = StreamingTranscriber(
+        _make_settings(vad_mode="off", model_idle_unload_seconds=1.0),
+        overlay,
+        model_factory=load,
+    )
+    loud, silent = _make_chunk([3000, -3000] * 2), _make_chunk([0] * 4)
+
+    for chunk in (loud, loud, silent, silent, silent, silent):
+        transcriber.submit(chunk)
+    assert transcriber._model is None
+    assert overlay.status["Model"].startswith("unloaded")
+    assert "Unloaded the model after" in capsys.readouterr().out
+
+    decoded.clear()
+    transcriber.submit(loud)
+    transcriber._reloader.wait(timeout=1)
+    transcriber.submit(loud)
+
+    assert len(loads) == 2
+    assert overlay.status["Model"] == "ready"
+    # Both chunks spoken while the model reloaded reach the decoder.
+    assert len(decoded) == 1 and np.count_nonzero(decoded[0]) == 8
+
+
+def test_idle_unload_is_disabled_with_an_inference_worker(capsys):
+    overlay = _OverlayRecorder()
+    transcriber = StreamingTranscriber(
+        _make_settings(vad_mode="off", model_idle_unload_seconds=1.0, inference_worker=True),
+        overlay,
+        model_factory=lambda: SimpleNamespace(transcribe=lambda audio, **kw: ([], None)),
+    )
+    assert "disabled with an inference worker" in capsys.readouterr().out
+
+    silent = _make_chunk([0] * 4)
+    for _ in range(6):
+        transcriber.submit(silent)
+
+    assert transcriber._reloader is None
+    assert "Model" not in overlay.status
+    assert "Unloaded the model" not in capsys.readouterr().out
+
+
+def test_decode_deadline_caps_generated_tokens(monkeypatch):
+    overlay = _OverlayRecorder()
+    clock = [0.0]
+    wanted = iter([10, 20, 30, 400])
+    caps = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            # Like faster-whisper on a window under 30 s: the whole window is
+            # decoded before the first segment is returned.
+            cap = kwargs.get("max_new_tokens")
+            caps.append(cap)
+            tokens = next(wanted)
+            if cap is not None:
+                tokens = min(tokens, cap)
+            clock[0] += 0.1 + 0.01 * tokens
+            return ([SimpleNamespace(text=f"{tokens} tokens", tokens=[0] * tokens)], None)
+
+    monkeypatch.setattr(
+        "src.transcription.time",
+        SimpleNamespace(perf_counter=lambda: clock[0], monotonic=time.monotonic),
+    )
+    # One second of audio at factor 1.0: a 1 s budget, or 90 tokens at 0.01 s
+    # each after the 0.1 s encoder pass.
+    settings = _make_settings(vad_mode="off", decode_deadline_factor=1.0)
+    transcriber = StreamingTranscriber(settings, overlay, model_factory=lambda: Model())
+    loud = _make_chunk([3000, -3000] * 2)
+    for _ in range(8):
+        transcriber.submit(loud)
+
+    assert caps[0] is None
+    assert caps[3] in (89, 90)
+    assert overlay.texts[-1] == f"{caps[3]} tokens"
+    assert clock[0] - 0.9 <= 1.0 + 1e-6  # the runaway window stayed in budget
+    assert transcriber.stats.deadline_cuts == 1
+    assert overlay.status["Deadline"].startswith("1 capped")
+    assert "capped by the deadline" in transcriber.stats.summary()
+
+
+def test_catch_up_skips_stale_audio_until_the_backlog_clears():
+    overlay = _OverlayRecorder()
+    decoded = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            decoded.append(audio.size)
+            return ([SimpleNamespace(text="now")], None)
+
+    settings = _make_settings(vad_mode="off", catchup_policy="skip")
+    transcriber = StreamingTranscriber(settings, overlay, model_factory=lambda: Model())
+    loud = _make_chunk([3000, -3000] * 2)
+
+    for _ in range(4):
+        transcriber.submit(loud, captured_at=time.monotonic() - 5.0)
+    assert decoded == []
+    assert overlay.status["Backlog"] == "5.0s (catching up: skip)"
+
+    transcriber.submit(loud, captured_at=time.monotonic())
+    transcriber.submit(loud, captured_at=time.monotonic())
+    assert decoded == [8]
+    assert overlay.status["Backlog"] == "0.0s"
+    assert transcriber.stats.catchups == 1
+    assert transcriber.stats.skipped_backlog_seconds == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("policy", ["beam", "merge"])
+def test_catch_up_lowers_beam_or_merges_windows_while_behind(policy):
+    overlay = _OverlayRecorder()
+    calls = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            calls.append((audio.size, kwargs["beam_size"]))
+            return ([SimpleNamespace(text="text")], None)
+
+    settings = _make_settings(
+        vad_mode="off", whisper_beam_size=5, max_window_seconds=2.0, catchup_policy=policy
+    )
+    transcriber = StreamingTranscriber(settings, overlay, model_factory=lambda: Model())
+    loud = _make_chunk([3000, -3000] * 2)
+
+    for _ in range(4):
+        transcriber.submit(loud, captured_at=time.monotonic() - 5.0)
+    for _ in range(2):
+        transcriber.submit(loud, captured_at=time.monotonic())
+
+    if policy == "beam":
+        assert calls == [(8, 1), (8, 1), (8, 5)]
+    else:
+        assert calls == [(16, 5), (8, 5)]
+
+
+def test_adaptive_beam_redecodes_only_unreliable_greedy_windows():
+    overlay = _OverlayRecorder()
+    greedy_results = iter(
+        [
+            dict(avg_logprob=-0.2, no_speech_prob=0.01, compression_ratio=1.2),
+            dict(avg_logprob=-1.5, no_speech_prob=0.01, compression_ratio=1.2),
+            dict(avg_logprob=-1.5, no_speech_prob=0.9, compression_ratio=1.2),
+            dict(avg_logprob=-0.3, no_speech_prob=0.01, compression_ratio=3.1),
+        ]
+    )
+    beams = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            beams.append(kwargs["beam_size"])
+            if kwargs["beam_size"] == 1:
+                return ([SimpleNamespace(text="greedy", **next(greedy_results))], None)
+            return ([SimpleNamespace(text="beam", avg_logprob=-0.4)], None)
+
+    settings = _make_settings(vad_mode="off", whisper_beam_size=5, adaptive_beam=True)
+    transcriber = StreamingTranscriber(settings, overlay, model_factory=lambda: Model())
+    loud = _make_chunk([3000, -3000] * 2)
+    for _ in range(8):
+        transcriber.submit(loud)
+
+    assert beams == [1, 1, 5, 1, 1, 5]
+    assert overlay.texts == ["greedy", "beam", "greedy", "beam"]
+    assert transcriber.stats.beam_fraction == pytest.approx(0.5)
+    assert overlay.status["Beam"] == "50% at beam 5"
+    assert "50% of decodes redone" in transcriber.stats.summary()
+
+
+def test_language_is_locked_after_confident_detections():
+    overlay = _OverlayRecorder()
+    languages = []
+
+    class Model:
+        def transcribe(self, audio, **kwargs):
+            languages.append(kwargs["language"])
+            info = SimpleNamespace(language=kwargs["language"] or "en", language_probability=0.95)
+            return ([SimpleNamespace(text="hello")], info)
+
+    settings = _make_settings(vad_mode="off", language_lock_windows=2)
+    transcriber = StreamingTranscriber(settings, overlay, model_factory=lambda: Model())
+    loud = _make_chunk([3000, -3000] * 2)
+    for _ in range(8):
+        transcriber.submit(loud)
+
+    assert languages == [None, None, "en", "en"]
+    assert overlay.status["Info"] == ("base", "en (locked)", "int8")
+
+
+def test_locked_language_routes_to_its_model_and_back():
+    overlay = _OverlayRecorder()
+    detected = iter(["en", "de"])
+    calls = []
+
+    class Model:
+        def __init__(self, name):
+            self.name = name
+
+        def transcribe(self, audio, **kwargs):
+            calls.append((self.name, kwargs["language"]))
+            language = kwargs["language"] or next(detected)
+            info = SimpleNamespace(language=language, language_probability=0.95)
+            return ([SimpleNamespace(text=f"{self.name} {language}")], info)
+
+    settings = _make_settings(
+        vad_mode="off",
+        whisper_language_models=(("en", "base.en"),),
+        language_lock_windows=1,
+        language_recheck_seconds=2.0,
+    )
+    transcriber = StreamingTranscriber(
+        settings,
+        overlay,
+        model_factory=lambda: Model("base"),
+        model_path_factory=Model,
+    )
+    loud = _make_chunk([3000, -3000] * 2)
+
+    def decode_window():
+        transcriber.submit(loud)
+        transcriber.submit(loud)
+        transcriber._route_loader.wait(timeout=1)
+
+    for _ in range(5):
+        decode_window()
+
+    assert calls == [
+        ("base", None),
+        ("base.en", "en"),
+        ("base.en", "en"),
+        ("base", None),  # the recheck needs a model that can detect languages
+        ("base", "de"),
+    ]
+    assert overlay.status["Active model"] == "base"
+    assert transcriber._router.current == "base"
+
+
+def test_consume_aligned_clocks_use_capture_timestamps():
+    class RecordingAligner(StreamAligner):
+        def __init__(self):
+            super().__init__(8)
+            self.system_stamps = []
+            self.mic_stamps = []
+
+        def push_system(self, chunk, timestamp=None):
+            self.system_stamps.append(timestamp)
+            super().push_system(chunk, timestamp)
+
+        def mix(self, mic_chunk, timestamp=None):
+            self.mic_stamps.append(timestamp)
+            return super().mix(mic_chunk, timestamp)
+
+    mic_frames, system_frames = FrameQueue(8), FrameQueue(8)
+    loud = _make_chunk([3000, -3000] * 2)
+    for _ in range(2):
+        system_frames.put(loud)
+        time.sleep(0.01)
+    mic_frames.put(loud)
+    expected_system = list(system_frames._stamps)
+    expected_mic = list(mic_frames._stamps)
+    mic_frames.close()
+    system_frames.close()
+    time.sleep(0.01)
+
+    aligner = RecordingAligner()
+    transcriber = StreamingTranscriber(
+        _make_settings(vad_mode="off"),
+        _OverlayRecorder(),
+        model_factory=lambda: SimpleNamespace(transcribe=lambda audio, **kw: ([], None)),
+    )
+    _consume_aligned(mic_frames, system_frames, aligner, transcriber)
+
+    # Both system chunks are drained in one burst but keep their own stamps.
+    assert aligner.system_stamps == expected_system
+    assert expected_system[0] < expected_system[1]
+    assert aligner.mic_stamps == expected_mic
+
+
+def test_consume_aligned_pairs_streams_by_capture_stamp_after_a_stall():
+    rate, chunk = 16000, 4096
+    mic_frames, system_frames = FrameQueue(64), FrameQueue(64)
+    # A stall: eight seconds of both devices queued before anything is read.
+    for index in range(30):
+        stamp = 100.0 + index * chunk / rate
+        for frames, offset, value in ((mic_frames, 0.0, 1000), (system_frames, 0.01, 3000)):
+            frames._frames.append(_make_chunk([value] * chunk))
+            frames._stamps.append(stamp + offset)
+    mic_frames.close()
+    system_frames.close()
+
+    aligner = StreamAligner(rate)
+    mixed = []
+    transcriber = SimpleNamespace(
+        submit=lambda data, captured_at: mixed.append(np.frombuffer(data, dtype=np.int16)),
+        overlay=_OverlayRecorder(),
+    )
+    _consume_aligned(mic_frames, system_frames, aligner, transcriber)
+
+    assert len(mixed) == 30
+    assert aligner.stats.overflows == 0
+    assert aligner.stats.underruns == 0
+    # Once primed, every mic chunk is mixed with real system audio.
+    assert all(np.all(chunk_out == 2000) for chunk_out in mixed[2:])
+
+
+def test_idle_unload_frees_a_model_loaded_by_startup_warmup():
+    import gc
+    import weakref
+
+    import src.transcription as transcription
+    from src.model_loader import ModelWarmup
+
+    settings = _make_settings(
+        vad_mode="off", model_idle_unload_seconds=1.0, whisper_model_path="warmup-idle"
+    )
+    # As in main(), the warm-up object lives for the whole session.
+    warmup = ModelWarmup(settings, load=transcription.get_model).start()
+    assert warmup.wait(timeout=1)
+
+    transcriber = StreamingTranscriber(settings, _OverlayRecorder())
+    loud, silent = _make_chunk([3000, -3000] * 2), _make_chunk([0] * 4)
+    transcriber.submit(loud)
+    transcriber.submit(loud)
+    model = weakref.ref(transcriber._model)
+
+    for _ in range(4):
+        transcriber.submit(silent)
+    gc.collect()
+
+    assert transcriber._model is None
+    assert model() is None
+    assert warmup.ready
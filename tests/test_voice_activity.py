@@ -0,0 +1,52 @@
+import numpy as np
+
+from src.voice_activity import EnergyGate, StreamingVad
+
+
+def _tone(amplitude, size=1600):
+    return (amplitude * np.sin(np.arange(size) * 2 * np.pi * 220 / 16000)).astype(np.float32)
+
+
+def test_energy_gate_adapts_to_noise_floor():
+    gate = EnergyGate(margin_db=6.0, hangover_chunks=0)
+    rng = np.random.default_rng(1)
+
+    noise = [rng.normal(0, 0.01, 1600).astype(np.float32) for _ in range(200)]
+    decisions = [gate.is_speech(chunk) for chunk in noise]
+
+    # Steady background noise is learned and stops counting as speech.
+    assert not any(decisions[-50:])
+    assert gate.noise_floor > 0.005
+    assert gate.is_speech(_tone(0.2))
+
+
+def test_energy_gate_hangover_and_hiss():
+    gate = EnergyGate(margin_db=6.0, hangover_chunks=1)
+    silence = np.zeros(1600, dtype=np.float32)
+
+    assert gate.is_speech(_tone(0.3))
+    assert gate.is_speech(silence)
+    assert not gate.is_speech(silence)
+
+    # Alternating-sign hiss just above the threshold has a very high zero-crossing rate.
+    hiss = np.tile(np.array([0.003, -0.003], dtype=np.float32), 800)
+    assert not gate.is_speech(hiss)
+    assert gate.speech_chunks == 2
+
+
+def test_streaming_vad_scores_each_sample_once_across_chunks():
+    scored = []
+
+    def speech_probability(frame):
+        scored.append(frame.copy())
+        return 1.0 if frame.max() > 0.5 else 0.0
+
+    vad = StreamingVad(speech_probability, frame_samples=4, sample_rate=16, speech_pad_ms=250)
+
+    assert vad.process(np.zeros(6, dtype=np.float32)).size == 0
+    speech = vad.process(np.ones(6, dtype=np.float32))
+
+    # 12 samples make exactly three frames, regardless of how they were chunked.
+    assert sum(frame.size for frame in scored) == 12
+    assert vad.triggered is True
+    np.testing.assert_array_equal(speech, np.array([0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1]))